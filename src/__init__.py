@@ -15,6 +15,12 @@ def create_app(config_name="default"):
     # Load configuration
     app.config.from_object(config_by_name[config_name])
 
+    # Fail fast on malformed evaluation criteria
+    from .utils.scoring import validate_criteria
+
+    if app.config.get("EVALUATION_CRITERIA"):
+        validate_criteria(app.config["EVALUATION_CRITERIA"])
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -25,6 +31,11 @@ def create_app(config_name="default"):
     # Make mail available in templates
     app.context_processor(lambda: {"mail": mail})
 
+    # Template fragment caching ({% cache %} tag)
+    from .utils.fragment_cache import FragmentCacheExtension
+
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
     # Register blueprints
     from .blueprints.auth import auth_bp
     from .blueprints.problems import problems_bp
@@ -32,16 +43,6 @@ def create_app(config_name="default"):
     from .blueprints.evaluations import evaluations_bp
     from .blueprints.dashboard import dashboard_bp
     from .blueprints.notifications import notifications_bp
-    from .blueprints.api import api_bp
-
-    # Register blueprints
-    app.register_blueprint(auth_bp, url_prefix="/auth")
-    app.register_blueprint(problems_bp, url_prefix="/problems")
-    app.register_blueprint(solutions_bp, url_prefix="/solutions")
-    app.register_blueprint(evaluations_bp, url_prefix="/evaluations")
-    app.register_blueprint(dashboard_bp, url_prefix="/dashboard")
-    app.register_blueprint(notifications_bp, url_prefix="/notifications")
-    app.register_blueprint(api_bp, url_prefix="/api/v1")
     from .blueprints.admin import admin_bp
     from .blueprints.api import api_bp
 
@@ -52,13 +53,53 @@ def create_app(config_name="default"):
     app.register_blueprint(dashboard_bp, url_prefix="/dashboard")
     app.register_blueprint(notifications_bp, url_prefix="/notifications")
     app.register_blueprint(admin_bp, url_prefix="/admin")
-    app.register_blueprint(api_bp, url_prefix="/api")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
 
     # Register main routes
     from .blueprints.main import main_bp
 
     app.register_blueprint(main_bp)
 
+    # Record entity changes for the change feed API
+    from .utils.change_feed import ChangeFeed
+
+    ChangeFeed.register(db.session)
+
+    # Keep the evaluation queue in step with the change feed
+    from .utils.evaluation_queue import EvaluationQueue
+
+    EvaluationQueue.register()
+
+    # Re-rank solutions when their votes or evaluations change
+    from .utils.ranking import SolutionRanking
+
+    SolutionRanking.register()
+
+    # Place new comments in their threads
+    from .utils.comment_threads import CommentThreads
+
+    CommentThreads.register()
+
+    # Keep solution, evaluation and comment counts current
+    from .utils.counters import CounterCache
+
+    CounterCache.register()
+
+    # Store MinHash signatures for duplicate detection
+    from .utils.duplicates import ProblemSignatures
+
+    ProblemSignatures.register()
+
+    # Drop cached user snapshots when users change
+    from .utils.user_cache import UserCacheInvalidator
+
+    UserCacheInvalidator.register(db.session)
+
+    # Drop cached dashboards when their widgets change
+    from .utils.dashboard import DashboardCacheInvalidator
+
+    DashboardCacheInvalidator.register(db.session)
+
     # Register CLI commands
     from .cli import register_cli
 
@@ -1,9 +1,38 @@
 """Admin routes for user management"""
 
-from flask import Blueprint, redirect, url_for, request, flash, abort
+from functools import wraps
+from flask import Blueprint, render_template, redirect, url_for, request, flash, abort
 from flask_login import login_required, current_user
 from ...extensions import db
 from ...models.user import User
+from ...models.problem import Problem
+from ...models.solution import Solution
+
+admin_bp = Blueprint("admin", __name__)
+
+
+def admin_required(f):
+    """Restrict a view to admins and moderators"""
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_admin():
+            abort(403)
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+@admin_bp.route("/users")
+@login_required
+@admin_required
+def users():
+    """List users for management"""
+    page = request.args.get("page", 1, type=int)
+    users = User.query.order_by(User.created_at.desc()).paginate(
+        page=page, per_page=20, error_out=False
+    )
+    return render_template("admin/users.html", users=users)
 
 
 @admin_bp.route("/user/<int:id>/toggle_status", methods=["POST"])
@@ -18,6 +47,7 @@ def toggle_user_status(id):
         return redirect(url_for("admin.users"))
 
     try:
+        # Committing the change also evicts the user's cached session snapshot
         user.is_active = not user.is_active
         db.session.commit()
 
@@ -42,7 +72,7 @@ def delete_user(id):
         flash("User not found", "error")
         return redirect(url_for("admin.users"))
 
-
+    try:
         Problem.query.filter_by(submitter_id=id).delete()
         Solution.query.filter_by(submitter_id=id).delete()
         db.session.delete(user)
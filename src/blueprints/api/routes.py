@@ -1,17 +1,110 @@
 """REST API blueprint for external integrations"""
 
-from flask import Blueprint, jsonify, request
+from datetime import datetime
+from flask import (
+    Blueprint,
+    jsonify,
+    request,
+    abort,
+    current_app,
+    Response,
+    stream_with_context,
+    g,
+)
 from flask_login import login_required, current_user
 from ...extensions import db
 from ...models.user import User
 from ...models.problem import Problem
 from ...models.solution import Solution
 from ...models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ...models.api_token import ApiToken
+from ...models.read_models import (
+    evaluation_timeline,
+    load_user_rows,
+    parse_timeline_cursor,
+)
+from ...models.evaluation_report import (
+    EvaluationAgreement,
+    EvaluationItemStats,
+    EvaluatorStats,
+)
+from ...utils.evaluation_queue import EvaluationQueue, QUEUE_SOURCES, parse_cursor
+from ...utils.evaluation_analytics import ANALYTICS_SOURCES
 from ...utils.anonymizer import Anonymizer
+from ...utils.http_cache import make_etag, not_modified, add_validators
+from ...utils.export import export_statement, iter_ndjson, gzip_stream, batch_text
+from ...utils.change_feed import ChangeFeed
+from ...utils.trending import trending_version
+from ...utils.facets import facet_counts, filter_facets
+from ...utils.suggest import get_suggest_index
+from ...utils.notification_manager import NotificationManager
+from ...utils.rate_limiter import get_rate_limiter, client_key, rate_limit_headers
+from ...utils.api_auth import (
+    bearer_token,
+    forget_token,
+    require_scope,
+    session_only,
+    token_scope_error,
+)
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import and_, or_, desc, func
 
 api_bp = Blueprint("api", __name__)
 
+RATE_LIMIT_EXEMPT = {"api.health"}
+
+
+@api_bp.before_request
+def enforce_rate_limit():
+    """Spend a token from the client's bucket, rejecting with 429 when empty"""
+    if (
+        not current_app.config.get("API_RATE_LIMIT_ENABLED", True)
+        or request.endpoint in RATE_LIMIT_EXEMPT
+    ):
+        return None
+
+    try:
+        result = get_rate_limiter().hit(client_key())
+    except Exception as e:
+        # Fail open: a storage outage must not take the API down with it
+        current_app.logger.error(f"Rate limiter error: {str(e)}")
+        return None
+
+    g.rate_limit = result
+    if not result.allowed:
+        response = jsonify({"error": "Rate limit exceeded"})
+        response.status_code = 429
+        response.headers.update(rate_limit_headers(result))
+        return response
+    return None
+
+
+@api_bp.before_request
+def check_api_token():
+    """Reject bad Bearer credentials and enforce read/write token scopes"""
+    if bearer_token(request) is None:
+        return None
+
+    if not current_user.is_authenticated:
+        response = jsonify({"error": "Invalid or expired API token"})
+        response.status_code = 401
+        response.headers["WWW-Authenticate"] = 'Bearer error="invalid_token"'
+        return response
+
+    if request.method in ("GET", "HEAD", "OPTIONS"):
+        return token_scope_error("read")
+    return token_scope_error("write")
+
+
+@api_bp.after_request
+def add_rate_limit_headers(response):
+    """Report the client's remaining budget on every API response"""
+    result = g.get("rate_limit")
+    if result is not None and result.allowed:
+        response.headers.update(rate_limit_headers(result))
+    return response
+
 
 def serialize_user(user, include_email=False):
     """Serialize user data for API response"""
@@ -26,70 +119,210 @@ def serialize_user(user, include_email=False):
     }
 
 
-def serialize_problem(problem, include_submitter=False):
-    """Serialize problem data for API response"""
-    data = {
-        "id": problem.id,
-        "title": problem.title,
-        "description": problem.description,
-        "severity": problem.severity,
-        "status": problem.status,
-        "visibility": problem.visibility,
-        "affected_departments": problem.affected_departments,
-        "created_at": problem.created_at.isoformat(),
-        "updated_at": problem.updated_at.isoformat() if problem.updated_at else None,
-        "view_count": problem.view_count,
-        "tags": [],
+def _isoformat(value):
+    """Format an optional datetime for JSON output"""
+    return value.isoformat() if value else None
+
+
+PROBLEM_SORTS = {
+    "newest": (Problem.created_at.desc(),),
+    "trending": (Problem.trending_score.desc(), Problem.id.desc()),
+}
+SOLUTION_SORTS = {
+    "newest": (Solution.created_at.desc(),),
+    "rank": (Solution.rank_score.desc(), Solution.id),
+}
+
+# Sparse fieldsets: field name -> (columns to select, value getter). Getters
+# only read selected columns, so they work on plain result rows.
+PROBLEM_FIELDS = {
+    "id": ((Problem.id,), lambda p: p.id),
+    "title": ((Problem.title,), lambda p: p.title),
+    "description": ((Problem.description,), lambda p: p.description),
+    "summary": ((Problem.summary,), lambda p: p.summary),
+    "severity": ((Problem.severity,), lambda p: p.severity),
+    "status": ((Problem.status,), lambda p: p.status),
+    "visibility": ((Problem.visibility,), lambda p: p.visibility),
+    "affected_departments": (
+        (Problem.affected_departments,),
+        lambda p: p.affected_departments or [],
+    ),
+    "created_at": ((Problem.created_at,), lambda p: _isoformat(p.created_at)),
+    "updated_at": ((Problem.updated_at,), lambda p: _isoformat(p.updated_at)),
+    "view_count": ((Problem.view_count,), lambda p: p.view_count),
+    "aggregate_score": ((Problem.aggregate_score,), lambda p: p.aggregate_score),
+    "solutions_count": ((Problem.solution_count,), lambda p: p.solution_count),
+    "evaluations_count": ((Problem.evaluation_count,), lambda p: p.evaluation_count),
+    "comments_count": ((Problem.comment_count,), lambda p: p.comment_count),
+    "tags": ((Problem.tags,), lambda p: p.tags or []),
+}
+PROBLEM_DEFAULT_FIELDS = tuple(name for name in PROBLEM_FIELDS if name != "summary")
+# Lists default to the summary and leave the large Text/JSON columns unloaded
+PROBLEM_LIST_FIELDS = tuple(
+    name
+    for name in PROBLEM_FIELDS
+    if name not in ("description", "affected_departments", "tags")
+)
+
+SOLUTION_FIELDS = {
+    "id": ((Solution.id,), lambda s: s.id),
+    "problem_id": ((Solution.problem_id,), lambda s: s.problem_id),
+    "content": ((Solution.content,), lambda s: s.content),
+    "summary": ((Solution.summary,), lambda s: s.summary),
+    "status": ((Solution.status,), lambda s: s.status),
+    "created_at": ((Solution.created_at,), lambda s: _isoformat(s.created_at)),
+    "updated_at": ((Solution.updated_at,), lambda s: _isoformat(s.updated_at)),
+    "cost_estimate": ((Solution.cost_estimate,), lambda s: s.cost_estimate),
+    "time_estimate": ((Solution.time_estimate,), lambda s: s.time_estimate),
+    "required_resources": (
+        (Solution.required_resources,),
+        lambda s: s.required_resources,
+    ),
+    "vote_score": (
+        (Solution.upvotes, Solution.downvotes),
+        lambda s: (s.upvotes or 0) - (s.downvotes or 0),
+    ),
+    "aggregate_score": ((Solution.aggregate_score,), lambda s: s.aggregate_score),
+    "vote_lower_bound": ((Solution.vote_lower_bound,), lambda s: s.vote_lower_bound),
+    "evaluation_score": ((Solution.evaluation_score,), lambda s: s.evaluation_score),
+    "rank_score": ((Solution.rank_score,), lambda s: s.rank_score),
+    "evaluations_count": ((Solution.evaluation_count,), lambda s: s.evaluation_count),
+    "comments_count": ((Solution.comment_count,), lambda s: s.comment_count),
+}
+SOLUTION_DEFAULT_FIELDS = tuple(name for name in SOLUTION_FIELDS if name != "summary")
+SOLUTION_LIST_FIELDS = tuple(
+    name for name in SOLUTION_FIELDS if name not in ("content", "required_resources")
+)
+
+MAX_PER_PAGE = 100
+
+
+def _parse_list_arg(name, allowed, default):
+    """Parse a comma separated query argument, rejecting unknown values"""
+    raw = request.args.get(name)
+    if raw is None:
+        return list(default)
+
+    values = [value.strip() for value in raw.split(",") if value.strip()]
+    unknown = [value for value in values if value not in allowed]
+    if unknown:
+        abort(400, description=f"Unknown {name}: {', '.join(unknown)}")
+
+    return values
+
+
+def _parse_ids_arg():
+    """Parse ``?ids=1,2,3`` into a bounded list of unique integer ids"""
+    raw = request.args.get("ids")
+    if not raw:
+        return []
+
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw.split(",") if value))
+    except ValueError:
+        abort(400, description="ids must be a comma separated list of integers")
+
+    if len(ids) > MAX_PER_PAGE:
+        abort(400, description=f"At most {MAX_PER_PAGE} ids per request")
+
+    return ids
+
+
+def _page_args(prefix="", default_per_page=20):
+    """Read bounded page/per_page query arguments"""
+    page = max(request.args.get(f"{prefix}page", 1, type=int), 1)
+    per_page = request.args.get(f"{prefix}per_page", default_per_page, type=int)
+    return page, min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def _select_fields(model, field_map, fields, *extra_columns):
+    """Columns to select for fields, for use with Query.with_entities()
+
+    Selecting columns instead of entities returns lightweight result rows:
+    no ORM instances are hydrated or tracked in the identity map.
+    """
+    columns = {model.id: None}
+    for column in extra_columns:
+        columns[column] = None
+    for name in fields:
+        for column in field_map[name][0]:
+            columns[column] = None
+    return list(columns)
+
+
+def _paginate(query, page, per_page, total):
+    """Paginate reusing a row count that was already computed"""
+    pagination = query.paginate(
+        page=page, per_page=per_page, error_out=False, count=False
+    )
+    pagination.total = total
+    return pagination
+
+
+def _serialize_pagination(page):
+    """Serialize a Flask-SQLAlchemy pagination object"""
+    return {
+        "page": page.page,
+        "pages": page.pages,
+        "per_page": page.per_page,
+        "total": page.total,
+        "has_prev": page.has_prev,
+        "has_next": page.has_next,
+        "prev_num": page.prev_num,
+        "next_num": page.next_num,
     }
 
-    if include_submitter and problem.submitter:
-        data["submitter"] = serialize_user(problem.submitter)
 
-    # Add tags if available
-    if hasattr(problem, "tags") and problem.tags:
-        data["tags"] = [
-            {"id": tag.id, "name": tag.name, "color": tag.color} for tag in problem.tags
-        ]
+def serialize_problem(problem, fields=None, submitter=None):
+    """Serialize a problem row (see _select_fields) for API response"""
+    data = {
+        name: PROBLEM_FIELDS[name][1](problem)
+        for name in (fields or PROBLEM_DEFAULT_FIELDS)
+    }
+
+    if submitter is not None:
+        data["submitter"] = serialize_user(submitter)
 
     return data
 
 
-def serialize_solution(solution, include_submitter=False):
-    """Serialize solution data for API response"""
+def serialize_solution(solution, fields=None, submitter=None):
+    """Serialize a solution row (see _select_fields) for API response"""
     data = {
-        "id": solution.id,
-        "problem_id": solution.problem_id,
-        "title": solution.title,
-        "content": solution.content,
-        "status": solution.status,
-        "visibility": solution.visibility,
-        "created_at": solution.created_at.isoformat(),
-        "cost_estimate": solution.cost_estimate,
-        "time_estimate": solution.time_estimate,
-        "required_resources": solution.required_resources,
-        "vote_score": solution.get_vote_score(),
-        "evaluations_count": len(solution.evaluations) if solution.evaluations else 0,
+        name: SOLUTION_FIELDS[name][1](solution)
+        for name in (fields or SOLUTION_DEFAULT_FIELDS)
     }
 
-    if include_submitter and solution.submitter:
-        data["submitter"] = serialize_user(solution.submitter)
+    if submitter is not None:
+        data["submitter"] = serialize_user(submitter)
 
     return data
 
 
+def _submitters(rows, include):
+    """Batch-load submitters for rows as UserRow objects keyed by id"""
+    if not include:
+        return {}
+    return load_user_rows(row.submitter_id for row in rows)
+
+
 def serialize_evaluation(evaluation, include_evaluator=False):
-    """Serialize evaluation data for API response"""
+    """Serialize evaluation data for API response
+
+    Problem and solution evaluations share one shape; criteria that do not
+    apply to the evaluation type are returned as null.
+    """
     data = {
         "id": evaluation.id,
-        "problem_id": evaluation.problem_id,
-        "solution_id": evaluation.solution_id,
-        "severity_score": evaluation.severity_score,
-        "impact_score": evaluation.impact_score,
-        "feasibility_score": evaluation.feasibility_score,
-        "creativity_score": evaluation.creativity_score,
-        "completeness_score": evaluation.completeness_score,
+        "problem_id": getattr(evaluation, "problem_id", None),
+        "solution_id": getattr(evaluation, "solution_id", None),
+        "severity_score": getattr(evaluation, "severity_rating", None),
+        "impact_score": getattr(evaluation, "impact_rating", None),
+        "feasibility_score": getattr(evaluation, "feasibility_rating", None),
+        "creativity_score": getattr(evaluation, "creativity_rating", None),
+        "completeness_score": getattr(evaluation, "completeness_rating", None),
         "overall_score": evaluation.get_overall_score(),
-        "comments": evaluation.comments,
+        "comments": evaluation.comment,
         "created_at": evaluation.created_at.isoformat(),
     }
 
@@ -99,181 +332,829 @@ def serialize_evaluation(evaluation, include_evaluator=False):
     return data
 
 
+def _latest(*timestamps):
+    """Return the most recent non-null timestamp"""
+    present = [ts for ts in timestamps if ts is not None]
+    return max(present) if present else None
+
+
+def _collection_version(query, model):
+    """Cheap (count, last modified) version of the rows matched by query
+
+    Counter and score writes leave updated_at alone, so the latest of those
+    (stats_updated_at) counts as a modification too.
+    """
+    count, updated_at, stats_at = (
+        query.order_by(None)
+        .with_entities(
+            func.count(model.id),
+            func.max(model.updated_at),
+            func.max(model.stats_updated_at),
+        )
+        .one()
+    )
+    return count, _latest(updated_at, stats_at)
+
+
+def _table_version(model):
+    """Scalar subqueries counting a table's rows and its last update"""
+    return (
+        select(func.count(model.id)).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+    )
+
+
+def _child_version(model, fk_column, parent_id):
+    """Scalar subqueries counting children of a parent and their last update"""
+    return (
+        select(func.count(model.id)).where(fk_column == parent_id).scalar_subquery(),
+        select(func.max(model.updated_at))
+        .where(fk_column == parent_id)
+        .scalar_subquery(),
+    )
+
+
+def _problem_version(problem_id):
+    """Version a problem together with its solutions, evaluations and stats"""
+    return (
+        db.session.query(
+            Problem.updated_at,
+            *_child_version(Solution, Solution.problem_id, problem_id),
+            *_child_version(
+                ProblemEvaluation, ProblemEvaluation.problem_id, problem_id
+            ),
+            Problem.stats_updated_at,
+        )
+        .filter(Problem.id == problem_id)
+        .first()
+    )
+
+
+def _solution_version(solution_id):
+    """Version a solution together with its evaluations and stats"""
+    return (
+        db.session.query(
+            Solution.updated_at,
+            *_child_version(
+                SolutionEvaluation, SolutionEvaluation.solution_id, solution_id
+            ),
+            Solution.stats_updated_at,
+        )
+        .filter(Solution.id == solution_id)
+        .first()
+    )
+
+
 @api_bp.route("/problems")
 def problems():
-    """Get all problems with optional filtering"""
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
+    """Get all problems with optional filtering
+
+    ``?fields=`` restricts both the selected columns and the JSON keys
+    (default: everything except description and the JSON columns, with
+    ``summary`` in their place), ``?include=submitter`` embeds the
+    submitter (the default). ``?sort=trending`` orders by the decayed
+    activity score instead of newest first. ``?tag=`` and ``?department=``
+    filter through the indexed relation tables. ``?include=facets`` adds
+    per-value counts for severity, status, tag and department (see
+    utils.facets), computed in one extra query.
+    """
+    page, per_page = _page_args()
     severity = request.args.get("severity")
     status = request.args.get("status")
+    tag = request.args.get("tag")
+    department = request.args.get("department")
     search = request.args.get("search")
+    sort = request.args.get("sort", "newest")
+    if sort not in PROBLEM_SORTS:
+        abort(400, description=f"sort must be one of: {', '.join(PROBLEM_SORTS)}")
+    fields = _parse_list_arg("fields", PROBLEM_FIELDS, PROBLEM_LIST_FIELDS)
+    include = _parse_list_arg("include", {"submitter", "facets"}, {"submitter"})
+    ids = _parse_ids_arg()
+
+    conditions = []
 
-    query = Problem.query
+    if ids:
+        conditions.append(Problem.id.in_(ids))
+        per_page = len(ids)
 
     if search:
-        query = query.filter(
+        conditions.append(
             or_(Problem.title.contains(search), Problem.description.contains(search))
         )
 
-    if severity:
-        query = query.filter(Problem.severity == severity)
-
-    if status:
-        query = query.filter(Problem.status == status)
-
-    problems = query.order_by(Problem.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    selected = {
+        "severity": severity,
+        "status": status,
+        "tag": tag,
+        "department": department,
+    }
+    query = filter_facets(Problem.query.filter(*conditions), selected)
+
+    count, last_modified = _collection_version(query, Problem)
+    total = None
+    if "facets" in include:
+        # Facet counts drop their own filter, so rows outside the matches count
+        total, table_modified = db.session.query(*_table_version(Problem)).one()
+        if table_modified and (last_modified is None or table_modified > last_modified):
+            last_modified = table_modified
+    if sort == "trending":
+        # Scores change without touching updated_at; version them by refresh
+        ranked_at = trending_version()
+        if ranked_at and (last_modified is None or ranked_at > last_modified):
+            last_modified = ranked_at
+    etag = make_etag("problems", request.full_path, count, total, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    query = query.with_entities(
+        *_select_fields(Problem, PROBLEM_FIELDS, fields, Problem.submitter_id)
     )
-
-    return jsonify(
-        {
-            "problems": [
-                serialize_problem(problem, include_submitter=True)
-                for problem in problems.items
-            ],
-            "pagination": {
-                "page": problems.page,
-                "pages": problems.pages,
-                "per_page": problems.per_page,
-                "total": problems.total,
-                "has_prev": problems.has_prev,
-                "has_next": problems.has_next,
-                "prev_num": problems.prev_num,
-                "next_num": problems.next_num,
-            },
-        }
+    problems = _paginate(
+        query.order_by(*PROBLEM_SORTS[sort]), page, per_page, count
     )
+    submitters = _submitters(problems.items, "submitter" in include)
+
+    payload = {
+        "problems": [
+            serialize_problem(problem, fields, submitters.get(problem.submitter_id))
+            for problem in problems.items
+        ],
+        "pagination": _serialize_pagination(problems),
+    }
+    if "facets" in include:
+        payload["facets"] = facet_counts(conditions, selected)
+
+    response = jsonify(payload)
+    return add_validators(response, etag, last_modified)
 
 
 @api_bp.route("/problems/<int:problem_id>")
 def problem_detail(problem_id):
-    """Get specific problem details"""
-    problem = Problem.query.get_or_404(problem_id)
+    """Get specific problem details
+
+    Nested collections are only returned when listed in ``?include=``
+    (default: submitter,solutions,evaluations) and are paginated with
+    ``solutions_page``/``solutions_per_page`` and
+    ``evaluations_page``/``evaluations_per_page``.
+    """
+    fields = _parse_list_arg("fields", PROBLEM_FIELDS, PROBLEM_DEFAULT_FIELDS)
+    solution_fields = _parse_list_arg(
+        "solution_fields", SOLUTION_FIELDS, SOLUTION_LIST_FIELDS
+    )
+    include = _parse_list_arg(
+        "include",
+        {"submitter", "solutions", "evaluations"},
+        {"submitter", "solutions", "evaluations"},
+    )
 
-    # Get solutions and evaluations
-    solutions = Solution.query.filter_by(problem_id=problem_id).all()
-    evaluations = ProblemEvaluation.query.filter_by(problem_id=problem_id).all()
+    version = _problem_version(problem_id)
+    if version is None:
+        abort(404)
 
-    return jsonify(
-        {
-            "problem": serialize_problem(problem, include_submitter=True),
-            "solutions": [
-                serialize_solution(solution, include_submitter=True)
-                for solution in solutions
-            ],
-            "evaluations": [
-                serialize_evaluation(evaluation, include_evaluator=True)
-                for evaluation in evaluations
-            ],
-        }
+    updated_at, _, solutions_updated, _, evaluations_updated, stats_at = version
+    last_modified = _latest(
+        updated_at, solutions_updated, evaluations_updated, stats_at
+    )
+    etag = make_etag("problem", request.full_path, *version)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    problem = (
+        Problem.query.with_entities(
+            *_select_fields(Problem, PROBLEM_FIELDS, fields, Problem.submitter_id)
+        )
+        .filter(Problem.id == problem_id)
+        .first()
     )
+    if problem is None:
+        abort(404)
+
+    data = {"pagination": {}}
+    rows = [problem]
+
+    if "solutions" in include:
+        page, per_page = _page_args("solutions_")
+        solutions = (
+            Solution.query.filter_by(problem_id=problem_id)
+            .with_entities(
+                *_select_fields(
+                    Solution, SOLUTION_FIELDS, solution_fields, Solution.submitter_id
+                )
+            )
+            .order_by(Solution.created_at.desc(), Solution.id.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+        rows.extend(solutions.items)
+
+    # One query for the problem's and all listed solutions' submitters
+    submitters = _submitters(rows, "submitter" in include or "solutions" in include)
+    data["problem"] = serialize_problem(
+        problem,
+        fields,
+        submitters.get(problem.submitter_id) if "submitter" in include else None,
+    )
+
+    if "solutions" in include:
+        data["solutions"] = [
+            serialize_solution(
+                solution, solution_fields, submitters.get(solution.submitter_id)
+            )
+            for solution in solutions.items
+        ]
+        data["pagination"]["solutions"] = _serialize_pagination(solutions)
+
+    if "evaluations" in include:
+        page, per_page = _page_args("evaluations_")
+        evaluations = (
+            ProblemEvaluation.query.filter_by(problem_id=problem_id)
+            .options(selectinload(ProblemEvaluation.evaluator))
+            .order_by(ProblemEvaluation.created_at.desc(), ProblemEvaluation.id.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+        data["evaluations"] = [
+            serialize_evaluation(evaluation, include_evaluator=True)
+            for evaluation in evaluations.items
+        ]
+        data["pagination"]["evaluations"] = _serialize_pagination(evaluations)
+
+    return add_validators(jsonify(data), etag, last_modified)
 
 
 @api_bp.route("/solutions")
 def solutions():
-    """Get all solutions with optional filtering"""
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
+    """Get all solutions with optional filtering
+
+    Returns ``summary`` instead of ``content`` unless requested via ``?fields=``.
+    ``?sort=rank`` orders by the vote/evaluation ranking instead of newest first.
+    """
+    page, per_page = _page_args()
     problem_id = request.args.get("problem_id", type=int)
     status = request.args.get("status")
+    sort = request.args.get("sort", "newest")
+    if sort not in SOLUTION_SORTS:
+        abort(400, description=f"sort must be one of: {', '.join(SOLUTION_SORTS)}")
+    fields = _parse_list_arg("fields", SOLUTION_FIELDS, SOLUTION_LIST_FIELDS)
+    include = _parse_list_arg("include", {"submitter"}, {"submitter"})
+    ids = _parse_ids_arg()
 
     query = Solution.query
 
+    if ids:
+        query = query.filter(Solution.id.in_(ids))
+        per_page = len(ids)
+
     if problem_id:
         query = query.filter(Solution.problem_id == problem_id)
 
     if status:
         query = query.filter(Solution.status == status)
 
-    solutions = query.order_by(Solution.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    count, last_modified = _collection_version(query, Solution)
+    etag = make_etag("solutions", request.full_path, count, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    query = query.with_entities(
+        *_select_fields(Solution, SOLUTION_FIELDS, fields, Solution.submitter_id)
     )
+    solutions = _paginate(
+        query.order_by(*SOLUTION_SORTS[sort]), page, per_page, count
+    )
+    submitters = _submitters(solutions.items, "submitter" in include)
 
-    return jsonify(
+    response = jsonify(
         {
             "solutions": [
-                serialize_solution(solution, include_submitter=True)
+                serialize_solution(
+                    solution, fields, submitters.get(solution.submitter_id)
+                )
                 for solution in solutions.items
             ],
-            "pagination": {
-                "page": solutions.page,
-                "pages": solutions.pages,
-                "per_page": solutions.per_page,
-                "total": solutions.total,
-                "has_prev": solutions.has_prev,
-                "has_next": solutions.has_next,
-                "prev_num": solutions.prev_num,
-                "next_num": solutions.next_num,
-            },
+            "pagination": _serialize_pagination(solutions),
         }
     )
+    return add_validators(response, etag, last_modified)
 
 
 @api_bp.route("/solutions/<int:solution_id>")
 def solution_detail(solution_id):
     """Get specific solution details"""
-    solution = Solution.query.get_or_404(solution_id)
+    fields = _parse_list_arg("fields", SOLUTION_FIELDS, SOLUTION_DEFAULT_FIELDS)
+    include = _parse_list_arg(
+        "include", {"submitter", "evaluations"}, {"submitter", "evaluations"}
+    )
 
-    # Get evaluations
-    evaluations = SolutionEvaluation.query.filter_by(solution_id=solution_id).all()
+    version = _solution_version(solution_id)
+    if version is None:
+        abort(404)
 
-    return jsonify(
-        {
-            "solution": serialize_solution(solution, include_submitter=True),
-            "evaluations": [
-                serialize_evaluation(evaluation, include_evaluator=True)
-                for evaluation in evaluations
-            ],
-        }
+    updated_at, _, evaluations_updated, stats_at = version
+    last_modified = _latest(updated_at, evaluations_updated, stats_at)
+    etag = make_etag("solution", request.full_path, *version)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    solution = (
+        Solution.query.with_entities(
+            *_select_fields(Solution, SOLUTION_FIELDS, fields, Solution.submitter_id)
+        )
+        .filter(Solution.id == solution_id)
+        .first()
     )
+    if solution is None:
+        abort(404)
+
+    submitters = _submitters([solution], "submitter" in include)
+    data = {
+        "solution": serialize_solution(
+            solution, fields, submitters.get(solution.submitter_id)
+        ),
+        "pagination": {},
+    }
+
+    if "evaluations" in include:
+        page, per_page = _page_args("evaluations_")
+        evaluations = (
+            SolutionEvaluation.query.filter_by(solution_id=solution_id)
+            .options(selectinload(SolutionEvaluation.evaluator))
+            .order_by(
+                SolutionEvaluation.created_at.desc(), SolutionEvaluation.id.desc()
+            )
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+        data["evaluations"] = [
+            serialize_evaluation(evaluation, include_evaluator=True)
+            for evaluation in evaluations.items
+        ]
+        data["pagination"]["evaluations"] = _serialize_pagination(evaluations)
+
+    return add_validators(jsonify(data), etag, last_modified)
 
 
 @api_bp.route("/evaluations")
 def evaluations():
-    """Get all evaluations with optional filtering"""
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
+    """Problem and solution evaluations, newest first
+
+    Filter with ``?problem_id=`` (the problem's evaluations and its
+    solutions'), ``?solution_id=`` and ``?evaluator_id=``. Pass the returned
+    ``next_cursor`` as ``?after=`` for the next page; it is null on the last.
+    """
+    _, per_page = _page_args()
     problem_id = request.args.get("problem_id", type=int)
     solution_id = request.args.get("solution_id", type=int)
+    evaluator_id = request.args.get("evaluator_id", type=int)
+    try:
+        after = parse_timeline_cursor(request.args.get("after"))
+    except ValueError:
+        abort(400, description="Invalid cursor")
+
+    version = db.session.execute(
+        select(
+            *_table_version(ProblemEvaluation), *_table_version(SolutionEvaluation)
+        )
+    ).one()
+    last_modified = _latest(version[1], version[3])
+    etag = make_etag("evaluations", request.full_path, *version)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    rows, next_cursor = evaluation_timeline(
+        evaluator_id=evaluator_id,
+        problem_id=problem_id,
+        solution_id=solution_id,
+        limit=per_page,
+        after=after,
+    )
+    evaluators = load_user_rows(row.evaluator_id for row in rows)
+    for row in rows:
+        row.evaluator = evaluators.get(row.evaluator_id)
+
+    response = jsonify(
+        {
+            "evaluations": [
+                serialize_evaluation(row, include_evaluator=True) for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+    return add_validators(response, etag, last_modified)
 
-    query = ProblemEvaluation.query.union(SolutionEvaluation.query)
 
-    if problem_id:
-        query = query.filter(ProblemEvaluation.problem_id == problem_id)
+@api_bp.route("/evaluations/<int:evaluation_id>")
+def evaluation_detail(evaluation_id):
+    """Get specific evaluation details"""
+    last_modified = (
+        db.session.query(ProblemEvaluation.updated_at)
+        .filter(ProblemEvaluation.id == evaluation_id)
+        .scalar()
+    )
+    etag = make_etag("evaluation", evaluation_id, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
 
-    if solution_id:
-        query = query.filter(SolutionEvaluation.solution_id == solution_id)
+    evaluation = ProblemEvaluation.query.get_or_404(evaluation_id)
 
-    evaluations = query.order_by(ProblemEvaluation.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    response = jsonify(serialize_evaluation(evaluation, include_evaluator=True))
+    return add_validators(response, etag, last_modified)
+
+
+EXPORT_ENTITIES = {
+    "problems": ((Problem, None),),
+    "solutions": ((Solution, None),),
+    "evaluations": (
+        (ProblemEvaluation, "problem_evaluation"),
+        (SolutionEvaluation, "solution_evaluation"),
+    ),
+    "problem_evaluations": ((ProblemEvaluation, None),),
+    "solution_evaluations": ((SolutionEvaluation, None),),
+}
+
+
+@api_bp.route("/export/<entity>")
+@login_required
+@require_scope("export")
+def export(entity):
+    """Stream every row of an entity as NDJSON (admin only)
+
+    ``?since=<ISO timestamp>`` limits the export to rows updated at or after
+    that time; the ``X-Export-Started-At`` response header is the value to
+    pass as ``since`` on the next incremental run. Responses are gzipped when
+    the client sends ``Accept-Encoding: gzip`` or ``?compress=gzip``.
+    """
+    if not current_user.is_admin():
+        return jsonify({"error": "Admin access required"}), 403
+
+    if entity not in EXPORT_ENTITIES:
+        abort(404)
+
+    since = request.args.get("since")
+    if since:
+        try:
+            since = datetime.fromisoformat(since)
+        except ValueError:
+            abort(400, description="since must be an ISO 8601 timestamp")
+
+    started_at = datetime.utcnow()
+
+    def generate():
+        for model, record_type in EXPORT_ENTITIES[entity]:
+            yield from iter_ndjson(export_statement(model, since), record_type)
+
+    body = batch_text(generate())
+    headers = {
+        "X-Export-Started-At": started_at.isoformat(),
+        "Cache-Control": "no-store",
+    }
+
+    use_gzip = request.args.get("compress") == "gzip" or (
+        "gzip" in request.accept_encodings
+    )
+    if use_gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(
+        stream_with_context(body),
+        mimetype="application/x-ndjson",
+        headers=headers,
+    )
+
+
+@api_bp.route("/suggest")
+def suggest():
+    """Type-ahead suggestions for problem titles, tags and departments
+
+    ``?q=`` is matched as a prefix of any title word and of tag and
+    department names. Answers come from the per-worker index in
+    utils.suggest, so they may lag writes by ``SUGGEST_REFRESH_SECONDS``.
+    """
+    query = request.args.get("q", "")
+    max_limit = current_app.config.get("SUGGEST_LIMIT", 10)
+    limit = min(max(request.args.get("limit", max_limit, type=int), 1), max_limit)
+
+    suggestions = get_suggest_index().snapshot().lookup(query, limit)
+
+    response = jsonify(dict(suggestions, query=query))
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get(
+        "SUGGEST_REFRESH_SECONDS", 5
+    )
+    return response
+
+
+@api_bp.route("/changes")
+@login_required
+def changes():
+    """Incremental change feed
+
+    Pass the returned ``next_cursor`` as ``?cursor=`` on the next call; keep
+    calling while ``has_more`` is true. ``?types=problem,vote`` filters by
+    entity type.
+    """
+    cursor = max(request.args.get("cursor", 0, type=int), 0)
+    page_size = current_app.config.get("CHANGE_FEED_PAGE_SIZE", 500)
+    limit = min(max(request.args.get("limit", page_size, type=int), 1), page_size)
+    entity_types = _parse_list_arg(
+        "types", {tracked[0] for tracked in ChangeFeed.TRACKED.values()}, ()
     )
 
+    rows, has_more = ChangeFeed.read(cursor, limit, entity_types)
+
     return jsonify(
         {
-            "evaluations": [
-                serialize_evaluation(evaluation, include_evaluator=True)
-                for evaluation in evaluations.items
+            "changes": [row.to_dict() for row in rows],
+            "next_cursor": rows[-1].id if rows else cursor,
+            "has_more": has_more,
+        }
+    )
+
+
+@api_bp.route("/evaluation-queue")
+@login_required
+def evaluation_queue():
+    """Items the current user has yet to evaluate, fewest evaluations first
+
+    ``?type=problem|solution`` narrows the queue. Pass the returned
+    ``next_cursor`` as ``?after=`` for the next page; it is null on the last.
+    """
+    item_type = request.args.get("type") or None
+    if item_type is not None and item_type not in QUEUE_SOURCES:
+        abort(400, description="type must be problem or solution")
+    try:
+        after = parse_cursor(request.args.get("after"))
+    except ValueError:
+        abort(400, description="Invalid cursor")
+    _, per_page = _page_args()
+
+    rows, next_cursor = EvaluationQueue.for_user(
+        current_user.id, item_type, limit=per_page, after=after
+    )
+
+    return jsonify(
+        {
+            "items": [
+                {
+                    "item_type": row.item_type,
+                    "item_id": row.item_id,
+                    "problem_id": row.problem_id,
+                    "title": row.title,
+                    "summary": row.summary,
+                    "evaluation_count": row.evaluation_count,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in rows
             ],
-            "pagination": {
-                "page": evaluations.page,
-                "pages": evaluations.pages,
-                "per_page": evaluations.per_page,
-                "total": evaluations.total,
-                "has_prev": evaluations.has_prev,
-                "has_next": evaluations.has_next,
-                "prev_num": evaluations.prev_num,
-                "next_num": evaluations.next_num,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@api_bp.route("/analytics/evaluations")
+@login_required
+def evaluation_analytics():
+    """Stored evaluation report (admin only)
+
+    ``?type=problem|solution`` (default problem). Returns agreement per
+    criterion, the most contentious items (highest score variance) and the
+    evaluators whose bias z-score is furthest from zero, ``per_page`` of each.
+    The report is refreshed by ``flask evaluation-report``.
+    """
+    if not current_user.is_admin():
+        return jsonify({"error": "Admin access required"}), 403
+
+    item_type = request.args.get("type", "problem")
+    if item_type not in ANALYTICS_SOURCES:
+        abort(400, description="type must be problem or solution")
+    _, per_page = _page_args()
+
+    agreement = EvaluationAgreement.query.filter_by(item_type=item_type).all()
+    contentious = (
+        EvaluationItemStats.query.filter(
+            EvaluationItemStats.item_type == item_type,
+            EvaluationItemStats.score_variance.isnot(None),
+        )
+        .order_by(EvaluationItemStats.score_variance.desc())
+        .limit(per_page)
+        .all()
+    )
+    outliers = (
+        EvaluatorStats.query.filter(
+            EvaluatorStats.item_type == item_type,
+            EvaluatorStats.bias_z_score.isnot(None),
+        )
+        .order_by(func.abs(EvaluatorStats.bias_z_score).desc())
+        .limit(per_page)
+        .all()
+    )
+
+    return jsonify(
+        {
+            "item_type": item_type,
+            "computed_at": (
+                agreement[0].computed_at.isoformat() if agreement else None
+            ),
+            "agreement": {
+                row.criterion: {
+                    "alpha": row.alpha,
+                    "item_count": row.item_count,
+                    "rating_count": row.rating_count,
+                }
+                for row in agreement
             },
+            "contentious": [
+                {
+                    "item_id": row.item_id,
+                    "evaluation_count": row.evaluation_count,
+                    "mean_score": row.mean_score,
+                    "score_variance": row.score_variance,
+                }
+                for row in contentious
+            ],
+            "outliers": [
+                {
+                    "evaluator_id": row.evaluator_id,
+                    "evaluation_count": row.evaluation_count,
+                    "mean_bias": row.mean_bias,
+                    "bias_z_score": row.bias_z_score,
+                }
+                for row in outliers
+            ],
         }
     )
 
 
-@api_bp.route("/evaluations/<int:evaluation_id>")
-def evaluation_detail(evaluation_id):
-    """Get specific evaluation details"""
-    evaluation = ProblemEvaluation.query.get_or_404(evaluation_id)
+BATCH_MAX_OPERATIONS = 50
+BATCH_WRITE_OPS = {"vote", "mark_read", "delete_notification"}
+BATCH_GET_ENTITIES = {
+    "problem": (Problem, PROBLEM_FIELDS, PROBLEM_DEFAULT_FIELDS, serialize_problem),
+    "solution": (
+        Solution,
+        SOLUTION_FIELDS,
+        SOLUTION_DEFAULT_FIELDS,
+        serialize_solution,
+    ),
+}
+
+
+def _batch_error(status, message):
+    return {"status": status, "body": {"error": message}}
+
+
+def _batch_id(operation, key):
+    """Integer id operation[key], or None when missing or not an integer"""
+    value = operation.get(key)
+    # bool is an int subclass, but true is not an id
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _batch_write(operation):
+    """Apply one write sub-request, returning its result payload"""
+    op = operation.get("op")
+
+    if op == "vote":
+        vote_type = operation.get("vote_type")
+        if vote_type not in ("upvote", "downvote"):
+            return _batch_error(400, "vote_type must be upvote or downvote")
+        solution_id = _batch_id(operation, "solution_id")
+        if solution_id is None:
+            return _batch_error(400, "solution_id must be an integer")
+        solution = db.session.get(Solution, solution_id)
+        if solution is None:
+            return _batch_error(404, "Solution not found")
+        solution.cast_vote(current_user.id, 1 if vote_type == "upvote" else -1)
+        db.session.flush()
+        return {
+            "status": 200,
+            "body": {"success": True, "vote_score": solution.get_vote_score()},
+        }
 
-    return jsonify(serialize_evaluation(evaluation, include_evaluator=True))
+    notification_id = _batch_id(operation, "notification_id")
+    if notification_id is None:
+        return _batch_error(400, "notification_id must be an integer")
+    if op == "mark_read":
+        found = NotificationManager.mark_notification_read(
+            notification_id, current_user.id, commit=False
+        )
+    else:
+        found = NotificationManager.delete_notification(
+            notification_id, current_user.id, commit=False
+        )
+    if not found:
+        return _batch_error(404, "Notification not found")
+    db.session.flush()
+    return {"status": 200, "body": {"success": True}}
+
+
+@api_bp.route("/batch", methods=["POST"])
+def batch():
+    """Execute several sub-requests in one round trip
+
+    Body: ``{"requests": [...], "atomic": false}`` where each request is one of
+    ``{"op": "get", "entity": "problem"|"solution", "id": N}``,
+    ``{"op": "vote", "solution_id": N, "vote_type": "upvote"|"downvote"}``,
+    ``{"op": "mark_read", "notification_id": N}`` or
+    ``{"op": "delete_notification", "notification_id": N}``.
+
+    GETs are resolved with one ``IN`` query per entity type. Writes share a
+    single transaction, each inside a savepoint so one failure does not undo
+    the others. With ``atomic`` they run without savepoints and the first
+    failure rolls the whole transaction back. Results are returned in order.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("requests"), list):
+        abort(400, description="Expected a JSON object with a requests array")
+
+    operations = payload["requests"]
+    atomic = bool(payload.get("atomic"))
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        abort(400, description=f"At most {BATCH_MAX_OPERATIONS} requests per batch")
+
+    results = [None] * len(operations)
+
+    # Resolve every GET with a single IN query per entity type
+    wanted = {}
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results[index] = _batch_error(400, "Each request must be an object")
+        elif operation.get("op") == "get":
+            if operation.get("entity") not in BATCH_GET_ENTITIES:
+                results[index] = _batch_error(400, "Unknown entity")
+            elif _batch_id(operation, "id") is None:
+                results[index] = _batch_error(400, "id must be an integer")
+            else:
+                wanted.setdefault(operation["entity"], []).append(index)
+
+    for entity, indexes in wanted.items():
+        model, field_map, fields, serializer = BATCH_GET_ENTITIES[entity]
+        ids = {operations[index]["id"] for index in indexes}
+        found = {
+            row.id: row
+            for row in model.query.filter(model.id.in_(ids)).with_entities(
+                *_select_fields(model, field_map, fields)
+            )
+        }
+        for index in indexes:
+            row = found.get(operations[index].get("id"))
+            results[index] = (
+                {"status": 200, "body": serializer(row)}
+                if row is not None
+                else _batch_error(404, "Resource not found")
+            )
+
+    # Apply writes in one transaction. Atomic batches skip savepoints: pysqlite
+    # emits no BEGIN, so an outermost SAVEPOINT's RELEASE would commit
+    failed = False
+    for index, operation in enumerate(operations):
+        if results[index] is not None:
+            continue
+        if operation.get("op") not in BATCH_WRITE_OPS:
+            results[index] = _batch_error(400, "Unknown op")
+            failed = True
+            continue
+        if not current_user.is_authenticated:
+            results[index] = _batch_error(401, "Authentication required")
+            failed = True
+            continue
+        if atomic and failed:
+            results[index] = _batch_error(409, "Skipped after earlier failure")
+            continue
+
+        savepoint = None if atomic else db.session.begin_nested()
+        try:
+            results[index] = _batch_write(operation)
+        except Exception as e:
+            current_app.logger.error(f"Batch operation error: {str(e)}")
+            results[index] = _batch_error(500, "Operation failed")
+
+        succeeded = results[index]["status"] == 200
+        if savepoint is not None:
+            if succeeded:
+                savepoint.commit()
+            else:
+                savepoint.rollback()
+        failed = failed or not succeeded
+
+    if atomic and failed:
+        db.session.rollback()
+        for index, result in enumerate(results):
+            # Only object requests can succeed, so .get is safe past the check
+            if result["status"] != 200:
+                continue
+            if operations[index].get("op") in BATCH_WRITE_OPS:
+                results[index] = _batch_error(409, "Rolled back after earlier failure")
+    else:
+        db.session.commit()
+
+    return jsonify({"results": results})
 
 
 @api_bp.route("/users")
@@ -390,6 +1271,67 @@ def stats():
     )
 
 
+@api_bp.route("/tokens")
+@login_required
+@session_only
+def list_tokens():
+    """List the current user's API tokens"""
+    tokens = (
+        ApiToken.query.filter_by(user_id=current_user.id)
+        .order_by(ApiToken.created_at.desc())
+        .all()
+    )
+    return jsonify({"tokens": [token.to_dict() for token in tokens]})
+
+
+@api_bp.route("/tokens", methods=["POST"])
+@login_required
+@session_only
+def create_token():
+    """Issue a personal access token; the plaintext is returned only once
+
+    Body: ``{"name": ..., "scopes": ["read", "write"], "expires_in_days": 90}``
+    """
+    payload = request.get_json(silent=True) or {}
+    name = (payload.get("name") or "").strip()
+    if not name:
+        abort(400, description="name is required")
+
+    try:
+        token, raw_token = ApiToken.issue(
+            current_user,
+            name[:100],
+            scopes=payload.get("scopes"),
+            expires_in_days=payload.get("expires_in_days"),
+        )
+    except (TypeError, ValueError) as e:
+        abort(400, description=str(e))
+
+    db.session.add(token)
+    db.session.commit()
+
+    data = token.to_dict()
+    data["token"] = raw_token
+    return jsonify(data), 201
+
+
+@api_bp.route("/tokens/<int:token_id>", methods=["DELETE"])
+@login_required
+@session_only
+def revoke_token(token_id):
+    """Revoke one of the current user's API tokens"""
+    token = ApiToken.query.filter_by(id=token_id, user_id=current_user.id).first()
+    if token is None:
+        abort(404)
+
+    if token.revoked_at is None:
+        token.revoked_at = datetime.utcnow()
+        db.session.commit()
+    forget_token(token.token_hash)
+
+    return jsonify(token.to_dict())
+
+
 @api_bp.route("/health")
 def health():
     """Health check endpoint"""
@@ -402,6 +1344,12 @@ def health():
     )
 
 
+@api_bp.errorhandler(400)
+def bad_request(error):
+    """Handle 400 errors"""
+    return jsonify({"error": error.description or "Bad request"}), 400
+
+
 @api_bp.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
@@ -7,7 +7,7 @@ from ...models.user import User
 from ...models.problem import Problem
 from ...models.solution import Solution
 from ...models.evaluation import ProblemEvaluation, SolutionEvaluation
-from sqlalchemy.sql import and_, or_, desc
+from ...models.read_models import evaluation_timeline, parse_timeline_cursor
 
 evaluations_bp = Blueprint("evaluations", __name__)
 
@@ -25,7 +25,7 @@ def evaluate_problem(id):
 
         if not problem or not severity_rating or not impact_rating:
             flash("All fields are required.", "error")
-            return redirect(url_for("problems_bp.detail", id=id))
+            return redirect(url_for("problems.detail", id=id))
 
         # Check if user already evaluated this problem
         existing_evaluation = ProblemEvaluation.query.filter_by(
@@ -34,7 +34,7 @@ def evaluate_problem(id):
 
         if existing_evaluation:
             flash("You have already evaluated this problem.", "error")
-            return redirect(url_for("problems_bp.detail", id=id))
+            return redirect(url_for("problems.detail", id=id))
 
         evaluation = ProblemEvaluation(
             problem_id=id,
@@ -53,7 +53,7 @@ def evaluate_problem(id):
             db.session.rollback()
             flash("An error occurred while evaluating the problem.", "error")
 
-        return redirect(url_for("problems_bp.detail", id=id))
+        return redirect(url_for("problems.detail", id=id))
 
 
 @evaluations_bp.route("/solution/<int:id>", methods=["GET", "POST"])
@@ -75,7 +75,7 @@ def evaluate_solution(id):
             or not completeness_rating
         ):
             flash("All ratings and comment are required.", "error")
-            return redirect(url_for("solutions_bp.detail", id=id))
+            return redirect(url_for("solutions.detail", id=id))
 
         # Check if user already evaluated this problem
         existing_evaluation = ProblemEvaluation.query.filter_by(
@@ -83,7 +83,7 @@ def evaluate_solution(id):
         ).first()
 
         if existing_evaluation:
-            return redirect(url_for("solutions_bp.detail", id=id))
+            return redirect(url_for("solutions.detail", id=id))
 
         evaluation = SolutionEvaluation(
             solution_id=id,
@@ -103,26 +103,24 @@ def evaluate_solution(id):
             db.session.rollback()
             flash("An error occurred while evaluating the solution.", "error")
 
-        return redirect(url_for("solutions_bp.detail", id=id))
+        return redirect(url_for("solutions.detail", id=id))
 
 
 @evaluations_bp.route("/my-evaluations")
 @login_required
 def my_evaluations():
     """View user's evaluation history"""
-    evaluations = (
-        db.session.query(
-            ProblemEvaluation.join(Problem), SolutionEvaluation.join(Solution)
-        )
-        .filter(
-            or_(
-                ProblemEvaluation.evaluator_id == current_user.id,
-                SolutionEvaluation.evaluator_id == current_user.id,
-            )
-        )
-        .order_by(desc("evaluations.created_at"))
-        .limit(20)
-        .all()
+    try:
+        after = parse_timeline_cursor(request.args.get("after"))
+    except ValueError:
+        abort(400)
+
+    evaluations, next_cursor = evaluation_timeline(
+        evaluator_id=current_user.id, limit=20, after=after
     )
 
-    return render_template("evaluations/my_evaluations.html", evaluations=evaluations)
+    return render_template(
+        "evaluations/my_evaluations.html",
+        evaluations=evaluations,
+        next_cursor=next_cursor,
+    )
@@ -4,6 +4,12 @@ from flask import Blueprint, render_template, redirect, url_for
 from flask_login import login_required, current_user
 from ...models.problem import Problem
 from ...models.solution import Solution
+from ...models.read_models import (
+    problem_rows_select,
+    load_problem_rows,
+    solution_rows_select,
+    load_solution_rows,
+)
 from ...extensions import db
 
 main_bp = Blueprint("main", __name__)
@@ -12,27 +18,18 @@ main_bp = Blueprint("main", __name__)
 @main_bp.route("/")
 def index():
     """Main landing page"""
-    featured_problems = (
-        Problem.query.filter_by(status="open")
-        .order_by(Problem.view_count.desc())
+    featured_problems = load_problem_rows(
+        problem_rows_select()
+        .where(Problem.status == "open")
+        .order_by(Problem.trending_score.desc())
         .limit(6)
-        .all()
     )
-    recent_solutions = (
-        Solution.query.join(Problem)
-        .filter(Problem.status == "open")
-        .order_by(Solution.created_at.desc())
-        .limit(4)
-        .all()
-    )
-
     # Get recent solutions
-    recent_solutions = (
-        Solution.query.join(Problem)
-        .filter(Problem.status == "open")
+    recent_solutions = load_solution_rows(
+        solution_rows_select()
+        .where(Problem.status == "open")
         .order_by(Solution.created_at.desc())
         .limit(4)
-        .all()
     )
 
     return render_template(
@@ -1 +1,5 @@
 """Notifications blueprint initialization"""
+
+from .routes import notifications_bp
+
+__all__ = ["notifications_bp"]
@@ -105,7 +105,7 @@ def preferences():
         db.session.commit()
 
         flash("Notification preferences updated!", "success")
-        return redirect(url_for("notifications_bp.index"))
+        return redirect(url_for("notifications.index"))
 
     return render_template("notifications/preferences.html")
 
@@ -114,13 +114,7 @@ def preferences():
 @login_required
 def delete_notification(notification_id):
     """Delete a notification"""
-    notification = Notification.query.filter_by(
-        id=notification_id, user_id=current_user.id
-    ).first()
-
-    if notification:
-        db.session.delete(notification)
-        db.session.commit()
+    if NotificationManager.delete_notification(notification_id, current_user.id):
         return jsonify({"success": True})
     else:
         return jsonify({"success": False, "error": "Notification not found"})
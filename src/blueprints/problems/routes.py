@@ -8,16 +8,30 @@ from flask import (
     request,
     flash,
     abort,
+    current_app,
 )
-from flask_login import login_required, current_user as current_user_func
+from flask_login import login_required, current_user
 from flask_sqlalchemy.pagination import Pagination
 from ...extensions import db
 from ...models.user import User
 from ...models.problem import Problem
 from ...models.solution import Solution
-from ...models.tag import Tag, ProblemTag
+from ...models.read_models import (
+    problem_rows_select,
+    load_problem_rows,
+    paginate_rows,
+)
 from ...utils.anonymizer import Anonymizer
 from ...utils.notification_manager import NotificationManager
+from ...utils.duplicates import find_duplicates
+from ...utils.facets import facet_counts, filter_facets
+from ...utils.similarity import related_problems
+from ...utils.tagging import (
+    parse_names,
+    get_or_create_tags,
+    set_problem_tags,
+    set_problem_departments,
+)
 from sqlalchemy.sql import and_, or_, desc
 
 problems_bp = Blueprint("problems", __name__)
@@ -31,29 +45,36 @@ def list():
     severity = request.args.get("severity", "")
     status_filter = request.args.get("status", "")
     tag_filter = request.args.get("tag", "")
+    department_filter = request.args.get("department", "")
+    sort = request.args.get("sort", "newest")
 
-    query = Problem.query
-
+    conditions = []
     if search:
-        query = query.filter(
+        conditions.append(
             or_(Problem.title.contains(search), Problem.description.contains(search))
         )
 
-    if severity:
-        query = query.filter(Problem.severity == severity)
-
-    if status_filter:
-        query = query.filter(Problem.status == status_filter)
-
-    if tag_filter:
-        # TODO: Implement tag filtering when tag model is created
-        # query = (
-        #     query.join(Problem.tags_relation).join(Tag).filter(Tag.name == tag_filter)
-        # )
-        pass
-
-    problems = query.order_by(Problem.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
+    # Tags and departments are index joins on their relation tables
+    selected = {
+        "severity": severity,
+        "status": status_filter,
+        "tag": tag_filter,
+        "department": department_filter,
+    }
+
+    # Read-only listing: plain row objects, no ORM instances to hydrate
+    statement = filter_facets(problem_rows_select().where(*conditions), selected)
+
+    if sort == "trending":
+        order = (Problem.trending_score.desc(), Problem.id.desc())
+    else:
+        order = (Problem.created_at.desc(),)
+
+    problems = paginate_rows(
+        statement.order_by(*order),
+        load_problem_rows,
+        page=page,
+        per_page=20,
     )
 
     return render_template(
@@ -63,6 +84,10 @@ def list():
         severity=severity,
         status_filter=status_filter,
         tag_filter=tag_filter,
+        department_filter=department_filter,
+        selected=selected,
+        facets=facet_counts(conditions, selected),
+        sort=sort,
         current_page=page,
         current_user=current_user,
         get_display_name=Anonymizer.get_display_name,
@@ -77,17 +102,10 @@ def create():
         title = request.form.get("title", "").strip()
         description = request.form.get("description", "").strip()
         initial_solutions = request.form.getlist("solutions")
-        # TODO: Implement tag handling when tag model is created
-        # problem_tags = request.form.getlist("tags")
-        # for tag_name in problem_tags:
-        #     tag = Tag.query.filter_by(name=tag_name.strip()).first()
-        #     if not tag:
-        #         tag = Tag(name=tag_name.strip(), description=f"Tag for {tag_name}")
-        #         db.session.add(tag)
-        #         db.session.flush()
-        #
-        #     problem_tag = ProblemTag(problem_id=problem.id, tag_id=tag.id)
-        #         db.session.add(problem_tag)
+        visibility = request.form.get("visibility", "identified")
+        severity = request.form.get("severity", "medium")
+        problem_tags = parse_names(request.form.getlist("tags"))
+        departments = parse_names(request.form.getlist("departments"))
 
         if not title or not description:
             flash("Title and description are required.", "error")
@@ -96,11 +114,29 @@ def create():
                 title=title,
                 description=description,
                 initial_solutions=initial_solutions,
-                problem_tags=[],
-                visibility="identified",
-                severity="medium",
+                problem_tags=problem_tags,
+                departments=departments,
+                visibility=visibility,
+                severity=severity,
             )
 
+        # Submitters can't see who filed what, so point out likely repeats
+        # once; resubmitting with confirm_new set files it anyway
+        if not request.form.get("confirm_new"):
+            duplicates = find_duplicates(title, description)
+            if duplicates:
+                return render_template(
+                    "problems/create.html",
+                    title=title,
+                    description=description,
+                    initial_solutions=initial_solutions,
+                    problem_tags=problem_tags,
+                    departments=departments,
+                    visibility=visibility,
+                    severity=severity,
+                    duplicates=duplicates,
+                )
+
         problem = Problem(
             title=title,
             description=description,
@@ -108,9 +144,10 @@ def create():
             submitter_pseudonym=current_user.get_pseudonym(),
             visibility=visibility,
             severity=severity,
-            affected_departments=request.form.getlist("departments"),
             status="open",
         )
+        set_problem_tags(problem, get_or_create_tags(problem_tags).values())
+        set_problem_departments(problem, departments)
 
         try:
             db.session.add(problem)
@@ -120,7 +157,7 @@ def create():
             NotificationManager.notify_problem_created(problem)
 
             flash("Problem created successfully!", "success")
-            return redirect(url_for("problems_bp.detail", id=problem.id))
+            return redirect(url_for("problems.detail", id=problem.id))
         except Exception as e:
             db.session.rollback()
             flash("An error occurred while creating problem.", "error")
@@ -130,9 +167,10 @@ def create():
                 title=title,
                 description=description,
                 initial_solutions=initial_solutions,
-                problem_tags=[],
-                visibility="identified",
-                severity="medium",
+                problem_tags=problem_tags,
+                departments=departments,
+                visibility=visibility,
+                severity=severity,
             )
 
     return render_template("problems/create.html")
@@ -143,6 +181,11 @@ def create():
 @problems_bp.route("/<int:id>")
 def detail(id):
     """Problem detail view with solutions and evaluations"""
+    if request.method == "GET":
+        # Feeds the trending ranking (see utils.trending); done before loading
+        # so the commit doesn't expire the problem
+        Problem.record_view(id)
+
     problem = Problem.query.get_or_404(id)
 
     if request.method == "POST":
@@ -183,6 +226,7 @@ def detail(id):
         "problems/detail.html",
         problem=problem,
         solutions=solutions,
+        related=related_problems(id),
         is_editable=problem.is_editable_by(current_user),
         current_user=current_user,
         get_display_name=Anonymizer.get_display_name,
@@ -212,11 +256,18 @@ def edit(id):
             problem.visibility = visibility
         if severity:
             problem.severity = severity
+        if "tags" in request.form:
+            tag_names = parse_names(request.form.getlist("tags"))
+            set_problem_tags(problem, get_or_create_tags(tag_names).values())
+        if "departments" in request.form:
+            set_problem_departments(
+                problem, parse_names(request.form.getlist("departments"))
+            )
 
         try:
             db.session.commit()
             flash("Problem updated successfully!", "success")
-            return redirect(url_for("problems_bp.detail", id=problem.id))
+            return redirect(url_for("problems.detail", id=problem.id))
         except Exception as e:
             db.session.rollback()
             flash("An error occurred while updating the problem.", "error")
@@ -228,16 +279,22 @@ def edit(id):
 def search():
     """Search results page"""
     query = request.args.get("q", "")
+    conditions = [
+        or_(Problem.title.contains(query), Problem.description.contains(query))
+    ]
 
-    problems = (
-        Problem.query.filter(
-            or_(Problem.title.contains(query), Problem.description.contains(query))
-        )
+    problems = load_problem_rows(
+        problem_rows_select()
+        .where(*conditions)
         .order_by(Problem.created_at.desc())
         .limit(50)
-        .all()
     )
 
     return render_template(
-        "problems/search_results.html", problems=problems, query=query
+        "problems/search_results.html",
+        problems=problems,
+        query=query,
+        search=query,
+        selected={},
+        facets=facet_counts(conditions),
     )
@@ -12,12 +12,12 @@ from flask import (
 )
 from flask_login import login_required, current_user
 from ...extensions import db
-from ..models.user import User
-from ..models.solution import Solution
-from ..models.problem import Problem
-from ..models.vote import Vote
+from ...models.user import User
+from ...models.solution import Solution
+from ...models.problem import Problem
+from ...models.evaluation import SolutionEvaluation
+from ...utils.comment_threads import count_threads, load_threads
 from ...utils.notification_manager import NotificationManager
-from sqlalchemy.sql import and_, or_, desc
 
 solutions_bp = Blueprint("solutions", __name__)
 
@@ -31,7 +31,7 @@ def create():
 
     if not problem_id or not content:
         flash("Problem ID and solution content are required.", "error")
-        return redirect(request.referrer or url_for("problems_bp.list"))
+        return redirect(request.referrer or url_for("problems.list"))
 
     problem = Problem.query.get_or_404(problem_id)
 
@@ -51,11 +51,11 @@ def create():
         NotificationManager.notify_solution_added(solution)
 
         flash("Solution created successfully!", "success")
-        return redirect(url_for("problems_bp.detail", id=problem_id))
+        return redirect(url_for("problems.detail", id=problem_id))
     except Exception as e:
         db.session.rollback()
         flash("An error occurred while creating the solution.", "error")
-        return redirect(url_for("problems_bp.detail", id=problem_id))
+        return redirect(url_for("problems.detail", id=problem_id))
 
 
 @solutions_bp.route("/<int:id>/vote", methods=["POST"])
@@ -71,37 +71,7 @@ def vote():
         if not solution:
             return jsonify({"success": False, "message": "Solution not found"}), 404
 
-        # Check if user already voted
-        existing_vote = Vote.query.filter_by(
-            user_id=current_user.id, solution_id=solution_id
-        ).first()
-
-        if existing_vote:
-            # Update existing vote
-            existing_vote.score = 1 if vote_type == "upvote" else -1
-            db.session.commit()
-            return jsonify(
-                {
-                    "success": True,
-                    "message": "Vote updated successfully",
-                    "vote_score": solution.get_vote_score(),
-                }
-            )
-
-        # Create new vote
-        vote = Vote(
-            user_id=current_user.id,
-            solution_id=solution_id,
-            score=1 if vote_type == "upvote" else -1,
-        )
-        db.session.add(vote)
-
-        # Update solution vote count
-        if vote_type == "upvote":
-            solution.upvotes += 1
-        else:
-            solution.downvotes += 1
-
+        solution.cast_vote(current_user.id, 1 if vote_type == "upvote" else -1)
         db.session.commit()
 
         return jsonify(
@@ -124,23 +94,25 @@ def detail(id):
 
     # Get evaluations
     evaluations = (
-        solution.evaluations.order_by(desc("solutions.created_at")).limit(5).all()
-    )
-
-    # Get comments
-    comments = (
-        solution.comments.filter_by(parent_id=None)
-        .order_by("solutions.created_at.desc()")
-        .limit(10)
+        SolutionEvaluation.query.filter_by(solution_id=id)
+        .order_by(SolutionEvaluation.created_at.desc())
+        .limit(5)
         .all()
     )
 
+    # One page of comment threads with their replies, in one query
+    page = max(request.args.get("comments_page", 1, type=int), 1)
+    comments = load_threads(solution_id=id, page=page)
+    thread_count = count_threads(solution_id=id)
+
     return render_template(
         "solutions/detail.html",
         solution=solution,
         problem=problem,
         evaluations=evaluations,
         comments=comments,
+        thread_count=thread_count,
+        comments_page=page,
     )
 
 
@@ -166,7 +138,7 @@ def edit(id):
         try:
             db.session.commit()
             flash("Solution updated successfully!", "success")
-            return redirect(url_for("solutions_bp.detail", id=solution.id))
+            return redirect(url_for("solutions.detail", id=solution.id))
         except Exception as e:
             db.session.rollback()
             flash("An error occurred while updating the solution.", "error")
@@ -188,7 +160,7 @@ def delete(id):
         db.session.delete(solution)
         db.session.commit()
         flash("Solution deleted successfully!", "success")
-        return redirect(url_for("problems_bp.detail", id=solution.problem_id))
+        return redirect(url_for("problems.detail", id=solution.problem_id))
     except Exception as e:
         db.session.rollback()
         flash("An error occurred while deleting the solution.", "error")
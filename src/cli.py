@@ -1,12 +1,13 @@
 """CLI commands for database management and seeding"""
 
+import click
 from flask.cli import with_appcontext
-from ..extensions import db
-from ..models.user import User
-from ..models.problem import Problem
-from ..models.solution import Solution
-from ..models.tag import Tag
-from ..utils.anonymizer import Anonymizer
+from .extensions import db
+from .models.user import User
+from .models.problem import Problem
+from .models.solution import Solution
+from .models.supporting import Tag
+from .utils.anonymizer import Anonymizer
 
 
 def register_cli(app):
@@ -18,8 +19,23 @@ def register_cli(app):
     app.cli.add_command(list_users)
     app.cli.add_command(process_anonymity_decay)
     app.cli.add_command(send_digest_emails)
-
-
+    app.cli.add_command(prune_changes)
+    app.cli.add_command(create_api_token)
+    app.cli.add_command(backfill_summaries)
+    app.cli.add_command(benchmark_read_models)
+    app.cli.add_command(rebuild_evaluation_queue)
+    app.cli.add_command(refresh_trending)
+    app.cli.add_command(rank_solutions)
+    app.cli.add_command(rescore)
+    app.cli.add_command(evaluation_report)
+    app.cli.add_command(backfill_comment_paths)
+    app.cli.add_command(reconcile_counters)
+    app.cli.add_command(backfill_taxonomy)
+    app.cli.add_command(build_signatures)
+    app.cli.add_command(build_similarity)
+
+
+@click.command("init-db")
 @with_appcontext
 def init_db():
     """Initialize database with tables"""
@@ -27,6 +43,7 @@ def init_db():
     print("Database initialized successfully!")
 
 
+@click.command("reset-db")
 @with_appcontext
 def reset_db():
     """Reset database (WARNING: destroys all data)"""
@@ -38,6 +55,7 @@ def reset_db():
         print("Operation cancelled.")
 
 
+@click.command("seed-db")
 @with_appcontext
 def seed_db():
     """Add sample data for development"""
@@ -58,6 +76,7 @@ def seed_db():
     print(f"Created {len(tags_data)} sample tags")
 
 
+@click.command("create-user")
 @with_appcontext
 def create_user():
     """Create a new user"""
@@ -78,6 +97,7 @@ def create_user():
     print(f"User {email} created successfully!")
 
 
+@click.command("list-users")
 @with_appcontext
 def list_users():
     """List all users"""
@@ -96,6 +116,7 @@ def list_users():
     print("-" * 50)
 
 
+@click.command("process-anonymity-decay")
 @with_appcontext
 def process_anonymity_decay():
     """Process anonymity decay for old content"""
@@ -153,3 +174,272 @@ def process_anonymity_decay():
 
     total_revealed = len(problems_to_reveal) + len(solutions_to_reveal)
     print(f"Anonymity decay processed: {total_revealed} items revealed")
+
+
+@click.command("send-digest-emails")
+@with_appcontext
+def send_digest_emails():
+    """Email each active user a digest of their unread notifications"""
+    from .utils.notification_manager import NotificationManager
+
+    sent = NotificationManager.send_digest_emails()
+    print(f"Sent {sent} digest emails")
+
+
+@click.command("prune-changes")
+@click.option("--days", type=int, default=None, help="Keep this many days of changes")
+@with_appcontext
+def prune_changes(days):
+    """Delete change feed entries older than the retention period"""
+    from datetime import datetime, timedelta
+    from flask import current_app
+    from .models.change_log import ChangeLog
+
+    days = days or current_app.config.get("CHANGE_FEED_RETENTION_DAYS", 90)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    deleted = ChangeLog.query.filter(ChangeLog.created_at < cutoff).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+
+    print(f"Pruned {deleted} change log entries older than {days} days")
+
+
+@click.command("create-api-token")
+@click.argument("email")
+@click.option("--name", default="cli", help="Label shown in token listings")
+@click.option(
+    "--scope", "scopes", multiple=True, default=["read"], help="read, write or export"
+)
+@click.option("--expires-days", type=int, default=None, help="Days until expiry")
+@with_appcontext
+def create_api_token(email, name, scopes, expires_days):
+    """Issue a personal API token for a user"""
+    from .models.api_token import ApiToken
+
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        print(f"User {email} not found!")
+        return
+
+    try:
+        token, raw_token = ApiToken.issue(user, name, scopes, expires_days)
+    except ValueError as e:
+        print(str(e))
+        return
+
+    db.session.add(token)
+    db.session.commit()
+
+    print(f"Token for {email} ({token.scopes}): {raw_token}")
+    print("Store it now; it cannot be shown again.")
+
+
+@click.command("backfill-summaries")
+@click.option("--batch-size", type=int, default=500, help="Rows per commit")
+@with_appcontext
+def backfill_summaries(batch_size):
+    """Populate list-view summaries for rows created before they existed"""
+    from sqlalchemy import select, update
+    from .utils.text import summarize
+
+    for model, source in ((Problem, Problem.description), (Solution, Solution.content)):
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(model.id, source)
+                .where(model.summary.is_(None), model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            # Bulk UPDATE by primary key; bumps updated_at so caches refresh
+            db.session.execute(
+                update(model),
+                [{"id": row_id, "summary": summarize(text)} for row_id, text in rows],
+            )
+            db.session.commit()
+            total += len(rows)
+            last_id = rows[-1][0]
+
+        print(f"Backfilled {total} {model.__tablename__} summaries")
+
+
+@click.command("benchmark-read-models")
+@click.option("--rows", type=int, default=500, help="Rows fetched per query")
+@click.option("--repeat", type=int, default=5, help="Runs per path (median kept)")
+@with_appcontext
+def benchmark_read_models(rows, repeat):
+    """Compare ORM entity loading with read-model rows for list queries"""
+    import statistics
+    import time
+    import tracemalloc
+    from sqlalchemy.orm import selectinload
+    from .models.read_models import (
+        problem_rows_select,
+        load_problem_rows,
+        solution_rows_select,
+        load_solution_rows,
+    )
+
+    paths = {
+        "problems/orm": lambda: Problem.query.options(
+            Problem.list_options(), selectinload(Problem.submitter)
+        )
+        .order_by(Problem.created_at.desc())
+        .limit(rows)
+        .all(),
+        "problems/rows": lambda: load_problem_rows(
+            problem_rows_select().order_by(Problem.created_at.desc()).limit(rows)
+        ),
+        "solutions/orm": lambda: Solution.query.options(
+            Solution.list_options(),
+            selectinload(Solution.problem),
+            selectinload(Solution.submitter),
+        )
+        .order_by(Solution.created_at.desc())
+        .limit(rows)
+        .all(),
+        "solutions/rows": lambda: load_solution_rows(
+            solution_rows_select().order_by(Solution.created_at.desc()).limit(rows)
+        ),
+    }
+
+    print(f"{'path':<16}{'rows':>8}{'median ms':>12}{'peak KiB':>12}")
+    for name, run in paths.items():
+        timings = []
+        peaks = []
+        for _ in range(repeat):
+            # Start each run cold so the identity map can't serve cached objects
+            db.session.expunge_all()
+            tracemalloc.start()
+            started = time.perf_counter()
+            result = run()
+            timings.append((time.perf_counter() - started) * 1000)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+
+        print(
+            f"{name:<16}{len(result):>8}"
+            f"{statistics.median(timings):>12.2f}{statistics.median(peaks):>12.1f}"
+        )
+
+
+@click.command("rebuild-evaluation-queue")
+@with_appcontext
+def rebuild_evaluation_queue():
+    """Recompute the evaluation queue from problems, solutions and evaluations"""
+    from .utils.evaluation_queue import EvaluationQueue
+
+    total = EvaluationQueue.rebuild()
+    print(f"Evaluation queue rebuilt with {total} items")
+
+
+@click.command("refresh-trending")
+@with_appcontext
+def refresh_trending():
+    """Fold recent views, votes, solutions and evaluations into trending scores"""
+    from .utils.trending import refresh_trending as refresh
+
+    updated = refresh()
+    print(f"Updated trending scores for {updated} problems")
+
+
+@click.command("rank-solutions")
+@click.option("--batch-size", type=int, default=500, help="Problems per commit")
+@with_appcontext
+def rank_solutions(batch_size):
+    """Recompute stored solution rankings from votes and evaluations"""
+    from .utils.ranking import SolutionRanking
+
+    total = SolutionRanking.rebuild(batch_size)
+    print(f"Updated rankings for {total} solutions")
+
+
+@click.command("rescore")
+@click.option("--batch-size", type=int, default=1000, help="Rows per transaction")
+@click.option("--all", "rescore_all", is_flag=True, help="Include up-to-date rows")
+@with_appcontext
+def rescore(batch_size, rescore_all):
+    """Recompute evaluation scores after EVALUATION_CRITERIA changes"""
+    from .utils.ranking import rescore as rescore_rows
+    from .utils.scoring import criteria_version
+
+    updated = rescore_rows(batch_size, force=rescore_all)
+    for table, count in updated.items():
+        print(f"Rescored {count} {table} (criteria version {criteria_version()})")
+
+
+@click.command("evaluation-report")
+@click.option("--batch-size", type=int, default=5000, help="Rows fetched per batch")
+@with_appcontext
+def evaluation_report(batch_size):
+    """Recompute evaluation distributions and inter-rater agreement"""
+    from .utils.evaluation_analytics import build_report
+
+    for item_type, summary in build_report(batch_size).items():
+        alpha = "n/a" if summary["alpha"] is None else f"{summary['alpha']:.3f}"
+        print(
+            f"{item_type.capitalize()} evaluations: {summary['items']} items, "
+            f"{summary['evaluators']} evaluators, alpha {alpha}"
+        )
+
+
+@click.command("backfill-comment-paths")
+@click.option("--batch-size", type=int, default=1000, help="Comments per transaction")
+@with_appcontext
+def backfill_comment_paths(batch_size):
+    """Fill in materialized paths and reply counts of existing comments"""
+    from .utils.comment_threads import CommentThreads
+
+    total = CommentThreads.backfill(batch_size)
+    print(f"Placed {total} comments in their threads")
+
+
+@click.command("reconcile-counters")
+@click.option("--batch-size", type=int, default=1000, help="Rows per transaction")
+@with_appcontext
+def reconcile_counters(batch_size):
+    """Recount cached solution, evaluation and comment counts"""
+    from .utils.counters import CounterCache
+
+    for table, count in CounterCache.reconcile(batch_size).items():
+        print(f"Repaired counts of {count} {table}")
+
+
+@click.command("backfill-taxonomy")
+@click.option("--batch-size", type=int, default=500, help="Problems per transaction")
+@with_appcontext
+def backfill_taxonomy(batch_size):
+    """Copy JSON tags and departments into their indexed relation tables"""
+    from .utils.tagging import backfill_taxonomy as backfill
+
+    total = backfill(batch_size)
+    print(f"Synced tags and departments of {total} problems")
+
+
+@click.command("build-signatures")
+@click.option("--batch-size", type=int, default=500, help="Problems per transaction")
+@click.option("--all", "rebuild_all", is_flag=True, help="Include up-to-date rows")
+@with_appcontext
+def build_signatures(batch_size, rebuild_all):
+    """Compute duplicate-detection signatures of existing problems"""
+    from .utils.duplicates import ProblemSignatures
+
+    total = ProblemSignatures.rebuild(batch_size, force=rebuild_all)
+    print(f"Computed signatures for {total} problems")
+
+
+@click.command("build-similarity")
+@click.option("--full", is_flag=True, help="Recompute every problem's neighbours")
+@with_appcontext
+def build_similarity(full):
+    """Precompute related problems from TF-IDF similarity"""
+    from .utils.similarity import build_similarity as build
+
+    total = build(full=full)
+    print(f"Updated related problems for {total} problems")
@@ -2,6 +2,7 @@
 Configuration classes for different environments
 """
 
+import json
 import os
 from dotenv import load_dotenv
 
@@ -42,9 +43,58 @@ class Config:
     NOTIFICATIONS_ENABLED = True
     DAILY_DIGEST_ENABLED = True
 
+    # Template fragment caching
+    FRAGMENT_CACHE_ENABLED = True
+    FRAGMENT_CACHE_SIZE = 4096
+    FRAGMENT_CACHE_TIMEOUT = 300  # seconds
+
+    # Per-worker cache of logged-in user snapshots
+    USER_CACHE_SIZE = 4096
+    USER_CACHE_TTL = 30  # seconds; bounds staleness across workers
+
+    # Per-worker cache of dashboard widgets, dropped on the user's own changes
+    DASHBOARD_CACHE_SIZE = 1024
+    DASHBOARD_CACHE_TTL = 60  # seconds; bounds staleness of other users' content
+
+    # Trending ranking (flask refresh-trending); weights override utils.trending
+    TRENDING_HALF_LIFE_HOURS = 24
+    TRENDING_WEIGHTS = {}
+
+    # Evaluation criteria weights (None uses utils.scoring.DEFAULT_CRITERIA);
+    # bump the version when changing them and run flask rescore
+    EVALUATION_CRITERIA = (
+        json.loads(os.environ["EVALUATION_CRITERIA"])
+        if os.environ.get("EVALUATION_CRITERIA")
+        else None
+    )
+
+    # Solution ranking: evaluation means start from this many pseudo-ratings
+    RANKING_PRIOR_MEAN = 3.0
+    RANKING_PRIOR_WEIGHT = 5
+
+    # Per-worker autocomplete index, caught up from the change feed
+    SUGGEST_REFRESH_SECONDS = 5  # bounds staleness of suggestions
+    SUGGEST_LIMIT = 10  # suggestions per kind
+
+    # Duplicate detection on problem submission (see utils.duplicates)
+    DUPLICATE_REFRESH_SECONDS = 5
+    DUPLICATE_THRESHOLD = 0.5  # estimated Jaccard similarity of shingles
+    DUPLICATE_LIMIT = 5
+
     # API settings
     API_ENABLED = True
-    API_RATE_LIMIT = 100
+    API_RATE_LIMIT = 100  # requests per window per client
+    API_RATE_LIMIT_WINDOW = 60  # seconds
+    API_RATE_LIMIT_ENABLED = True
+    # memory, sqlite:///path/to/file.db (shared across workers) or redis://...
+    API_RATE_LIMIT_STORAGE = os.environ.get("API_RATE_LIMIT_STORAGE", "memory")
+    API_TOKEN_CACHE_SIZE = 1024
+    API_TOKEN_CACHE_TTL = 60  # seconds; bounds how long a revoked token lingers
+    CHANGE_FEED_PAGE_SIZE = 500
+    # Gaps in the feed are waited on this long; keep above the longest write
+    # transaction, whose entries are otherwise missed (see ChangeFeed.read)
+    CHANGE_FEED_SETTLE_SECONDS = 2
+    CHANGE_FEED_RETENTION_DAYS = 90
 
     # Admin emails
     ADMIN_EMAILS = (
@@ -72,6 +122,8 @@ class TestingConfig(Config):
         os.environ.get("TEST_DATABASE_URL") or "sqlite:///:memory:"
     )
     WTF_CSRF_ENABLED = False
+    FRAGMENT_CACHE_ENABLED = False
+    API_RATE_LIMIT_ENABLED = False
 
 
 class ProductionConfig(Config):
@@ -82,6 +134,10 @@ class ProductionConfig(Config):
         os.environ.get("DATABASE_URL") or "sqlite:///problem_solver.db"
     )
     SESSION_COOKIE_SECURE = True
+    API_RATE_LIMIT_STORAGE = (
+        os.environ.get("API_RATE_LIMIT_STORAGE")
+        or "sqlite:///problem_solver_ratelimit.db"
+    )
 
     # Production security headers
     REMEMBER_COOKIE_SECURE = True
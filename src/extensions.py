@@ -26,7 +26,15 @@ mail = Mail()
 
 @login_manager.user_loader
 def load_user(user_id):
-    """User loader for Flask-Login"""
-    from .models.user import User
+    """User loader for Flask-Login (served from the user snapshot cache)"""
+    from .utils.user_cache import load_user_snapshot
 
-    return User.query.get(int(user_id))
+    return load_user_snapshot(int(user_id))
+
+
+@login_manager.request_loader
+def load_user_from_request(request):
+    """Bearer token loader for API requests"""
+    from .utils.api_auth import load_user_from_bearer
+
+    return load_user_from_bearer(request)
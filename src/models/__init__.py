@@ -7,4 +7,21 @@ from .user import User
 from .problem import Problem
 from .solution import Solution
 from .evaluation import ProblemEvaluation, SolutionEvaluation
-from .supporting import Vote, Comment, Notification, Tag, ProblemTag
+from .supporting import (
+    Vote,
+    Comment,
+    Notification,
+    Tag,
+    ProblemTag,
+    ProblemDepartment,
+)
+from .change_log import ChangeLog
+from .api_token import ApiToken
+from .evaluation_queue import EvaluationQueueItem
+from .job_state import JobState
+from .evaluation_report import (
+    EvaluationItemStats,
+    EvaluatorStats,
+    EvaluationAgreement,
+)
+from .similarity import ProblemSignature, ProblemSimilarity
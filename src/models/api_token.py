@@ -0,0 +1,98 @@
+"""
+Personal API access tokens for Bearer authentication against the REST API
+"""
+
+import hashlib
+import secrets
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, DateTime, Integer
+from datetime import datetime, timedelta
+from ..extensions import db
+
+
+class ApiToken(db.Model):
+    """Hashed personal access token; the plaintext is only shown once"""
+
+    __tablename__ = "api_tokens"
+
+    PREFIX = "pst_"
+    SCOPES = ("read", "write", "export")
+    DEFAULT_SCOPES = ("read",)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    token_prefix: Mapped[str] = mapped_column(
+        String(16), nullable=False
+    )  # shown in listings so users can tell tokens apart
+    token_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, nullable=False, index=True
+    )
+    scopes: Mapped[str] = mapped_column(
+        String(200), nullable=False, default="read"
+    )  # comma separated subset of SCOPES
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+    # Relationships
+    user: Mapped["User"] = relationship("User")
+
+    @staticmethod
+    def hash_token(raw_token: str) -> str:
+        """SHA-256 of the plaintext token (tokens are high-entropy, no salt needed)"""
+        return hashlib.sha256(raw_token.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user, name, scopes=None, expires_in_days=None):
+        """Create a token for user; returns (token, plaintext)"""
+        scopes = list(scopes or cls.DEFAULT_SCOPES)
+        unknown = set(scopes) - set(cls.SCOPES)
+        if unknown:
+            raise ValueError(f"Unknown scopes: {', '.join(sorted(unknown))}")
+
+        raw_token = cls.PREFIX + secrets.token_urlsafe(32)
+        token = cls(
+            user_id=user.id,
+            name=name,
+            token_prefix=raw_token[:12],
+            token_hash=cls.hash_token(raw_token),
+            scopes=",".join(scope for scope in cls.SCOPES if scope in scopes),
+            expires_at=(
+                datetime.utcnow() + timedelta(days=expires_in_days)
+                if expires_in_days
+                else None
+            ),
+        )
+        return token, raw_token
+
+    def get_scopes(self):
+        return frozenset(scope for scope in (self.scopes or "").split(",") if scope)
+
+    def is_valid(self, now=None) -> bool:
+        """Check the token is neither revoked nor expired"""
+        now = now or datetime.utcnow()
+        if self.revoked_at is not None:
+            return False
+        return self.expires_at is None or self.expires_at > now
+
+    def to_dict(self):
+        """Serialize for token listings (never includes the secret)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "token_prefix": self.token_prefix,
+            "scopes": sorted(self.get_scopes()),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "last_used_at": (
+                self.last_used_at.isoformat() if self.last_used_at else None
+            ),
+            "revoked": self.revoked_at is not None,
+        }
+
+    def __repr__(self):
+        return f"<ApiToken {self.token_prefix} for User {self.user_id}>"
@@ -0,0 +1,41 @@
+"""
+Change log model backing the incremental sync (change feed) API
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, JSON
+from datetime import datetime
+from ..extensions import db
+
+
+class ChangeLog(db.Model):
+    """Append-only record of committed changes; the id is the feed cursor"""
+
+    __tablename__ = "change_log"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(
+        String(50), nullable=False
+    )  # problem, solution, problem_evaluation, solution_evaluation, vote
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # created, updated, deleted, status_changed
+    payload: Mapped[dict] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def to_dict(self):
+        """Serialize for the change feed API"""
+        return {
+            "cursor": self.id,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "action": self.action,
+            "payload": self.payload or {},
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def __repr__(self):
+        return f"<ChangeLog {self.id} {self.action} {self.entity_type} {self.entity_id}>"
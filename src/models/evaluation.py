@@ -7,25 +7,38 @@ from sqlalchemy import String, DateTime, Integer, Text, Float
 from sqlalchemy.sql import func
 from datetime import datetime
 from ..extensions import db
+from ..utils.scoring import criteria_weights
 
 
 class ProblemEvaluation(db.Model):
     """Multi-criteria evaluation for problems"""
 
     __tablename__ = "problem_evaluations"
+    __table_args__ = (
+        # Probe for "has this user evaluated this problem" (evaluation queue)
+        db.Index(
+            "ix_problem_evaluations_evaluator_problem", "evaluator_id", "problem_id"
+        ),
+        # A user's evaluation history, newest first (evaluation timeline)
+        db.Index(
+            "ix_problem_evaluations_evaluator_created", "evaluator_id", "created_at"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     problem_id: Mapped[int] = mapped_column(
         db.ForeignKey("problems.id"), nullable=False
     )
     evaluator_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)
-    evaluator_pseudonym: Mapped[str] = mapped_column(String(100))
+    evaluator_pseudonym: Mapped[str] = mapped_column(String(100), nullable=True)
     severity_rating: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5 scale
     impact_rating: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5 scale
-    comment: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    comment: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -33,8 +46,11 @@ class ProblemEvaluation(db.Model):
     evaluator: Mapped["User"] = relationship("User", back_populates="evaluations")
 
     def get_overall_score(self):
-        """Calculate overall score (simple average)"""
-        return (self.severity_rating + self.impact_rating) / 2
+        """Calculate weighted average score (see utils.scoring)"""
+        return sum(
+            getattr(self, criterion) * weight
+            for criterion, weight in criteria_weights("problem").items()
+        )
 
     def __repr__(self):
         return f"<ProblemEvaluation {self.id} for Problem {self.problem_id}>"
@@ -44,13 +60,23 @@ class SolutionEvaluation(db.Model):
     """Multi-criteria evaluation for solutions"""
 
     __tablename__ = "solution_evaluations"
+    __table_args__ = (
+        # Probe for "has this user evaluated this solution" (evaluation queue)
+        db.Index(
+            "ix_solution_evaluations_evaluator_solution", "evaluator_id", "solution_id"
+        ),
+        # A user's evaluation history, newest first (evaluation timeline)
+        db.Index(
+            "ix_solution_evaluations_evaluator_created", "evaluator_id", "created_at"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     solution_id: Mapped[int] = mapped_column(
         db.ForeignKey("solutions.id"), nullable=False
     )
     evaluator_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)
-    evaluator_pseudonym: Mapped[str] = mapped_column(String(100))
+    evaluator_pseudonym: Mapped[str] = mapped_column(String(100), nullable=True)
     feasibility_rating: Mapped[int] = mapped_column(
         Integer, nullable=False
     )  # 1-5 scale
@@ -58,24 +84,25 @@ class SolutionEvaluation(db.Model):
     completeness_rating: Mapped[int] = mapped_column(
         Integer, nullable=False
     )  # 1-5 scale
-    comment: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    comment: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
     solution: Mapped["Solution"] = relationship(
         "Solution", back_populates="evaluations"
     )
-    evaluator: Mapped["User"] = relationship("User", back_populates="evaluations")
+    evaluator: Mapped["User"] = relationship("User")
 
     def get_overall_score(self):
-        """Calculate weighted average score"""
-        return (
-            self.feasibility_rating * 0.4
-            + self.creativity_rating * 0.3
-            + self.completeness_rating * 0.3
+        """Calculate weighted average score (see utils.scoring)"""
+        return sum(
+            getattr(self, criterion) * weight
+            for criterion, weight in criteria_weights("solution").items()
         )
 
     def __repr__(self):
@@ -0,0 +1,39 @@
+"""
+Evaluation queue model: problems and solutions still open for evaluation
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer
+from datetime import datetime
+from ..extensions import db
+
+
+class EvaluationQueueItem(db.Model):
+    """One evaluable item with its running evaluation count
+
+    Maintained incrementally from the change feed (see utils.evaluation_queue);
+    per-user queues are this table minus the user's own items and everything
+    they already evaluated.
+    """
+
+    __tablename__ = "evaluation_queue"
+    __table_args__ = (
+        db.UniqueConstraint("item_type", "item_id", name="uq_evaluation_queue_item"),
+        # Queue order (fewest evaluations first) doubles as the keyset cursor
+        db.Index("ix_evaluation_queue_priority", "evaluation_count", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    item_type: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # problem, solution
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    problem_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    submitter_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    evaluation_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<EvaluationQueueItem {self.item_type} {self.item_id}>"
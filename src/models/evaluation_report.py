@@ -0,0 +1,80 @@
+"""
+Evaluation report models: stored results of the evaluation analytics job
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, Float
+from datetime import datetime
+from ..extensions import db
+
+
+class EvaluationItemStats(db.Model):
+    """Score distribution of one evaluated problem or solution"""
+
+    __tablename__ = "evaluation_item_stats"
+    __table_args__ = (
+        db.UniqueConstraint("item_type", "item_id", name="uq_evaluation_item_stats"),
+        # Most contentious items first
+        db.Index("ix_evaluation_item_stats_variance", "item_type", "score_variance"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    item_type: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # problem, solution
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    evaluation_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    mean_score: Mapped[float] = mapped_column(Float, nullable=False)
+    score_variance: Mapped[float] = mapped_column(
+        Float, nullable=True
+    )  # sample variance, null below two evaluations
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<EvaluationItemStats {self.item_type} {self.item_id}>"
+
+
+class EvaluatorStats(db.Model):
+    """How far one evaluator's scores sit from their co-evaluators'"""
+
+    __tablename__ = "evaluator_stats"
+    __table_args__ = (
+        db.UniqueConstraint("item_type", "evaluator_id", name="uq_evaluator_stats"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    item_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    evaluator_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    evaluation_count: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )  # evaluations of items someone else also evaluated
+    mean_bias: Mapped[float] = mapped_column(Float, nullable=False)
+    bias_z_score: Mapped[float] = mapped_column(Float, nullable=True)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<EvaluatorStats {self.item_type} {self.evaluator_id}>"
+
+
+class EvaluationAgreement(db.Model):
+    """Inter-rater agreement (Krippendorff's alpha) for one rating criterion"""
+
+    __tablename__ = "evaluation_agreement"
+    __table_args__ = (
+        db.UniqueConstraint("item_type", "criterion", name="uq_evaluation_agreement"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    item_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    criterion: Mapped[str] = mapped_column(
+        String(50), nullable=False
+    )  # rating column, or "overall"
+    alpha: Mapped[float] = mapped_column(
+        Float, nullable=True
+    )  # null without enough paired ratings
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<EvaluationAgreement {self.item_type} {self.criterion}>"
@@ -0,0 +1,32 @@
+"""
+Job state model: persisted progress of background jobs
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer
+from datetime import datetime
+from ..extensions import db
+
+
+class JobState(db.Model):
+    """Change feed cursor (and last run time) of a named background job"""
+
+    __tablename__ = "job_state"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    cursor: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
+
+    @classmethod
+    def load(cls, name):
+        """Return the state row for name, adding a fresh one if missing"""
+        state = db.session.get(cls, name)
+        if state is None:
+            state = cls(name=name, cursor=0)
+            db.session.add(state)
+        return state
+
+    def __repr__(self):
+        return f"<JobState {self.name} at {self.cursor}>"
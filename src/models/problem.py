@@ -2,23 +2,32 @@
 Problem model for core platform functionality
 """
 
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, DateTime, Integer, Boolean, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates, load_only
+from sqlalchemy import String, Text, DateTime, Integer, Boolean, JSON, Float
+from sqlalchemy import update
 from sqlalchemy.sql import func
 from datetime import datetime
 from ..extensions import db
+from ..utils.text import summarize
 
 
 class Problem(db.Model):
     """Problem model with status tracking and metadata"""
 
     __tablename__ = "problems"
+    __table_args__ = (
+        # Trending listings of open problems are a backwards index scan
+        db.Index("ix_problems_status_trending", "status", "trending_score"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    summary: Mapped[str] = mapped_column(
+        String(200), nullable=True
+    )  # plain-text snippet of description for list views
     submitter_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)
-    submitter_pseudonym: Mapped[str] = mapped_column(String(100))
+    submitter_pseudonym: Mapped[str] = mapped_column(String(100), nullable=True)
     visibility: Mapped[str] = mapped_column(
         String(50), default="identified"
     )  # anonymous, semi-anonymous, identified
@@ -28,16 +37,39 @@ class Problem(db.Model):
     status: Mapped[str] = mapped_column(
         String(50), default="open"
     )  # draft, open, under_review, in_progress, implemented, closed, archived
+    # Read caches of departments_relation / tags_relation (see utils.tagging)
     affected_departments: Mapped[dict] = mapped_column(
-        JSON
+        JSON, nullable=True
     )  # ["Engineering", "HR", etc.]
-    tags: Mapped[dict] = mapped_column(JSON)  # [{"name": "IT", "color": "#007bff"}]
+    tags: Mapped[dict] = mapped_column(
+        JSON, nullable=True
+    )  # [{"name": "IT", "color": "#007bff"}]
     upvotes: Mapped[int] = mapped_column(Integer, default=0)
     downvotes: Mapped[int] = mapped_column(Integer, default=0)
     view_count: Mapped[int] = mapped_column(Integer, default=0)
+    solution_count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # counter caches, see utils.counters
+    evaluation_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stats_updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True
+    )  # last counter or score write; updated_at only tracks edits
+    aggregate_score: Mapped[float] = mapped_column(
+        Float, nullable=True
+    )  # weighted evaluation mean, None until evaluated
+    score_version: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # EVALUATION_CRITERIA version aggregate_score was computed with
+    trending_score: Mapped[float] = mapped_column(
+        Float, default=0.0, nullable=False, index=True
+    )  # log-space decayed activity, see utils.trending
+    trending_view_count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # views already folded into trending_score
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -52,9 +84,50 @@ class Problem(db.Model):
         "Comment", back_populates="problem", cascade="all, delete-orphan"
     )
     tags_relation: Mapped[list["ProblemTag"]] = relationship(
-        "ProblemTag", back_populates="problem"
+        "ProblemTag", back_populates="problem", cascade="all, delete-orphan"
+    )
+    departments_relation: Mapped[list["ProblemDepartment"]] = relationship(
+        "ProblemDepartment", back_populates="problem", cascade="all, delete-orphan"
+    )
+
+    # Columns list views read; description and the JSON columns stay deferred
+    LIST_COLUMNS = (
+        "id",
+        "title",
+        "summary",
+        "submitter_id",
+        "submitter_pseudonym",
+        "visibility",
+        "severity",
+        "status",
+        "upvotes",
+        "downvotes",
+        "view_count",
+        "created_at",
+        "updated_at",
     )
 
+    @classmethod
+    def list_options(cls):
+        """Loader option for list/card queries that skips the heavy columns"""
+        return load_only(*(getattr(cls, name) for name in cls.LIST_COLUMNS))
+
+    @validates("description")
+    def _update_summary(self, key, description):
+        self.summary = summarize(description)
+        return description
+
+    @classmethod
+    def record_view(cls, problem_id):
+        """Count a page view without loading the row or touching updated_at"""
+        db.session.execute(
+            update(cls)
+            .where(cls.id == problem_id)
+            .values(view_count=cls.view_count + 1, updated_at=cls.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
     def get_vote_score(self):
         """Calculate net vote score"""
         return self.upvotes - self.downvotes
@@ -64,18 +137,18 @@ class Problem(db.Model):
         if not self.evaluations:
             return None
 
-        total = sum(
-            eval.severity_rating + eval.impact_rating for eval in self.evaluations
-        )
-        count = len(self.evaluations)
-        return total / count if count > 0 else None
+        total = sum(evaluation.get_overall_score() for evaluation in self.evaluations)
+        return total / len(self.evaluations)
 
     def get_top_solution(self):
-        """Get solution with highest vote score"""
-        if not self.solutions:
-            return None
+        """Get the best-ranked solution (see utils.ranking)"""
+        from .solution import Solution
 
-        return max(self.solutions, key=lambda s: s.get_vote_score())
+        return (
+            Solution.query.filter_by(problem_id=self.id)
+            .order_by(Solution.rank_score.desc(), Solution.id)
+            .first()
+        )
 
     def is_editable_by(self, user):
         """Check if user can edit this problem"""
@@ -0,0 +1,395 @@
+"""
+Read models: lightweight rows for read-only listings
+
+List pages never modify what they show, so they don't need change tracking
+or identity-map bookkeeping. These helpers run Core ``select()`` statements
+and build ``__slots__`` dataclasses straight from the result tuples. Rows
+provide the few model methods templates call (``get_vote_score``,
+``is_resolved`` ...) and carry ``__tablename__`` so ``fragment_key``
+versions them exactly like ORM instances.
+
+Typical use::
+
+    statement = problem_rows_select().where(Problem.status == "open")
+    problems = load_problem_rows(statement.order_by(Problem.created_at.desc()))
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from flask_sqlalchemy.pagination import SelectPagination
+from sqlalchemy import Integer, and_, cast, literal, null, or_, select, union_all
+
+from ..extensions import db
+from ..utils.anonymizer import Anonymizer
+from ..utils.scoring import criteria_weights
+from .user import User
+from .problem import Problem
+from .solution import Solution
+from .evaluation import ProblemEvaluation, SolutionEvaluation
+from .supporting import Notification
+
+
+@dataclass(slots=True)
+class UserRow:
+    """Submitter columns needed to render display names"""
+
+    id: int
+    name: Optional[str]
+    email: str
+    role: str
+    pseudonym_seed: Optional[str]
+    created_at: Optional[datetime]
+    last_login: Optional[datetime]
+
+    __tablename__ = "users"
+
+    def is_admin(self):
+        return self.role in ["admin", "moderator"]
+
+    def get_pseudonym(self):
+        return Anonymizer.get_user_pseudonym(self)
+
+    def get_display_name(self, content_item=None, viewer=None):
+        return Anonymizer.get_display_name(self, content_item, viewer)
+
+
+@dataclass(slots=True)
+class ProblemRow:
+    """Problem card data (no description or JSON columns)"""
+
+    id: int
+    title: str
+    summary: Optional[str]
+    severity: str
+    status: str
+    visibility: str
+    submitter_id: int
+    submitter_pseudonym: Optional[str]
+    upvotes: int
+    downvotes: int
+    view_count: int
+    created_at: datetime
+    updated_at: datetime
+    submitter: Optional[UserRow] = None
+
+    __tablename__ = "problems"
+
+    def get_vote_score(self):
+        return (self.upvotes or 0) - (self.downvotes or 0)
+
+    def is_resolved(self):
+        return self.status in ["implemented", "closed"]
+
+    def is_editable_by(self, user):
+        return (user and user.id == self.submitter_id) or user.is_admin()
+
+
+@dataclass(slots=True)
+class ProblemRef:
+    """Parent problem reference carried by solution rows"""
+
+    id: int
+    title: str
+    updated_at: datetime
+
+    __tablename__ = "problems"
+
+
+@dataclass(slots=True)
+class SolutionRow:
+    """Solution card data (no content or JSON columns)"""
+
+    id: int
+    problem_id: int
+    summary: Optional[str]
+    status: str
+    submitter_id: int
+    submitter_pseudonym: Optional[str]
+    upvotes: int
+    downvotes: int
+    aggregate_score: Optional[float]
+    created_at: datetime
+    updated_at: datetime
+    problem: Optional[ProblemRef] = None
+    submitter: Optional[UserRow] = None
+
+    __tablename__ = "solutions"
+
+    def get_vote_score(self):
+        return (self.upvotes or 0) - (self.downvotes or 0)
+
+    def is_implemented(self):
+        return self.status in ["implemented"]
+
+
+@dataclass(slots=True)
+class NotificationRow:
+    """Notification list entry (no message body or payload)"""
+
+    id: int
+    title: str
+    link: Optional[str]
+    is_read: bool
+    created_at: datetime
+
+    __tablename__ = "notifications"
+
+
+@dataclass(slots=True)
+class EvaluationRow:
+    """Problem or solution evaluation from the unified evaluation timeline
+
+    ``problem_id`` is set for both types (a solution's parent problem);
+    ``solution_id`` and the other type's criteria are None.
+    """
+
+    evaluation_type: str
+    id: int
+    problem_id: int
+    solution_id: Optional[int]
+    evaluator_id: int
+    evaluator_pseudonym: Optional[str]
+    severity_rating: Optional[int]
+    impact_rating: Optional[int]
+    feasibility_rating: Optional[int]
+    creativity_rating: Optional[int]
+    completeness_rating: Optional[int]
+    comment: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    evaluator: Optional[UserRow] = None
+
+    def get_overall_score(self):
+        return sum(
+            getattr(self, criterion) * weight
+            for criterion, weight in criteria_weights(self.evaluation_type).items()
+        )
+
+
+def _column_names(row_cls, exclude=()):
+    return tuple(f.name for f in fields(row_cls) if f.name not in exclude)
+
+
+USER_ROW_COLUMNS = _column_names(UserRow)
+PROBLEM_ROW_COLUMNS = _column_names(ProblemRow, exclude=("submitter",))
+PROBLEM_REF_COLUMNS = _column_names(ProblemRef)
+SOLUTION_ROW_COLUMNS = _column_names(SolutionRow, exclude=("problem", "submitter"))
+NOTIFICATION_ROW_COLUMNS = _column_names(NotificationRow)
+EVALUATION_ROW_COLUMNS = _column_names(
+    EvaluationRow, exclude=("evaluation_type", "evaluator")
+)
+
+# evaluation type -> (model, problem id column, solution id column)
+EVALUATION_TIMELINE_SOURCES = {
+    "problem": (ProblemEvaluation, ProblemEvaluation.problem_id, None),
+    "solution": (
+        SolutionEvaluation,
+        Solution.problem_id,
+        SolutionEvaluation.solution_id,
+    ),
+}
+
+
+def _user_row(values) -> Optional[UserRow]:
+    return UserRow(*values) if values[0] is not None else None
+
+
+def problem_rows_select():
+    """SELECT producing ProblemRow columns plus the submitter; add filters"""
+    return select(
+        *(getattr(Problem, name) for name in PROBLEM_ROW_COLUMNS),
+        *(getattr(User, name) for name in USER_ROW_COLUMNS),
+    ).outerjoin(User, User.id == Problem.submitter_id)
+
+
+def load_problem_rows(statement) -> List[ProblemRow]:
+    """Execute a problem_rows_select() statement into ProblemRow objects"""
+    split = len(PROBLEM_ROW_COLUMNS)
+    return [
+        ProblemRow(*row[:split], submitter=_user_row(row[split:]))
+        for row in db.session.execute(statement)
+    ]
+
+
+def solution_rows_select():
+    """SELECT producing SolutionRow columns, parent problem and submitter"""
+    return (
+        select(
+            *(getattr(Solution, name) for name in SOLUTION_ROW_COLUMNS),
+            *(getattr(Problem, name) for name in PROBLEM_REF_COLUMNS),
+            *(getattr(User, name) for name in USER_ROW_COLUMNS),
+        )
+        .join(Problem, Problem.id == Solution.problem_id)
+        .outerjoin(User, User.id == Solution.submitter_id)
+    )
+
+
+def load_solution_rows(statement) -> List[SolutionRow]:
+    """Execute a solution_rows_select() statement into SolutionRow objects"""
+    first = len(SOLUTION_ROW_COLUMNS)
+    second = first + len(PROBLEM_REF_COLUMNS)
+    return [
+        SolutionRow(
+            *row[:first],
+            problem=ProblemRef(*row[first:second]),
+            submitter=_user_row(row[second:]),
+        )
+        for row in db.session.execute(statement)
+    ]
+
+
+def notification_rows_select():
+    """SELECT producing NotificationRow columns; add filters"""
+    return select(*(getattr(Notification, name) for name in NOTIFICATION_ROW_COLUMNS))
+
+
+def load_notification_rows(statement) -> List[NotificationRow]:
+    """Execute a notification_rows_select() statement into NotificationRow objects"""
+    return [NotificationRow(*row) for row in db.session.execute(statement)]
+
+
+def _timeline_branch(evaluation_type: str):
+    """SELECT of one evaluation table in EvaluationRow column order"""
+    model, problem_id, solution_id = EVALUATION_TIMELINE_SOURCES[evaluation_type]
+    columns = [literal(evaluation_type).label("evaluation_type")]
+    for name in EVALUATION_ROW_COLUMNS:
+        if name == "problem_id":
+            column = problem_id
+        elif name == "solution_id":
+            column = solution_id
+        else:
+            column = getattr(model, name, None)
+        if column is None:
+            # Problem evaluations have no solution; the other type's criteria
+            column = cast(null(), Integer)
+        columns.append(column.label(name))
+
+    statement = select(*columns)
+    if solution_id is not None:
+        statement = statement.join(Solution, Solution.id == solution_id)
+    return statement
+
+
+def _after_cursor(model, evaluation_type: str, cursor):
+    """Keyset condition for rows after cursor in timeline order
+
+    Timeline order is (created_at, evaluation_type, id), all descending.
+    """
+    created_at, cursor_type, cursor_id = cursor
+    if evaluation_type < cursor_type:
+        return model.created_at <= created_at
+    if evaluation_type > cursor_type:
+        return model.created_at < created_at
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < cursor_id),
+    )
+
+
+def parse_timeline_cursor(value: Optional[str]) -> Optional[Tuple]:
+    """Parse a ``<created_at>_<type>_<id>`` cursor; raises ValueError if malformed"""
+    if not value:
+        return None
+    created_at, evaluation_type, evaluation_id = value.rsplit("_", 2)
+    if evaluation_type not in EVALUATION_TIMELINE_SOURCES:
+        raise ValueError(f"Unknown evaluation type: {evaluation_type}")
+    return datetime.fromisoformat(created_at), evaluation_type, int(evaluation_id)
+
+
+def evaluation_timeline(
+    evaluator_id: Optional[int] = None,
+    problem_id: Optional[int] = None,
+    solution_id: Optional[int] = None,
+    limit: int = 20,
+    after: Optional[Tuple] = None,
+) -> Tuple[List[EvaluationRow], Optional[str]]:
+    """Return (rows, next_cursor): problem and solution evaluations, newest first
+
+    One UNION ALL query: each branch applies the filters, the keyset
+    condition and the limit itself, so it reads at most ``limit + 1`` rows off
+    its (evaluator_id, created_at) or created_at index, and the outer query
+    merges them. ``problem_id`` matches a problem's evaluations and those of
+    its solutions. Pass next_cursor (None on the last page) through
+    parse_timeline_cursor as ``after``.
+    """
+    branches = []
+    for evaluation_type, source in EVALUATION_TIMELINE_SOURCES.items():
+        model, problem_column, solution_column = source
+        if solution_id is not None and solution_column is None:
+            continue
+
+        statement = _timeline_branch(evaluation_type)
+        if evaluator_id is not None:
+            statement = statement.where(model.evaluator_id == evaluator_id)
+        if problem_id is not None:
+            statement = statement.where(problem_column == problem_id)
+        if solution_id is not None:
+            statement = statement.where(solution_column == solution_id)
+        if after:
+            statement = statement.where(_after_cursor(model, evaluation_type, after))
+        branches.append(
+            statement.order_by(model.created_at.desc(), model.id.desc())
+            .limit(limit + 1)
+            .subquery()
+        )
+
+    timeline = union_all(*(select(branch) for branch in branches)).subquery()
+    rows = [
+        EvaluationRow(*row)
+        for row in db.session.execute(
+            select(timeline)
+            .order_by(
+                timeline.c.created_at.desc(),
+                timeline.c.evaluation_type.desc(),
+                timeline.c.id.desc(),
+            )
+            .limit(limit + 1)
+        )
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = (
+            f"{last.created_at.isoformat()}_{last.evaluation_type}_{last.id}"
+        )
+    return rows, next_cursor
+
+
+def load_user_rows(user_ids: Iterable[int]) -> dict:
+    """Fetch UserRow objects for a set of ids in one query, keyed by id"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+
+    statement = select(*(getattr(User, name) for name in USER_ROW_COLUMNS)).where(
+        User.id.in_(user_ids)
+    )
+    return {row[0]: UserRow(*row) for row in db.session.execute(statement)}
+
+
+class RowPagination(SelectPagination):
+    """Flask-SQLAlchemy pagination whose items come from a read-model loader
+
+    Pass ``select``, ``session`` and ``loader`` (e.g. ``load_problem_rows``).
+    """
+
+    def _query_items(self):
+        statement = self._query_args["select"]
+        statement = statement.limit(self.per_page).offset(self._query_offset)
+        return self._query_args["loader"](statement)
+
+
+def paginate_rows(statement, loader, page, per_page, error_out=False):
+    """Paginate a read-model select the way Model.query.paginate does"""
+    return RowPagination(
+        select=statement,
+        session=db.session,
+        loader=loader,
+        page=page,
+        per_page=per_page,
+        error_out=error_out,
+    )
@@ -0,0 +1,50 @@
+"""
+Problem similarity models: MinHash signatures for duplicate detection and
+precomputed related-problem lists
+"""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Float, Integer, LargeBinary
+from datetime import datetime
+from ..extensions import db
+
+
+class ProblemSignature(db.Model):
+    """MinHash signature of a problem's title and description
+
+    Maintained from the change feed (see utils.duplicates); rows from an
+    older ``version`` of the signature parameters are ignored until
+    ``flask build-signatures`` recomputes them.
+    """
+
+    __tablename__ = "problem_signatures"
+
+    problem_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    signature: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False
+    )  # little-endian uint32 per permutation
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<ProblemSignature Problem {self.problem_id}>"
+
+
+class ProblemSimilarity(db.Model):
+    """One of a problem's nearest neighbours by TF-IDF cosine similarity
+
+    Written by ``flask build-similarity`` (see utils.similarity); the detail
+    page reads a problem's few rows instead of comparing texts.
+    """
+
+    __tablename__ = "problem_similarity"
+
+    problem_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    similar_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    score: Mapped[float] = mapped_column(Float, nullable=False)  # cosine, 0-1
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ProblemSimilarity {self.problem_id} ~ {self.similar_id}>"
@@ -2,29 +2,37 @@
 Solution model for problem-solving workflow
 """
 
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates, load_only
 from sqlalchemy import String, Text, DateTime, Integer, Boolean, JSON, Float
 from sqlalchemy.sql import func
 from datetime import datetime
 from ..extensions import db
+from ..utils.text import summarize
 
 
 class Solution(db.Model):
     """Solution model with voting and evaluation capabilities"""
 
     __tablename__ = "solutions"
+    __table_args__ = (
+        # Best solutions of a problem come straight off this index
+        db.Index("ix_solutions_problem_rank", "problem_id", "rank_score"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     problem_id: Mapped[int] = mapped_column(
         db.ForeignKey("problems.id"), nullable=False
     )
     submitter_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)
-    submitter_pseudonym: Mapped[str] = mapped_column(String(100))
+    submitter_pseudonym: Mapped[str] = mapped_column(String(100), nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    cost_estimate: Mapped[str] = mapped_column(String(100))
-    time_estimate: Mapped[str] = mapped_column(String(100))
+    summary: Mapped[str] = mapped_column(
+        String(200), nullable=True
+    )  # plain-text snippet of content for list views
+    cost_estimate: Mapped[str] = mapped_column(String(100), nullable=True)
+    time_estimate: Mapped[str] = mapped_column(String(100), nullable=True)
     required_resources: Mapped[dict] = mapped_column(
-        JSON
+        JSON, nullable=True
     )  # ["Budget", "Staff", "Tools"]
     status: Mapped[str] = mapped_column(
         String(50), default="proposed"
@@ -32,10 +40,27 @@ class Solution(db.Model):
     upvotes: Mapped[int] = mapped_column(Integer, default=0)
     downvotes: Mapped[int] = mapped_column(Integer, default=0)
     aggregate_score: Mapped[float] = mapped_column(Float, default=0.0)
+    vote_lower_bound: Mapped[float] = mapped_column(
+        Float, default=0.0, nullable=False
+    )  # Wilson lower bound of the upvote share, see utils.ranking
+    evaluation_score: Mapped[float] = mapped_column(
+        Float, nullable=True
+    )  # evaluation mean shrunk toward the prior
+    rank_score: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    score_version: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # EVALUATION_CRITERIA version the scores were computed with
     reference_count: Mapped[int] = mapped_column(Integer, default=0)
+    evaluation_count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # counter caches, see utils.counters
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stats_updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True
+    )  # last counter or score write; updated_at only tracks edits
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -51,29 +76,71 @@ class Solution(db.Model):
         "Comment", back_populates="solution", cascade="all, delete-orphan"
     )
 
+    # Columns list views read; content and required_resources stay deferred
+    LIST_COLUMNS = (
+        "id",
+        "problem_id",
+        "submitter_id",
+        "submitter_pseudonym",
+        "summary",
+        "status",
+        "upvotes",
+        "downvotes",
+        "aggregate_score",
+        "created_at",
+        "updated_at",
+    )
+
+    @classmethod
+    def list_options(cls):
+        """Loader option for list/card queries that skips the heavy columns"""
+        return load_only(*(getattr(cls, name) for name in cls.LIST_COLUMNS))
+
+    @validates("content")
+    def _update_summary(self, key, content):
+        self.summary = summarize(content)
+        return content
+
     def get_vote_score(self):
         """Calculate net vote score"""
         return self.upvotes - self.downvotes
 
+    def cast_vote(self, user_id, score):
+        """Record or change a user's vote, keeping vote counters in sync
+
+        Returns the Vote row; the caller is responsible for committing.
+        """
+        from .supporting import Vote
+
+        vote = db.session.get(Vote, (user_id, self.id))
+
+        if vote is not None:
+            if vote.score == score:
+                return vote
+            # Moving an existing vote to the other side
+            if vote.score > 0:
+                self.upvotes -= 1
+            else:
+                self.downvotes -= 1
+            vote.score = score
+        else:
+            vote = Vote(user_id=user_id, solution_id=self.id, score=score)
+            db.session.add(vote)
+
+        if score > 0:
+            self.upvotes += 1
+        else:
+            self.downvotes += 1
+
+        return vote
+
     def get_average_evaluation_score(self):
         """Calculate average evaluation score from all criteria"""
         if not self.evaluations:
             return None
 
-        total_feasibility = sum(eval.feasibility_rating for eval in self.evaluations)
-        total_creativity = sum(eval.creativity_rating for eval in self.evaluations)
-        total_completeness = sum(eval.completeness_rating for eval in self.evaluations)
-
-        count = len(self.evaluations)
-        if count == 0:
-            return None
-
-        # Weighted average: Feasibility 40%, Creativity 30%, Completeness 30%
-        avg_feasibility = total_feasibility / count * 0.4
-        avg_creativity = total_creativity / count * 0.3
-        avg_completeness = total_completeness / count * 0.3
-
-        return avg_feasibility + avg_creativity + avg_completeness
+        total = sum(evaluation.get_overall_score() for evaluation in self.evaluations)
+        return total / len(self.evaluations)
 
     def is_editable_by(self, user):
         """Check if user can edit this solution"""
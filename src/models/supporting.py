@@ -33,14 +33,32 @@ class Comment(db.Model):
     """Comment model for solution discussions"""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Top-level threads of a discussion, and each thread in path order
+        db.Index("ix_comments_solution_parent", "solution_id", "parent_id"),
+        db.Index("ix_comments_problem_parent", "problem_id", "parent_id"),
+        db.Index("ix_comments_thread_path", "thread_id", "path"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    solution_id: Mapped[int] = mapped_column(db.ForeignKey("solutions.id"))
-    problem_id: Mapped[int] = mapped_column(db.ForeignKey("problems.id"))
+    solution_id: Mapped[int] = mapped_column(
+        db.ForeignKey("solutions.id"), nullable=True
+    )
+    problem_id: Mapped[int] = mapped_column(db.ForeignKey("problems.id"), nullable=True)
     user_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)
-    user_pseudonym: Mapped[str] = mapped_column(String(100))
+    user_pseudonym: Mapped[str] = mapped_column(String(100), nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    parent_id: Mapped[int] = mapped_column(db.ForeignKey("comments.id"))
+    parent_id: Mapped[int] = mapped_column(db.ForeignKey("comments.id"), nullable=True)
+    path: Mapped[str] = mapped_column(
+        String(255), nullable=True, index=True
+    )  # materialized path of ancestor ids, see utils.comment_threads
+    depth: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    thread_id: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # id of the top-level comment
+    reply_count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # replies anywhere in the thread, kept on top-level comments
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -73,8 +91,8 @@ class Notification(db.Model):
     )  # solution_added, evaluation_received, etc.
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    link: Mapped[str] = mapped_column(String(500))
-    payload: Mapped[dict] = mapped_column(JSON)  # Additional event data
+    link: Mapped[str] = mapped_column(String(500), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=True)  # Additional event data
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
     email_sent: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -93,7 +111,7 @@ class Tag(db.Model):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    description: Mapped[str] = mapped_column(Text)
+    description: Mapped[str] = mapped_column(Text, nullable=True)
     color: Mapped[str] = mapped_column(String(20), default="#6c757d")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -110,6 +128,10 @@ class ProblemTag(db.Model):
     """Association table for problems and tags"""
 
     __tablename__ = "problem_tags"
+    __table_args__ = (
+        # Tag filters and facet counts join from the tag side
+        db.Index("ix_problem_tags_tag_problem", "tag_id", "problem_id"),
+    )
 
     problem_id: Mapped[int] = mapped_column(
         db.ForeignKey("problems.id"), primary_key=True
@@ -123,3 +145,27 @@ class ProblemTag(db.Model):
 
     def __repr__(self):
         return f"<ProblemTag Problem {self.problem_id} - Tag {self.tag_id}>"
+
+
+class ProblemDepartment(db.Model):
+    """Association table for problems and affected departments"""
+
+    __tablename__ = "problem_departments"
+    __table_args__ = (
+        # Department filters and facet counts join from the department side
+        db.Index("ix_problem_departments_department", "department", "problem_id"),
+    )
+
+    problem_id: Mapped[int] = mapped_column(
+        db.ForeignKey("problems.id"), primary_key=True
+    )
+    department: Mapped[str] = mapped_column(String(100), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    problem: Mapped["Problem"] = relationship(
+        "Problem", back_populates="departments_relation"
+    )
+
+    def __repr__(self):
+        return f"<ProblemDepartment Problem {self.problem_id} - {self.department}>"
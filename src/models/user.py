@@ -2,6 +2,7 @@
 User model with OAuth integration and role management
 """
 
+from flask_login import UserMixin
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import String, DateTime, Boolean
 from datetime import datetime
@@ -9,7 +10,7 @@ from ..extensions import db
 from ..utils.anonymizer import Anonymizer
 
 
-class User(db.Model):
+class User(UserMixin, db.Model):
     """User model for authentication and role management"""
 
     __tablename__ = "users"
@@ -18,10 +19,10 @@ class User(db.Model):
     email: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False, index=True
     )
-    name: Mapped[str] = mapped_column(String(255))
-    avatar_url: Mapped[str] = mapped_column(String(500))
+    name: Mapped[str] = mapped_column(String(255), nullable=True)
+    avatar_url: Mapped[str] = mapped_column(String(500), nullable=True)
     role: Mapped[str] = mapped_column(String(50), default="user", nullable=False)
-    pseudonym_seed: Mapped[str] = mapped_column(String(100))
+    pseudonym_seed: Mapped[str] = mapped_column(String(100), nullable=True)
     visibility_preference: Mapped[str] = mapped_column(String(20), default="identified")
     email_notifications: Mapped[str] = mapped_column(String(20), default="daily")
     digest_frequency: Mapped[str] = mapped_column(String(20), default="morning")
@@ -31,7 +32,7 @@ class User(db.Model):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     email_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    last_login: Mapped[datetime] = mapped_column(DateTime)
+    last_login: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
     # Relationships
     problems: Mapped[list["Problem"]] = relationship(
@@ -40,8 +41,8 @@ class User(db.Model):
     solutions: Mapped[list["Solution"]] = relationship(
         "Solution", back_populates="submitter", cascade="all, delete-orphan"
     )
-    evaluations: Mapped[list["Evaluation"]] = relationship(
-        "Evaluation", back_populates="evaluator"
+    evaluations: Mapped[list["ProblemEvaluation"]] = relationship(
+        "ProblemEvaluation", back_populates="evaluator"
     )
     votes: Mapped[list["Vote"]] = relationship("Vote", back_populates="user")
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="user")
@@ -106,18 +106,83 @@ function getCookie(name) {
     return value ? value[2].split(',').shift().trim() : null;
 }
 
+// Batched API requests: operations queued within a short window are sent
+// to /api/v1/batch in a single round trip
+const BatchQueue = {
+    delay: 50,
+    maxSize: 50,
+    pending: [],
+    timer: null,
+
+    enqueue(operation) {
+        return new Promise((resolve, reject) => {
+            this.pending.push({ operation, resolve, reject });
+            if (this.pending.length >= this.maxSize) {
+                this.flush();
+            } else if (!this.timer) {
+                this.timer = setTimeout(() => this.flush(), this.delay);
+            }
+        });
+    },
+
+    flush() {
+        clearTimeout(this.timer);
+        this.timer = null;
+        const entries = this.pending.splice(0, this.maxSize);
+        if (!entries.length) return;
+
+        fetch('/api/v1/batch', {
+            method: 'POST',
+            keepalive: true,
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrf_token')
+            },
+            body: JSON.stringify({ requests: entries.map(entry => entry.operation) })
+        })
+        .then(response => response.json())
+        .then(data => {
+            entries.forEach((entry, index) => entry.resolve(data.results[index]));
+        })
+        .catch(error => entries.forEach(entry => entry.reject(error)));
+
+        if (this.pending.length) this.flush();
+    }
+};
+
+function batchRequest(operation) {
+    return BatchQueue.enqueue(operation);
+}
+
 // Vote handling
 function handleVote(solutionId, voteType) {
-    const voteUrl = `/api/solutions/${solutionId}/vote`;
-    
-    submitForm(`vote-form-${solutionId}`, voteUrl, (data) => {
-        if (data.success) {
-            updateVoteDisplay(solutionId, data.vote_score);
-            showFlashMessage('success', data.message);
-        }
-    });
+    batchRequest({ op: 'vote', solution_id: Number(solutionId), vote_type: voteType })
+        .then(result => {
+            if (result.status === 200) {
+                updateVoteDisplay(solutionId, result.body.vote_score);
+            } else {
+                showFlashMessage('danger', result.body.error);
+            }
+        })
+        .catch(() => showFlashMessage('danger', 'An error occurred. Please try again.'));
+}
+
+// Notification handling
+function markNotificationRead(notificationId) {
+    return batchRequest({ op: 'mark_read', notification_id: Number(notificationId) });
+}
+
+function deleteNotification(notificationId) {
+    return batchRequest({ op: 'delete_notification', notification_id: Number(notificationId) });
 }
 
+// Flush anything still queued when the page is hidden or closed
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'hidden') {
+        BatchQueue.flush();
+    }
+});
+
 function updateVoteDisplay(solutionId, voteScore) {
     const voteElements = document.querySelectorAll(`[data-solution-id="${solutionId}"] .vote-display`);
     voteElements.forEach(element => {
@@ -166,4 +231,41 @@ function loadMoreProblems() {
 function getCurrentPage() {
     const urlParams = new URLSearchParams(window.location.search);
     return parseInt(urlParams.get('page')) || 1;
-}
\ No newline at end of file
+}
+// Type-ahead: inputs marked data-suggest="problems|tags|departments" get a
+// datalist filled from /api/v1/suggest; comma separated inputs complete
+// their last entry
+function attachSuggestions(input) {
+    const kind = input.dataset.suggest;
+    const list = document.createElement('datalist');
+    list.id = `${input.id || input.name}-suggestions`;
+    input.after(list);
+    input.setAttribute('list', list.id);
+    input.setAttribute('autocomplete', 'off');
+
+    let timer = null;
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            const parts = input.value.split(',');
+            const term = parts.pop().trim();
+            if (!term) return;
+            const head = parts.length ? `${parts.join(',')}, ` : '';
+
+            fetch(`/api/v1/suggest?q=${encodeURIComponent(term)}`)
+                .then(response => response.json())
+                .then(data => {
+                    list.replaceChildren(...(data[kind] || []).map(item => {
+                        const option = document.createElement('option');
+                        option.value = head + (item.title || item.name);
+                        return option;
+                    }));
+                })
+                .catch(() => {});
+        }, 150);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-suggest]').forEach(attachSuggestions);
+});
@@ -89,7 +89,14 @@ class Anonymizer:
 
     @staticmethod
     def get_display_name(user, content_item: Optional[Any] = None, viewer=None) -> str:
-        if viewer and viewer.is_admin():
+        # Templates pass ``current_user``, which is an anonymous proxy (truthy,
+        # but without ``is_admin``) for logged-out visitors
+        viewer_is_admin = bool(
+            viewer
+            and not getattr(viewer, "is_anonymous", False)
+            and viewer.is_admin()
+        )
+        if viewer_is_admin:
             return user.name or user.email
 
         if content_item and Anonymizer.should_reveal_identity(content_item):
@@ -103,7 +110,7 @@ class Anonymizer:
         if visibility == "anonymous":
             return Anonymizer.get_user_pseudonym(user)
         elif visibility == "semi-anonymous":
-            if viewer and viewer.is_admin():
+            if viewer_is_admin:
                 return user.name or user.email
             return Anonymizer.get_user_pseudonym(user)
         else:
@@ -111,7 +118,7 @@ class Anonymizer:
 
     @staticmethod
     def filter_sensitive_content(
-        content: Dict[str, Any], viewer: User
+        content: Dict[str, Any], viewer: "User"
     ) -> Dict[str, Any]:
         filtered = content.copy()
 
@@ -123,7 +130,7 @@ class Anonymizer:
         return filtered
 
     @staticmethod
-    def apply_anonymity_to_query(query, viewer: User):
+    def apply_anonymity_to_query(query, viewer: "User"):
         return query
 
     @staticmethod
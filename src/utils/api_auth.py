@@ -0,0 +1,146 @@
+"""
+Bearer token authentication for the REST API
+
+``Authorization: Bearer pst_...`` is resolved through Flask-Login's request
+loader. Verified tokens are cached in-process by token hash for
+``API_TOKEN_CACHE_TTL`` seconds together with a snapshot of the user, so a
+cache hit issues no SQL at all. Revocation clears the local cache
+immediately; other workers stop accepting a revoked token within one TTL.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, g, jsonify
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models.api_token import ApiToken
+from .cache import TTLCache
+from .user_cache import UserSnapshot
+
+CachedToken = namedtuple("CachedToken", ["token_id", "scopes", "expires_at", "user"])
+
+# Cached marker for unknown/revoked tokens so bad credentials don't hit the DB
+_INVALID = CachedToken(None, frozenset(), None, None)
+
+# last_used_at is only written when older than this
+_TOUCH_INTERVAL = timedelta(minutes=5)
+
+
+def get_token_cache() -> TTLCache:
+    """Return the verified-token cache bound to the current application"""
+    cache = current_app.extensions.get("api_token_cache")
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get("API_TOKEN_CACHE_SIZE", 1024),
+            ttl=current_app.config.get("API_TOKEN_CACHE_TTL", 60),
+        )
+        current_app.extensions["api_token_cache"] = cache
+    return cache
+
+
+def bearer_token(request):
+    """Extract the raw token from an ``Authorization: Bearer`` header"""
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return credentials.strip() or None
+
+
+def _verify(token_hash):
+    """Look up a token and its user in one query and build a cache entry"""
+    token = (
+        ApiToken.query.options(joinedload(ApiToken.user))
+        .filter_by(token_hash=token_hash)
+        .first()
+    )
+    if token is None or not token.is_valid() or not token.user.is_active:
+        return _INVALID
+
+    now = datetime.utcnow()
+    if token.last_used_at is None or now - token.last_used_at > _TOUCH_INTERVAL:
+        db.session.execute(
+            update(ApiToken).where(ApiToken.id == token.id).values(last_used_at=now)
+        )
+        db.session.commit()
+
+    return CachedToken(
+        token_id=token.id,
+        scopes=token.get_scopes(),
+        expires_at=token.expires_at,
+        user=UserSnapshot.fields_from(token.user),
+    )
+
+
+def load_user_from_bearer(request):
+    """Flask-Login request loader for API Bearer tokens"""
+    if request.blueprint != "api":
+        return None
+
+    raw_token = bearer_token(request)
+    if raw_token is None:
+        return None
+
+    token_hash = ApiToken.hash_token(raw_token)
+    entry = get_token_cache().get_or_set(token_hash, lambda: _verify(token_hash))
+
+    if entry.token_id is None:
+        return None
+    if entry.expires_at is not None and entry.expires_at <= datetime.utcnow():
+        return None
+
+    g.api_token_id = entry.token_id
+    g.api_token_scopes = entry.scopes
+    return UserSnapshot(**entry.user)
+
+
+def forget_token(token_hash: str) -> None:
+    """Drop a token from this process's verification cache"""
+    get_token_cache().delete(token_hash)
+
+
+def token_scope_error(*scopes):
+    """Return a 403 response if the request's token lacks any of scopes"""
+    granted = g.get("api_token_scopes")
+    if granted is None or set(scopes) <= granted:
+        return None
+
+    response = jsonify(
+        {"error": f"Token lacks required scope: {', '.join(sorted(scopes))}"}
+    )
+    response.status_code = 403
+    return response
+
+
+def require_scope(*scopes):
+    """Require token-authenticated requests to carry scopes
+
+    Session-authenticated requests are unaffected.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            error = token_scope_error(*scopes)
+            if error is not None:
+                return error
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def session_only(f):
+    """Reject requests authenticated with an API token"""
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if g.get("api_token_id") is not None:
+            return jsonify({"error": "Not available to API tokens"}), 403
+        return f(*args, **kwargs)
+
+    return decorated_function
@@ -0,0 +1,324 @@
+"""
+Change feed: records committed changes to core entities in the change_log table
+
+Rows are written from a session ``after_flush`` hook on the same connection,
+so they commit or roll back atomically with the change they describe.
+Other subsystems can subscribe:
+
+* ``ChangeFeed.on_flush(callback)`` - ``callback(session, changes)`` runs
+  inside the flushing transaction and may issue SQL.
+* ``ChangeFeed.on_commit(callback)`` - ``callback(changes)`` runs after a
+  successful commit; use it for in-process cache invalidation.
+
+``FeedIndex`` is the base for per-worker in-memory indexes that catch up
+from the stored feed instead, which also sees other workers' writes.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from flask import current_app
+from sqlalchemy import event, exists, func, insert, inspect, select
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models.change_log import ChangeLog
+from ..models.problem import Problem
+from ..models.solution import Solution
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.supporting import Comment, Vote
+
+_PENDING_KEY = "change_feed_pending"
+
+
+def _problem_payload(problem):
+    return {"status": problem.status}
+
+
+def _solution_payload(solution):
+    return {"problem_id": solution.problem_id, "status": solution.status}
+
+
+def _problem_evaluation_payload(evaluation):
+    return {"problem_id": evaluation.problem_id}
+
+
+def _solution_evaluation_payload(evaluation):
+    return {"solution_id": evaluation.solution_id}
+
+
+def _comment_payload(comment):
+    return {
+        "problem_id": comment.problem_id,
+        "solution_id": comment.solution_id,
+        "parent_id": comment.parent_id,
+        "thread_id": comment.thread_id,
+    }
+
+
+def _vote_payload(vote):
+    # Voter identity is deliberately omitted to preserve anonymity
+    return {"solution_id": vote.solution_id, "score": vote.score}
+
+
+class ChangeFeed:
+    """Captures entity changes into the change log and notifies subscribers"""
+
+    # model -> (entity_type, entity id getter, payload builder)
+    TRACKED = {
+        Problem: ("problem", lambda obj: obj.id, _problem_payload),
+        Solution: ("solution", lambda obj: obj.id, _solution_payload),
+        ProblemEvaluation: (
+            "problem_evaluation",
+            lambda obj: obj.id,
+            _problem_evaluation_payload,
+        ),
+        SolutionEvaluation: (
+            "solution_evaluation",
+            lambda obj: obj.id,
+            _solution_evaluation_payload,
+        ),
+        Vote: ("vote", lambda obj: obj.solution_id, _vote_payload),
+        Comment: ("comment", lambda obj: obj.id, _comment_payload),
+    }
+
+    # Models whose status column transitions get their own feed entries
+    STATUS_TRACKED = (Problem, Solution)
+
+    _flush_callbacks: List[Callable] = []
+    _commit_callbacks: List[Callable] = []
+
+    @classmethod
+    def register(cls, session=None) -> None:
+        """Attach the session hooks (idempotent)"""
+        session = session or db.session
+        for name, handler in (
+            ("after_flush", cls._after_flush),
+            ("after_commit", cls._after_commit),
+            ("after_soft_rollback", cls._after_rollback),
+        ):
+            if not event.contains(session, name, handler):
+                event.listen(session, name, handler)
+
+    @classmethod
+    def on_flush(cls, callback: Callable) -> Callable:
+        """Subscribe callback(session, changes) inside the flush transaction"""
+        if callback not in cls._flush_callbacks:
+            cls._flush_callbacks.append(callback)
+        return callback
+
+    @classmethod
+    def on_commit(cls, callback: Callable) -> Callable:
+        """Subscribe callback(changes) after a successful commit"""
+        if callback not in cls._commit_callbacks:
+            cls._commit_callbacks.append(callback)
+        return callback
+
+    @classmethod
+    def _record(cls, obj, action: str) -> Optional[Dict[str, Any]]:
+        tracked = cls.TRACKED.get(type(obj))
+        if tracked is None:
+            return None
+
+        entity_type, get_id, build_payload = tracked
+        return {
+            "entity_type": entity_type,
+            "entity_id": get_id(obj),
+            "action": action,
+            "payload": build_payload(obj),
+            "created_at": datetime.utcnow(),
+        }
+
+    @classmethod
+    def _status_transition(cls, obj) -> Optional[Dict[str, Any]]:
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes() or not history.deleted:
+            return None
+
+        record = cls._record(obj, "status_changed")
+        record["payload"] = dict(
+            record["payload"], previous_status=history.deleted[0]
+        )
+        return record
+
+    @classmethod
+    def collect(cls, session) -> List[Dict[str, Any]]:
+        """Build change records for the objects being flushed"""
+        changes = []
+
+        for obj in session.new:
+            record = cls._record(obj, "created")
+            if record:
+                changes.append(record)
+
+        for obj in session.dirty:
+            if type(obj) not in cls.TRACKED or not session.is_modified(
+                obj, include_collections=False
+            ):
+                continue
+            changes.append(cls._record(obj, "updated"))
+            if isinstance(obj, cls.STATUS_TRACKED):
+                transition = cls._status_transition(obj)
+                if transition:
+                    changes.append(transition)
+
+        for obj in session.deleted:
+            record = cls._record(obj, "deleted")
+            if record:
+                changes.append(record)
+
+        return changes
+
+    @classmethod
+    def _after_flush(cls, session, flush_context) -> None:
+        changes = cls.collect(session)
+        if not changes:
+            return
+
+        session.connection().execute(insert(ChangeLog.__table__), changes)
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+        for callback in cls._flush_callbacks:
+            callback(session, changes)
+
+    @classmethod
+    def _after_commit(cls, session) -> None:
+        changes = session.info.pop(_PENDING_KEY, None)
+        if not changes:
+            return
+
+        for callback in cls._commit_callbacks:
+            try:
+                callback(changes)
+            except Exception as e:
+                current_app.logger.error(f"Change feed subscriber error: {str(e)}")
+
+    @classmethod
+    def _after_rollback(cls, session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
+
+    @staticmethod
+    def read(cursor: int = 0, limit: int = 500, entity_types=None, settle_seconds=None):
+        """Return up to limit changes after cursor, oldest first
+
+        Ids are taken when a transaction flushes but only become visible when
+        it commits, so a missing id may belong to a transaction that is still
+        open. Reading stops before such a gap until the entry after it is
+        settle_seconds old (CHANGE_FEED_SETTLE_SECONDS by default); older gaps
+        are taken to be rollbacks and skipped.
+
+        That is a time bound, not a guarantee: entries of a transaction that
+        stays open longer than the window after flushing commit behind the
+        cursors that skipped them, and those consumers never see them. Keep
+        the window above the longest write transaction.
+        """
+        query = ChangeLog.query.filter(ChangeLog.id > cursor)
+
+        held_back = ChangeFeed.first_held_back(cursor, settle_seconds)
+        if held_back is not None:
+            query = query.filter(ChangeLog.id < held_back)
+
+        if entity_types:
+            query = query.filter(ChangeLog.entity_type.in_(entity_types))
+
+        rows = query.order_by(ChangeLog.id).limit(limit + 1).all()
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def first_held_back(cursor: int = 0, settle_seconds=None) -> Optional[int]:
+        """Id of the first entry after cursor behind a gap that may still fill
+
+        None when nothing needs holding back (see read).
+        """
+        if settle_seconds is None:
+            settle_seconds = current_app.config.get("CHANGE_FEED_SETTLE_SECONDS", 2)
+        if not settle_seconds:
+            return None
+
+        horizon = datetime.utcnow() - timedelta(seconds=settle_seconds)
+        previous = aliased(ChangeLog)
+        return db.session.scalar(
+            select(func.min(ChangeLog.id)).where(
+                ChangeLog.id > cursor + 1,
+                ChangeLog.created_at > horizon,
+                ~exists().where(previous.id == ChangeLog.id - 1),
+            )
+        )
+
+
+class FeedIndex:
+    """Per-worker immutable snapshot kept current from the change feed
+
+    Subclasses set ``entity_types`` and implement ``build(cursor)`` and
+    ``update(snapshot, entity_ids, cursor)``, each returning a new snapshot
+    with a ``cursor`` attribute; snapshots are never modified in place, so
+    request threads read them without locking.
+    """
+
+    entity_types: tuple = ()
+
+    def __init__(self, refresh_seconds: float = 5, settle_seconds=None):
+        self.refresh_seconds = refresh_seconds
+        self.settle_seconds = settle_seconds
+        self._snapshot = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def build(self, cursor: int):
+        """Snapshot of the current data, consistent up to cursor"""
+        raise NotImplementedError
+
+    def update(self, snapshot, entity_ids: Set[int], cursor: int):
+        """Copy of snapshot with entity_ids reloaded"""
+        raise NotImplementedError
+
+    def snapshot(self):
+        """The current snapshot, refreshed first when it's due
+
+        Only one thread refreshes at a time; the others keep serving the
+        previous snapshot meanwhile rather than waiting.
+        """
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._build()
+        elif time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._catch_up()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    def _build(self) -> None:
+        # Start below any gap that may still fill (see ChangeFeed.read);
+        # anything later is replayed on the next catch-up
+        statement = select(func.max(ChangeLog.id))
+        held_back = ChangeFeed.first_held_back(0, self.settle_seconds)
+        if held_back is not None:
+            statement = statement.where(ChangeLog.id < held_back)
+        cursor = db.session.scalar(statement) or 0
+        self._snapshot = self.build(cursor)
+        self._refreshed_at = time.monotonic()
+
+    def _catch_up(self) -> None:
+        snapshot = self._snapshot
+        while True:
+            rows, has_more = ChangeFeed.read(
+                snapshot.cursor,
+                entity_types=self.entity_types,
+                settle_seconds=self.settle_seconds,
+            )
+            if not rows:
+                break
+            snapshot = self.update(
+                snapshot, {row.entity_id for row in rows}, rows[-1].id
+            )
+            if not has_more:
+                break
+
+        self._snapshot = snapshot
+        self._refreshed_at = time.monotonic()
@@ -0,0 +1,265 @@
+"""
+Comment threads: materialized paths for single-query discussion loading
+
+Besides ``parent_id``, every comment stores:
+
+* ``path`` - the ids from its top-level comment down to itself, zero-padded
+  and "/"-terminated (``0000000012/0000000040/``), so sorting by path lists a
+  thread depth-first and a subtree is a prefix match;
+* ``depth`` - 0 for top-level comments;
+* ``thread_id`` - the id of its top-level comment;
+* ``reply_count`` - on top-level comments, the replies anywhere in the thread.
+
+They are filled in from ``ChangeFeed.on_flush`` inside the inserting
+transaction, with a few set-based UPDATEs per flush. ``load_threads`` then
+reads a page of top-level threads with all their replies in one ordered
+query, and ``load_subtree`` any comment with its descendants.
+``flask backfill-comment-paths`` fills in comments that predate the columns.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import aliased, joinedload
+
+from ..extensions import db
+from ..models.supporting import Comment
+from .change_feed import ChangeFeed
+
+PATH_WIDTH = 10
+# Replies nested deeper than this are stored as siblings at this depth,
+# which keeps paths within the column size
+MAX_DEPTH = 20
+
+
+def path_segment(comment_id: int) -> str:
+    """Path component for one comment id"""
+    return f"{comment_id:0{PATH_WIDTH}d}/"
+
+
+def thread_values(comment_id: int, parent: Optional[Tuple[str, int, int]]):
+    """(path, depth, thread_id) of a comment given its parent's
+
+    parent is None for top-level comments (and replies to vanished parents).
+    """
+    if parent is None:
+        return path_segment(comment_id), 0, comment_id
+
+    path, depth, thread_id = parent
+    if depth >= MAX_DEPTH:
+        # Attach as a sibling of the parent
+        path = path[: -(PATH_WIDTH + 1)]
+        depth -= 1
+    return path + path_segment(comment_id), depth + 1, thread_id
+
+
+def _thread_select(ids):
+    return select(Comment.id, Comment.path, Comment.depth, Comment.thread_id).where(
+        Comment.id.in_(ids), Comment.path.isnot(None)
+    )
+
+
+def _assign_paths(connection, comments: List[Tuple[int, Optional[int]]]) -> int:
+    """Store path, depth and thread for (id, parent_id) pairs; returns count
+
+    Parents must either already have a path or appear earlier in comments.
+    Bumps the reply count of every thread that gained replies.
+    """
+    parent_ids = {parent_id for _, parent_id in comments if parent_id}
+    known: Dict[int, Tuple[str, int, int]] = {
+        row.id: (row.path, row.depth, row.thread_id)
+        for row in connection.execute(_thread_select(parent_ids))
+    }
+
+    params = []
+    replies = Counter()
+    for comment_id, parent_id in comments:
+        path, depth, thread_id = thread_values(comment_id, known.get(parent_id))
+        known[comment_id] = (path, depth, thread_id)
+        params.append(
+            {
+                "b_id": comment_id,
+                "b_path": path,
+                "b_depth": depth,
+                "b_thread": thread_id,
+            }
+        )
+        if depth:
+            replies[thread_id] += 1
+
+    table = Comment.__table__
+    if params:
+        # Derived columns: updated_at keeps meaning "content edited"
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                path=bindparam("b_path"),
+                depth=bindparam("b_depth"),
+                thread_id=bindparam("b_thread"),
+                updated_at=table.c.updated_at,
+            ),
+            params,
+        )
+    _add_reply_counts(connection, replies)
+    return len(params)
+
+
+def _add_reply_counts(connection, deltas: Counter) -> None:
+    params = [
+        {"b_id": thread_id, "b_delta": delta}
+        for thread_id, delta in deltas.items()
+        if delta
+    ]
+    if params:
+        table = Comment.__table__
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                reply_count=table.c.reply_count + bindparam("b_delta"),
+                updated_at=table.c.updated_at,
+            ),
+            params,
+        )
+
+
+def _threads_scope(solution_id: Optional[int], problem_id: Optional[int]):
+    if solution_id is not None:
+        return Comment.solution_id == solution_id
+    return Comment.problem_id == problem_id
+
+
+def load_threads(
+    solution_id: Optional[int] = None,
+    problem_id: Optional[int] = None,
+    page: int = 1,
+    per_page: int = 10,
+) -> List[Comment]:
+    """A page of top-level threads (newest first) with all their replies
+
+    One query: the page of thread roots is a derived table joined back to
+    comments on thread_id, ordered by thread and then path, so replies follow
+    their parents depth-first. Authors are loaded in the same query.
+    """
+    roots = (
+        select(Comment.id)
+        .where(
+            _threads_scope(solution_id, problem_id),
+            Comment.parent_id.is_(None),
+        )
+        .order_by(Comment.id.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .subquery()
+    )
+    return (
+        db.session.execute(
+            select(Comment)
+            .join(roots, roots.c.id == Comment.thread_id)
+            .options(joinedload(Comment.user))
+            .order_by(Comment.thread_id.desc(), Comment.path)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def count_threads(solution_id: Optional[int] = None, problem_id: Optional[int] = None):
+    """Number of top-level threads in a discussion"""
+    return db.session.scalar(
+        select(func.count(Comment.id)).where(
+            _threads_scope(solution_id, problem_id), Comment.parent_id.is_(None)
+        )
+    )
+
+
+def load_subtree(comment_id: int) -> List[Comment]:
+    """A comment followed by all its descendants, depth-first, in one query"""
+    prefix = select(Comment.path).where(Comment.id == comment_id).scalar_subquery()
+    return (
+        db.session.execute(
+            select(Comment)
+            .where(Comment.path.startswith(prefix))
+            .options(joinedload(Comment.user))
+            .order_by(Comment.path)
+        )
+        .scalars()
+        .all()
+    )
+
+
+class CommentThreads:
+    """Maintains materialized comment paths and per-thread reply counts"""
+
+    @classmethod
+    def register(cls) -> None:
+        """Subscribe to the change feed (idempotent)"""
+        ChangeFeed.on_flush(cls.apply)
+
+    @staticmethod
+    def apply(session, changes) -> None:
+        """Place comments created in a flush; uncount deleted replies"""
+        created = []
+        removed = Counter()
+        for change in changes:
+            if change["entity_type"] != "comment":
+                continue
+            payload = change["payload"]
+            if change["action"] == "created":
+                created.append((change["entity_id"], payload["parent_id"]))
+            elif change["action"] == "deleted":
+                thread_id = payload.get("thread_id")
+                if thread_id and thread_id != change["entity_id"]:
+                    removed[thread_id] -= 1
+
+        connection = session.connection()
+        if created:
+            # Ids ascend in insert order, so parents come before their replies
+            _assign_paths(connection, sorted(created))
+        _add_reply_counts(connection, removed)
+
+    @staticmethod
+    def backfill(batch_size: int = 1000) -> int:
+        """Fill in paths of comments that have none, then recount replies
+
+        Works top-down: each batch takes comments whose parent already has a
+        path (or that have no existing parent). Returns the number placed.
+        """
+        parent = aliased(Comment)
+        total = 0
+        while True:
+            batch = db.session.execute(
+                select(Comment.id, parent.id)
+                .outerjoin(parent, parent.id == Comment.parent_id)
+                .where(
+                    Comment.path.is_(None),
+                    (parent.id.is_(None)) | (parent.path.isnot(None)),
+                )
+                .order_by(Comment.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+
+            # Replies to comments that no longer exist become top-level
+            comments = [tuple(row) for row in batch]
+            total += _assign_paths(db.session.connection(), comments)
+            db.session.commit()
+
+        # Recount from scratch; _assign_paths only adds to the counts
+        replies = aliased(Comment)
+        table = Comment.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.parent_id.is_(None))
+            .values(
+                reply_count=select(func.count(replies.id))
+                .where(replies.thread_id == table.c.id, replies.depth > 0)
+                .scalar_subquery(),
+                updated_at=table.c.updated_at,
+            )
+        )
+        db.session.commit()
+        return total
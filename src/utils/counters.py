@@ -0,0 +1,141 @@
+"""
+Counter caches: stored child counts for problems and solutions
+
+``Problem.solution_count``, ``evaluation_count`` and ``comment_count`` and
+``Solution.evaluation_count`` and ``comment_count`` let pages and the API
+show counts without loading the collections. They are adjusted from
+``ChangeFeed.on_flush`` inside the transaction that inserts or deletes the
+child, with one ``counter = counter + delta`` UPDATE per counter touched.
+``updated_at`` is left alone; ``stats_updated_at`` records the change so
+API validators and fragment caches that show counts can see it.
+Moving a child between parents isn't tracked; ``flask reconcile-counters``
+recounts everything in primary-key chunks and repairs any drift.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import bindparam, func, or_, select, update
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.solution import Solution
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.supporting import Comment
+from .change_feed import ChangeFeed
+
+# change feed entity type -> [(parent model, payload key, counter column)]
+COUNTED_CHILDREN = {
+    "solution": [(Problem, "problem_id", "solution_count")],
+    "problem_evaluation": [(Problem, "problem_id", "evaluation_count")],
+    "solution_evaluation": [(Solution, "solution_id", "evaluation_count")],
+    "comment": [
+        (Problem, "problem_id", "comment_count"),
+        (Solution, "solution_id", "comment_count"),
+    ],
+}
+
+# parent model -> {counter column: (child model, child foreign key)}
+COUNTER_SOURCES = {
+    Problem: {
+        "solution_count": (Solution, Solution.problem_id),
+        "evaluation_count": (ProblemEvaluation, ProblemEvaluation.problem_id),
+        "comment_count": (Comment, Comment.problem_id),
+    },
+    Solution: {
+        "evaluation_count": (SolutionEvaluation, SolutionEvaluation.solution_id),
+        "comment_count": (Comment, Comment.solution_id),
+    },
+}
+
+
+def _counts(model):
+    """Correlated child counts for every counter column of model"""
+    return {
+        column: select(func.count(child.id))
+        .where(foreign_key == model.id)
+        .scalar_subquery()
+        for column, (child, foreign_key) in COUNTER_SOURCES[model].items()
+    }
+
+
+class CounterCache:
+    """Maintains the counter-cache columns from the change feed"""
+
+    @classmethod
+    def register(cls) -> None:
+        """Subscribe to the change feed (idempotent)"""
+        ChangeFeed.on_flush(cls.apply)
+
+    @staticmethod
+    def apply(session, changes) -> None:
+        """Add a flush's inserts and subtract its deletes"""
+        deltas: Dict[tuple, Counter] = {}
+        for change in changes:
+            action = change["action"]
+            if action not in ("created", "deleted"):
+                continue
+            step = 1 if action == "created" else -1
+            for model, key, column in COUNTED_CHILDREN.get(change["entity_type"], ()):
+                parent_id = change["payload"].get(key)
+                if parent_id is not None:
+                    deltas.setdefault((model, column), Counter())[parent_id] += step
+
+        connection = session.connection()
+        now = datetime.utcnow()
+        for (model, column), counts in deltas.items():
+            params = [
+                {"b_id": parent_id, "b_delta": delta}
+                for parent_id, delta in counts.items()
+                if delta
+            ]
+            if not params:
+                continue
+            # Counts are derived data: updated_at keeps meaning "edited", and
+            # stats_updated_at versions the counts for ETags and caches
+            table = model.__table__
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    {
+                        column: table.c[column] + bindparam("b_delta"),
+                        "updated_at": table.c.updated_at,
+                        "stats_updated_at": now,
+                    }
+                ),
+                params,
+            )
+
+    @staticmethod
+    def reconcile(batch_size: int = 1000) -> Dict[str, int]:
+        """Recount every counter in primary-key chunks
+
+        Only rows whose stored counts drifted are written, and each chunk
+        commits on its own. Returns the number of rows repaired per table.
+        """
+        repaired = {}
+        for model in COUNTER_SOURCES:
+            counts = _counts(model)
+            drifted = or_(
+                *(getattr(model, column) != count for column, count in counts.items())
+            )
+            max_id = db.session.scalar(select(func.max(model.id))) or 0
+            repaired[model.__tablename__] = 0
+
+            for low in range(0, max_id, batch_size):
+                result = db.session.execute(
+                    update(model)
+                    .where(model.id > low, model.id <= low + batch_size, drifted)
+                    .values(
+                        updated_at=model.updated_at,
+                        stats_updated_at=datetime.utcnow(),
+                        **counts,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+                repaired[model.__tablename__] += result.rowcount
+
+        return repaired
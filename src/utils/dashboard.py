@@ -0,0 +1,204 @@
+"""
+Dashboard data layer: all widget data for a user in one cached bundle
+
+``load_dashboard`` builds the widgets from read-model rows (plain objects, safe
+to keep between requests) and the per-user counts from a single
+conditional-aggregate query, then caches the bundle per user.
+
+Entries are dropped when a commit touches the user's own problems, solutions,
+notifications or evaluations, or adds an evaluation to one of their items.
+Widgets that show other users' content (problems to evaluate) refresh within
+``DASHBOARD_CACHE_TTL`` seconds.
+"""
+
+from typing import Any, Dict, Iterable, Set
+
+from flask import current_app
+from sqlalchemy import case, event, exists, func, select
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.solution import Solution
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.supporting import Notification
+from ..models.read_models import (
+    problem_rows_select,
+    load_problem_rows,
+    solution_rows_select,
+    load_solution_rows,
+    notification_rows_select,
+    load_notification_rows,
+)
+from .cache import TTLCache
+from .evaluation_queue import EvaluationQueue
+
+WIDGET_LIMIT = 5
+NOTIFICATION_LIMIT = 10
+
+_PENDING_KEY = "dashboard_cache_invalidate"
+
+
+def get_dashboard_cache() -> TTLCache:
+    """Return the dashboard cache bound to the current application"""
+    cache = current_app.extensions.get("dashboard_cache")
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get("DASHBOARD_CACHE_SIZE", 1024),
+            ttl=current_app.config.get("DASHBOARD_CACHE_TTL", 60),
+        )
+        current_app.extensions["dashboard_cache"] = cache
+    return cache
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def problem_stats(user_id: int) -> Dict[str, int]:
+    """Count the user's problems by status and severity in one query"""
+    row = db.session.execute(
+        select(
+            func.count(Problem.id).label("total_problems"),
+            _count_where(Problem.status == "open").label("open_problems"),
+            _count_where(Problem.status == "implemented").label("resolved_problems"),
+            _count_where(Problem.severity == "critical").label(
+                "high_severity_problems"
+            ),
+        ).where(Problem.submitter_id == user_id)
+    ).one()
+    return {key: int(value) for key, value in row._mapping.items()}
+
+
+def build_dashboard(user_id: int) -> Dict[str, Any]:
+    """Query every dashboard widget for user_id"""
+    my_problems = load_problem_rows(
+        problem_rows_select()
+        .where(Problem.submitter_id == user_id)
+        .order_by(Problem.created_at.desc())
+        .limit(WIDGET_LIMIT)
+    )
+
+    # Other users' open problems this user hasn't evaluated, least covered first
+    problems_to_evaluate, _ = EvaluationQueue.for_user(
+        user_id, "problem", limit=WIDGET_LIMIT
+    )
+
+    # The user's solutions still waiting for an evaluation from someone else
+    evaluated_by_others = exists().where(
+        SolutionEvaluation.solution_id == Solution.id,
+        SolutionEvaluation.evaluator_id != user_id,
+    )
+    solutions_to_evaluate = load_solution_rows(
+        solution_rows_select()
+        .where(
+            Solution.submitter_id == user_id,
+            Solution.status.in_(["proposed", "voting"]),
+            ~evaluated_by_others,
+        )
+        .order_by(Solution.created_at.desc())
+        .limit(WIDGET_LIMIT)
+    )
+
+    notifications = load_notification_rows(
+        notification_rows_select()
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .order_by(Notification.created_at.desc())
+        .limit(NOTIFICATION_LIMIT)
+    )
+
+    return {
+        "my_problems": my_problems,
+        "problems_to_evaluate": problems_to_evaluate,
+        "solutions_to_evaluate": solutions_to_evaluate,
+        "notifications": notifications,
+        "stats": problem_stats(user_id),
+    }
+
+
+def load_dashboard(user_id: int) -> Dict[str, Any]:
+    """Return the (possibly cached) dashboard bundle for user_id"""
+    return get_dashboard_cache().get_or_set(user_id, lambda: build_dashboard(user_id))
+
+
+def invalidate_dashboards(user_ids: Iterable[int]) -> None:
+    """Drop cached dashboards for the given users"""
+    cache = current_app.extensions.get("dashboard_cache")
+    if cache is not None:
+        for user_id in user_ids:
+            cache.delete(user_id)
+
+
+class DashboardCacheInvalidator:
+    """Session hooks that invalidate affected dashboards once changes commit"""
+
+    # model -> attribute naming the user whose dashboard shows the row
+    OWNED = {
+        Problem: "submitter_id",
+        Solution: "submitter_id",
+        Notification: "user_id",
+    }
+
+    # evaluation model -> (evaluated model, foreign key attribute)
+    EVALUATIONS = {
+        ProblemEvaluation: (Problem, "problem_id"),
+        SolutionEvaluation: (Solution, "solution_id"),
+    }
+
+    @classmethod
+    def register(cls, session=None) -> None:
+        """Attach the session hooks (idempotent)"""
+        session = session or db.session
+        for name, handler in (
+            ("after_flush", cls._after_flush),
+            ("after_commit", cls._after_commit),
+            ("after_soft_rollback", cls._after_rollback),
+        ):
+            if not event.contains(session, name, handler):
+                event.listen(session, name, handler)
+
+    @classmethod
+    def affected_users(cls, session) -> Set[int]:
+        """User ids whose dashboards the objects being flushed change"""
+        users = set()
+        evaluated: Dict[Any, Set[int]] = {}
+
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            attribute = cls.OWNED.get(type(obj))
+            if attribute:
+                users.add(getattr(obj, attribute))
+                continue
+
+            target = cls.EVALUATIONS.get(type(obj))
+            if target:
+                # The evaluator's queue shrinks; the item owner's widgets change
+                users.add(obj.evaluator_id)
+                model, foreign_key = target
+                evaluated.setdefault(model, set()).add(getattr(obj, foreign_key))
+
+        # Owners of evaluated items, one query per evaluated model
+        for model, ids in evaluated.items():
+            users.update(
+                session.connection().execute(
+                    select(model.submitter_id).where(model.id.in_(ids))
+                ).scalars()
+            )
+
+        users.discard(None)
+        return users
+
+    @classmethod
+    def _after_flush(cls, session, flush_context) -> None:
+        users = cls.affected_users(session)
+        if users:
+            session.info.setdefault(_PENDING_KEY, set()).update(users)
+
+    @staticmethod
+    def _after_commit(session) -> None:
+        users = session.info.pop(_PENDING_KEY, None)
+        if users:
+            invalidate_dashboards(users)
+
+    @staticmethod
+    def _after_rollback(session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
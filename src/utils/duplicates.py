@@ -0,0 +1,324 @@
+"""
+Duplicate problem detection: MinHash signatures with locality-sensitive hashing
+
+Anonymous submitters can't tell whether their complaint was already filed,
+so ``problems.create`` checks new problems against existing ones first.
+
+* A problem's title and description are reduced to character shingles, and
+  those to a ``NUM_PERM``-value MinHash signature; the fraction of equal
+  values between two signatures estimates the Jaccard similarity of their
+  shingle sets.
+* Signatures are stored in ``problem_signatures`` (512 bytes each), written
+  from ``ChangeFeed.on_flush`` in the transaction that creates or edits the
+  problem. ``flask build-signatures`` fills in older problems.
+* Each worker keeps every signature in a ``DuplicateSnapshot``: the
+  signature matrix plus, per LSH band, the sorted band hashes. Candidates
+  are the problems sharing at least one band with the new text (a
+  ``searchsorted`` per band), and only those are compared in full. With 32
+  bands of 4 rows, pairs above ~0.42 similarity almost always collide.
+"""
+
+import hashlib
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import delete, insert, select
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.similarity import ProblemSignature
+from .change_feed import ChangeFeed, FeedIndex
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+# Only the start of long descriptions is shingled
+MAX_TEXT_LENGTH = 5000
+# Bump when any parameter above changes, then run flask build-signatures
+SIGNATURE_VERSION = 1
+
+_WORD = re.compile(r"\w+")
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK = np.uint64(0xFFFFFFFF)
+
+
+def _coefficients(name: str) -> np.ndarray:
+    # Derived from fixed digests so every worker (and numpy version) agrees
+    return np.array(
+        [
+            int.from_bytes(hashlib.sha256(f"{name}{i}".encode()).digest()[:4], "little")
+            | 1
+            for i in range(NUM_PERM)
+        ],
+        dtype=np.uint64,
+    )
+
+
+# h_i(x) = (a_i * x + b_i) mod p; a, b and x are below 2 ** 32, so no overflow
+_A = _coefficients("minhash-a-")
+_B = _coefficients("minhash-b-")
+
+
+def shingles(text: str) -> np.ndarray:
+    """CRC32 hashes of the distinct character shingles of normalized text"""
+    text = " ".join(_WORD.findall(text.casefold()))[:MAX_TEXT_LENGTH]
+    grams = {
+        text[start : start + SHINGLE_SIZE]
+        for start in range(max(len(text) - SHINGLE_SIZE + 1, 1))
+    }
+    grams.discard("")
+    return np.fromiter(
+        (zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of text: NUM_PERM uint32 values"""
+    values = shingles(text)
+    if not values.size:
+        return np.full(NUM_PERM, _MASK, dtype=np.uint32)
+    hashed = (np.outer(values, _A) + _B) % _PRIME & _MASK
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def problem_text(title: Optional[str], description: Optional[str]) -> str:
+    return f"{title or ''}\n{description or ''}"
+
+
+def encode(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def decode(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+def band_hashes(signatures: np.ndarray) -> np.ndarray:
+    """(n, BANDS) uint64 hash of each band of each signature"""
+    rows = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    hashes = np.zeros(rows.shape[:2], dtype=np.uint64)
+    for row in range(ROWS):
+        # FNV-style mixing; wraps modulo 2 ** 64
+        hashes = hashes * np.uint64(0x100000001B3) ^ rows[:, :, row]
+    return hashes
+
+
+class DuplicateSnapshot:
+    """Immutable signature matrix with per-band sorted LSH buckets"""
+
+    def __init__(self, ids: np.ndarray, signatures: np.ndarray, cursor: int):
+        self.ids = ids
+        self.signatures = signatures
+        self.cursor = cursor
+
+        bands = band_hashes(signatures)
+        self.order = np.argsort(bands, axis=0, kind="stable")
+        self.sorted_bands = np.take_along_axis(bands, self.order, axis=0)
+
+    @classmethod
+    def from_rows(cls, rows, cursor: int) -> "DuplicateSnapshot":
+        """Snapshot from (problem id, signature bytes) rows"""
+        rows = list(rows)
+        ids = np.array([problem_id for problem_id, _ in rows], dtype=np.int64)
+        signatures = np.array(
+            [decode(data) for _, data in rows], dtype=np.uint32
+        ).reshape(len(rows), NUM_PERM)
+        return cls(ids, signatures, cursor)
+
+    def apply(
+        self, changed: Dict[int, Optional[np.ndarray]], cursor: int
+    ) -> "DuplicateSnapshot":
+        """New snapshot with changed signatures replaced (None removes them)"""
+        keep = ~np.isin(self.ids, list(changed))
+        added = [
+            (problem_id, signature)
+            for problem_id, signature in changed.items()
+            if signature is not None
+        ]
+        ids = np.concatenate(
+            [self.ids[keep], np.array([pid for pid, _ in added], dtype=np.int64)]
+        )
+        signatures = np.concatenate(
+            [
+                self.signatures[keep],
+                np.array([sig for _, sig in added], dtype=np.uint32).reshape(
+                    len(added), NUM_PERM
+                ),
+            ]
+        )
+        return DuplicateSnapshot(ids, signatures, cursor)
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """Row positions sharing at least one band with signature"""
+        query = band_hashes(signature[np.newaxis, :])[0]
+        found = []
+        for band in range(BANDS):
+            column = self.sorted_bands[:, band]
+            start = np.searchsorted(column, query[band], side="left")
+            end = np.searchsorted(column, query[band], side="right")
+            found.append(self.order[start:end, band])
+        return np.unique(np.concatenate(found)) if found else np.empty(0, np.int64)
+
+    def similar(
+        self, signature: np.ndarray, threshold: float, limit: int
+    ) -> List[Tuple[int, float]]:
+        """(problem id, estimated similarity) of the closest candidates"""
+        rows = self.candidates(signature)
+        if not rows.size:
+            return []
+        scores = (self.signatures[rows] == signature).mean(axis=1)
+        matched = scores >= threshold
+        rows, scores = rows[matched], scores[matched]
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in best]
+
+
+def load_signatures(problem_ids=None):
+    """(problem id, signature bytes) rows of the current signature version"""
+    statement = select(ProblemSignature.problem_id, ProblemSignature.signature).where(
+        ProblemSignature.version == SIGNATURE_VERSION
+    )
+    if problem_ids is not None:
+        statement = statement.where(ProblemSignature.problem_id.in_(problem_ids))
+    return db.session.execute(statement).all()
+
+
+class DuplicateIndex(FeedIndex):
+    """Duplicate detection snapshots, caught up with problem changes"""
+
+    entity_types = ("problem",)
+
+    def build(self, cursor: int) -> DuplicateSnapshot:
+        return DuplicateSnapshot.from_rows(load_signatures(), cursor)
+
+    def update(self, snapshot: DuplicateSnapshot, entity_ids, cursor: int):
+        loaded = {
+            problem_id: decode(data)
+            for problem_id, data in load_signatures(list(entity_ids))
+        }
+        return snapshot.apply(
+            {problem_id: loaded.get(problem_id) for problem_id in entity_ids}, cursor
+        )
+
+
+def get_duplicate_index() -> DuplicateIndex:
+    """Return the duplicate detection index bound to the current application"""
+    index = current_app.extensions.get("duplicate_index")
+    if index is None:
+        index = DuplicateIndex(
+            refresh_seconds=current_app.config.get("DUPLICATE_REFRESH_SECONDS", 5),
+        )
+        current_app.extensions["duplicate_index"] = index
+    return index
+
+
+def find_duplicates(title: str, description: str) -> List[dict]:
+    """Existing problems that look like the given text, most similar first"""
+    matches = get_duplicate_index().snapshot().similar(
+        minhash(problem_text(title, description)),
+        threshold=current_app.config.get("DUPLICATE_THRESHOLD", 0.5),
+        limit=current_app.config.get("DUPLICATE_LIMIT", 5),
+    )
+    if not matches:
+        return []
+
+    titles = dict(
+        db.session.execute(
+            select(Problem.id, Problem.title).where(
+                Problem.id.in_([problem_id for problem_id, _ in matches])
+            )
+        ).all()
+    )
+    # Problems deleted since the last refresh are skipped
+    return [
+        {"id": problem_id, "title": titles[problem_id], "similarity": similarity}
+        for problem_id, similarity in matches
+        if problem_id in titles
+    ]
+
+
+def _signature_rows(connection, problem_ids) -> List[dict]:
+    now = datetime.utcnow()
+    table = Problem.__table__
+    return [
+        {
+            "problem_id": problem_id,
+            "signature": encode(minhash(problem_text(title, description))),
+            "version": SIGNATURE_VERSION,
+            "updated_at": now,
+        }
+        for problem_id, title, description in connection.execute(
+            select(table.c.id, table.c.title, table.c.description).where(
+                table.c.id.in_(problem_ids)
+            )
+        )
+    ]
+
+
+class ProblemSignatures:
+    """Maintains the stored MinHash signature of every problem"""
+
+    @classmethod
+    def register(cls) -> None:
+        """Subscribe to the change feed (idempotent)"""
+        ChangeFeed.on_flush(cls.apply)
+
+    @staticmethod
+    def apply(session, changes) -> None:
+        """Recompute signatures of problems created or edited in a flush"""
+        touched = set()
+        removed = set()
+        for change in changes:
+            if change["entity_type"] != "problem":
+                continue
+            if change["action"] in ("created", "updated"):
+                touched.add(change["entity_id"])
+            elif change["action"] == "deleted":
+                removed.add(change["entity_id"])
+        if not touched and not removed:
+            return
+
+        connection = session.connection()
+        table = ProblemSignature.__table__
+        connection.execute(
+            delete(table).where(table.c.problem_id.in_(touched | removed))
+        )
+        rows = _signature_rows(connection, touched - removed)
+        if rows:
+            connection.execute(insert(table), rows)
+
+    @staticmethod
+    def rebuild(batch_size: int = 500, force: bool = False) -> int:
+        """Compute missing or outdated signatures in primary-key chunks
+
+        With force every signature is recomputed. Returns the number written.
+        """
+        table = ProblemSignature.__table__
+        current = select(table.c.problem_id).where(
+            table.c.version == SIGNATURE_VERSION
+        )
+        total = 0
+        last_id = 0
+        while True:
+            statement = select(Problem.id).where(Problem.id > last_id)
+            if not force:
+                statement = statement.where(Problem.id.not_in(current))
+            problem_ids = db.session.scalars(
+                statement.order_by(Problem.id).limit(batch_size)
+            ).all()
+            if not problem_ids:
+                return total
+
+            connection = db.session.connection()
+            connection.execute(
+                delete(table).where(table.c.problem_id.in_(problem_ids))
+            )
+            connection.execute(insert(table), _signature_rows(connection, problem_ids))
+            db.session.commit()
+            total += len(problem_ids)
+            last_id = problem_ids[-1]
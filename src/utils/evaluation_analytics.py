@@ -0,0 +1,222 @@
+"""
+Evaluation analytics: score distributions and inter-rater agreement
+
+Ratings are streamed from the evaluation tables in batches of plain rows into
+NumPy arrays (item, evaluator, one column per criterion), so every statistic
+is a few ``bincount`` passes rather than a Python loop per evaluation:
+
+* per item: evaluation count, mean and sample variance of the overall score
+  (criteria weights from ``utils.scoring``); high variance marks contentious
+  problems and solutions;
+* per criterion and overall: Krippendorff's alpha with the interval metric,
+  over items rated at least twice (1 is perfect agreement, 0 is chance);
+* per evaluator: mean bias against the other ratings of the same items, and
+  its z-score against the pooled residual spread, so consistent outliers
+  stand apart from evaluators who were merely unlucky once.
+
+``build_report`` replaces the report tables in one transaction; run it from
+cron (``flask evaluation-report``). The admin API serves the stored report.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from ..extensions import db
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.evaluation_report import (
+    EvaluationAgreement,
+    EvaluationItemStats,
+    EvaluatorStats,
+)
+from .scoring import CRITERIA_COLUMNS, criteria_weights
+
+# item type -> (evaluation model, foreign key to the evaluated item)
+ANALYTICS_SOURCES = {
+    "problem": (ProblemEvaluation, ProblemEvaluation.problem_id),
+    "solution": (SolutionEvaluation, SolutionEvaluation.solution_id),
+}
+
+OVERALL = "overall"
+
+
+def rating_columns(item_type: str) -> List[str]:
+    """Rating columns of an item type, in the order load_ratings returns them"""
+    return sorted(CRITERIA_COLUMNS[item_type])
+
+
+def load_ratings(
+    item_type: str, batch_size: int = 5000
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (item ids, evaluator ids, ratings matrix) for every evaluation"""
+    evaluation, foreign_key = ANALYTICS_SOURCES[item_type]
+    columns = rating_columns(item_type)
+    result = db.session.execute(
+        select(
+            foreign_key,
+            evaluation.evaluator_id,
+            *(getattr(evaluation, column) for column in columns),
+        )
+        .order_by(evaluation.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    batches = [np.array(rows, dtype=float) for rows in result.partitions()]
+    data = np.concatenate(batches) if batches else np.empty((0, 2 + len(columns)))
+    return data[:, 0].astype(np.int64), data[:, 1].astype(np.int64), data[:, 2:]
+
+
+def item_stats(items, scores) -> Tuple[np.ndarray, ...]:
+    """Per item (ids, counts, means, sample variances)
+
+    Variance is NaN for items with a single evaluation.
+    """
+    ids, index, counts = np.unique(items, return_inverse=True, return_counts=True)
+    means = np.bincount(index, weights=scores) / counts
+    squares = np.bincount(index, weights=(scores - means[index]) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variances = np.where(counts > 1, squares / (counts - 1), np.nan)
+    return ids, counts, means, variances
+
+
+def krippendorff_alpha(items, values) -> float:
+    """Krippendorff's alpha with the interval metric
+
+    Items rated once carry no agreement information and are left out. Returns
+    NaN when fewer than two items remain or the ratings never vary.
+    """
+    _, index, counts = np.unique(items, return_inverse=True, return_counts=True)
+    pairable = counts[index] > 1
+    if np.count_nonzero(counts > 1) < 2:
+        return math.nan
+
+    values = np.asarray(values, dtype=float)[pairable]
+    _, index, counts = np.unique(
+        np.asarray(items)[pairable], return_inverse=True, return_counts=True
+    )
+    n = len(values)
+
+    # Sum of squared differences over ordered pairs is 2 * m * (within-SS)
+    means = np.bincount(index, weights=values) / counts
+    within = np.bincount(index, weights=(values - means[index]) ** 2)
+    observed = np.sum(2 * counts * within / (counts - 1)) / n
+    expected = 2 * np.sum((values - values.mean()) ** 2) / (n - 1)
+    if expected == 0:
+        return math.nan
+    return float(1 - observed / expected)
+
+
+def rater_bias(items, raters, scores) -> Tuple[np.ndarray, ...]:
+    """Per evaluator (ids, counts, mean bias, bias z-scores)
+
+    Each score is compared with the mean of the other scores for the same
+    item, so only items with at least two evaluations count.
+    """
+    _, index, counts = np.unique(items, return_inverse=True, return_counts=True)
+    shared = counts[index] > 1
+    totals = np.bincount(index, weights=scores)
+
+    others = counts[index][shared] - 1
+    residuals = scores[shared] - (totals[index][shared] - scores[shared]) / others
+    ids, rater_index, rater_counts = np.unique(
+        np.asarray(raters)[shared], return_inverse=True, return_counts=True
+    )
+    bias = np.bincount(rater_index, weights=residuals, minlength=len(ids))
+    bias = bias / np.maximum(rater_counts, 1)
+
+    spread = np.sqrt(np.mean(residuals**2)) if len(residuals) else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = np.where(
+            spread > 0, bias / (spread / np.sqrt(rater_counts)), np.nan
+        )
+    return ids, rater_counts, bias, z_scores
+
+
+def _optional(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def build_report(batch_size: int = 5000) -> Dict[str, Dict]:
+    """Recompute and store the evaluation report
+
+    Returns per item type the number of items and evaluators reported and the
+    overall alpha.
+    """
+    computed_at = datetime.utcnow()
+    summary = {}
+
+    for item_type in ANALYTICS_SOURCES:
+        items, raters, ratings = load_ratings(item_type, batch_size)
+        columns = rating_columns(item_type)
+        weights = criteria_weights(item_type)
+        scores = ratings @ np.array([weights.get(column, 0.0) for column in columns])
+
+        ids, counts, means, variances = item_stats(items, scores)
+        item_rows = [
+            {
+                "item_type": item_type,
+                "item_id": item_id,
+                "evaluation_count": count,
+                "mean_score": mean,
+                "score_variance": _optional(variance),
+                "computed_at": computed_at,
+            }
+            for item_id, count, mean, variance in zip(
+                ids.tolist(), counts.tolist(), means.tolist(), variances.tolist()
+            )
+        ]
+
+        rater_ids, rater_counts, bias, z_scores = rater_bias(items, raters, scores)
+        rater_rows = [
+            {
+                "item_type": item_type,
+                "evaluator_id": evaluator_id,
+                "evaluation_count": count,
+                "mean_bias": mean_bias,
+                "bias_z_score": _optional(z_score),
+                "computed_at": computed_at,
+            }
+            for evaluator_id, count, mean_bias, z_score in zip(
+                rater_ids.tolist(),
+                rater_counts.tolist(),
+                bias.tolist(),
+                z_scores.tolist(),
+            )
+        ]
+
+        rated_items = int(np.count_nonzero(counts > 1))
+        agreement_rows = [
+            {
+                "item_type": item_type,
+                "criterion": criterion,
+                "alpha": _optional(krippendorff_alpha(items, values)),
+                "item_count": rated_items,
+                "rating_count": len(items),
+                "computed_at": computed_at,
+            }
+            for criterion, values in [(OVERALL, scores)]
+            + [(column, ratings[:, i]) for i, column in enumerate(columns)]
+        ]
+
+        for model, rows in (
+            (EvaluationItemStats, item_rows),
+            (EvaluatorStats, rater_rows),
+            (EvaluationAgreement, agreement_rows),
+        ):
+            table = model.__table__
+            db.session.execute(delete(table).where(table.c.item_type == item_type))
+            if rows:
+                db.session.execute(insert(table), rows)
+
+        summary[item_type] = {
+            "items": len(item_rows),
+            "evaluators": len(rater_rows),
+            "alpha": agreement_rows[0]["alpha"],
+        }
+
+    db.session.commit()
+    return summary
@@ -0,0 +1,227 @@
+"""
+Evaluation queue: what each user still needs to evaluate
+
+The ``evaluation_queue`` table holds one row per problem open for evaluation
+and per solution being proposed or voted on, with a running evaluation count.
+It is maintained from ``ChangeFeed.on_flush`` inside the transaction that
+makes the change: creations and status transitions add or drop items, new and
+deleted evaluations adjust the count in place.
+
+A user's queue is that table minus their own items, anti-joined (NOT EXISTS)
+against their evaluations via the (evaluator_id, item) indexes. It is ordered
+fewest-evaluations-first and paged by keyset on (evaluation_count, id), so
+deep pages cost the same as the first one.
+"""
+
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, delete, exists, func, insert, literal, or_
+from sqlalchemy import select, update
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.solution import Solution
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.evaluation_queue import EvaluationQueueItem
+from .change_feed import ChangeFeed
+
+# item type -> (model, its problem id column, evaluation model,
+#               evaluation foreign key, statuses that keep it queued)
+QUEUE_SOURCES = {
+    "problem": (
+        Problem,
+        Problem.id,
+        ProblemEvaluation,
+        ProblemEvaluation.problem_id,
+        ("open",),
+    ),
+    "solution": (
+        Solution,
+        Solution.problem_id,
+        SolutionEvaluation,
+        SolutionEvaluation.solution_id,
+        ("proposed", "voting"),
+    ),
+}
+
+# change feed evaluation entity type -> (queue item type, payload key)
+EVALUATION_ENTITIES = {
+    "problem_evaluation": ("problem", "problem_id"),
+    "solution_evaluation": ("solution", "solution_id"),
+}
+
+_QUEUE_COLUMNS = [
+    "item_type",
+    "item_id",
+    "problem_id",
+    "submitter_id",
+    "evaluation_count",
+    "created_at",
+]
+
+
+def _eligible_select(item_type: str, ids: Optional[Iterable[int]] = None):
+    """SELECT of queue rows for items currently open for evaluation"""
+    model, problem_id, evaluation, foreign_key, statuses = QUEUE_SOURCES[item_type]
+    evaluation_count = (
+        select(func.count(evaluation.id))
+        .where(foreign_key == model.id)
+        .scalar_subquery()
+    )
+    statement = select(
+        literal(item_type),
+        model.id,
+        problem_id,
+        model.submitter_id,
+        evaluation_count,
+        model.created_at,
+    ).where(model.status.in_(statuses))
+    if ids is not None:
+        statement = statement.where(model.id.in_(ids))
+    return statement
+
+
+def parse_cursor(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse an ``<evaluation_count>.<id>`` cursor; raises ValueError if malformed"""
+    if not value:
+        return None
+    count, _, item_id = value.partition(".")
+    return int(count), int(item_id)
+
+
+class EvaluationQueue:
+    """Maintains the evaluation_queue table and reads per-user queues"""
+
+    @classmethod
+    def register(cls) -> None:
+        """Subscribe to the change feed (idempotent)"""
+        ChangeFeed.on_flush(cls.apply)
+
+    @classmethod
+    def apply(cls, session, changes) -> None:
+        """Fold a flush's change records into the queue"""
+        synced = {item_type: set() for item_type in QUEUE_SOURCES}
+        removed = {item_type: set() for item_type in QUEUE_SOURCES}
+        deltas = {item_type: Counter() for item_type in QUEUE_SOURCES}
+
+        for change in changes:
+            entity_type, action = change["entity_type"], change["action"]
+            if entity_type in QUEUE_SOURCES:
+                if action in ("created", "status_changed"):
+                    synced[entity_type].add(change["entity_id"])
+                elif action == "deleted":
+                    removed[entity_type].add(change["entity_id"])
+            elif entity_type in EVALUATION_ENTITIES and action != "updated":
+                item_type, key = EVALUATION_ENTITIES[entity_type]
+                step = 1 if action == "created" else -1
+                deltas[item_type][change["payload"][key]] += step
+
+        connection = session.connection()
+        table = EvaluationQueueItem.__table__
+
+        for item_type in QUEUE_SOURCES:
+            stale = synced[item_type] | removed[item_type]
+            if stale:
+                connection.execute(
+                    delete(table).where(
+                        table.c.item_type == item_type, table.c.item_id.in_(stale)
+                    )
+                )
+            if synced[item_type]:
+                # Re-inserted rows count evaluations from scratch
+                connection.execute(
+                    insert(table).from_select(
+                        _QUEUE_COLUMNS, _eligible_select(item_type, synced[item_type])
+                    )
+                )
+
+            counts = [
+                {"b_item_id": item_id, "b_delta": delta}
+                for item_id, delta in deltas[item_type].items()
+                if delta and item_id not in stale
+            ]
+            if counts:
+                connection.execute(
+                    update(table)
+                    .where(
+                        table.c.item_type == item_type,
+                        table.c.item_id == bindparam("b_item_id"),
+                    )
+                    .values(
+                        evaluation_count=table.c.evaluation_count
+                        + bindparam("b_delta")
+                    ),
+                    counts,
+                )
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute the whole queue from the source tables; returns item count"""
+        table = EvaluationQueueItem.__table__
+        db.session.execute(delete(table))
+        for item_type in QUEUE_SOURCES:
+            db.session.execute(
+                insert(table).from_select(_QUEUE_COLUMNS, _eligible_select(item_type))
+            )
+        db.session.commit()
+        return db.session.scalar(select(func.count()).select_from(table))
+
+    @staticmethod
+    def for_user(
+        user_id: int,
+        item_type: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[List, Optional[str]]:
+        """Return (rows, next_cursor) of items user_id has yet to evaluate
+
+        Rows carry the queue columns plus the problem ``title`` and, for
+        solutions, the solution ``summary``.
+        """
+        queue = EvaluationQueueItem
+        pending = []
+        for source_type in [item_type] if item_type else QUEUE_SOURCES:
+            _, _, evaluation, foreign_key, _ = QUEUE_SOURCES[source_type]
+            evaluated = exists().where(
+                foreign_key == queue.item_id, evaluation.evaluator_id == user_id
+            )
+            pending.append(and_(queue.item_type == source_type, ~evaluated))
+
+        statement = (
+            select(
+                queue.id,
+                queue.item_type,
+                queue.item_id,
+                queue.problem_id,
+                queue.evaluation_count,
+                queue.created_at,
+                Problem.title,
+                Solution.summary,
+            )
+            .join(Problem, Problem.id == queue.problem_id)
+            .outerjoin(
+                Solution,
+                and_(queue.item_type == "solution", Solution.id == queue.item_id),
+            )
+            .where(queue.submitter_id != user_id, or_(*pending))
+        )
+
+        if after:
+            count, last_id = after
+            statement = statement.where(
+                or_(
+                    queue.evaluation_count > count,
+                    and_(queue.evaluation_count == count, queue.id > last_id),
+                )
+            )
+
+        rows = db.session.execute(
+            statement.order_by(queue.evaluation_count, queue.id).limit(limit + 1)
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1].evaluation_count}.{rows[-1].id}"
+        return rows, next_cursor
@@ -0,0 +1,91 @@
+"""
+Streaming NDJSON export helpers for bulk data extraction
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import select
+
+from ..extensions import db
+
+EXPORT_BATCH_SIZE = 1000
+GZIP_FLUSH_BYTES = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder fallback for database types"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def export_statement(model, since: datetime = None):
+    """Core SELECT of every column of model, optionally changed since a time"""
+    statement = select(*model.__table__.columns).order_by(model.id)
+    if since is not None:
+        statement = statement.where(model.updated_at >= since)
+    return statement
+
+
+def iter_ndjson(statement, record_type: str = None) -> Iterator[str]:
+    """Yield one JSON line per row using a server-side cursor
+
+    Rows are fetched in batches of EXPORT_BATCH_SIZE as plain mappings, so
+    no ORM objects or identity map entries are created and memory stays
+    flat regardless of table size.
+    """
+    result = db.session.execute(
+        statement,
+        execution_options={"stream_results": True, "yield_per": EXPORT_BATCH_SIZE},
+    )
+    try:
+        for row in result.mappings():
+            record = dict(row)
+            if record_type:
+                record["type"] = record_type
+            yield json.dumps(record, default=_json_default, separators=(",", ":"))
+            yield "\n"
+    finally:
+        result.close()
+
+
+def gzip_stream(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks, emitting compressed blocks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = 0
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        pending += len(chunk)
+        if data:
+            yield data
+        if pending >= GZIP_FLUSH_BYTES:
+            yield compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+
+    yield compressor.flush()
+
+
+def batch_text(chunks: Iterable[str], size: int = GZIP_FLUSH_BYTES) -> Iterator[str]:
+    """Coalesce small text chunks so each HTTP chunk carries many rows"""
+    buffer = []
+    buffered = 0
+
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer = []
+            buffered = 0
+
+    if buffer:
+        yield "".join(buffer)
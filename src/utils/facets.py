@@ -0,0 +1,87 @@
+"""
+Faceted problem search: per-value result counts in one grouped query
+
+Each facet is a value column reachable from ``problems`` (severity and
+status directly, tags and departments through their indexed relation
+tables, see utils.tagging). ``facet_counts`` builds one ``GROUP BY``
+branch per facet and sends them as a single ``UNION ALL``, so adding a
+facet adds a branch rather than a round trip per value. A branch applies
+the search conditions and every *other* selected facet, so the counts say
+how many results picking that value instead would return.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, literal, select, union_all
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.supporting import Tag, ProblemDepartment
+from .tagging import join_tags, join_departments
+
+# facet -> (value column, join from problems to it)
+FACETS = {
+    "severity": (Problem.severity, None),
+    "status": (Problem.status, None),
+    "tag": (Tag.name, join_tags),
+    "department": (ProblemDepartment.department, join_departments),
+}
+
+# Most frequent values returned per facet
+FACET_LIMIT = 20
+
+
+def _filter(statement, facet: str, value: str):
+    column, join = FACETS[facet]
+    if join is not None:
+        statement = join(statement)
+    return statement.where(column == value)
+
+
+def filter_facets(statement, selected: Dict[str, Optional[str]]):
+    """Restrict a problem select (or query) to the selected facet values"""
+    for facet, value in selected.items():
+        if value:
+            statement = _filter(statement, facet, value)
+    return statement
+
+
+def facet_counts(
+    conditions: Iterable = (),
+    selected: Optional[Dict[str, Optional[str]]] = None,
+    limit: int = FACET_LIMIT,
+) -> Dict[str, List[dict]]:
+    """Result counts per facet value, most frequent first
+
+    conditions are WHERE clauses on problems shared by every facet (the text
+    search); selected maps facet names to the active filter values.
+    """
+    conditions = list(conditions)
+    selected = selected or {}
+
+    branches = []
+    for facet, (column, join) in FACETS.items():
+        count = func.count(Problem.id)
+        statement = select(
+            literal(facet).label("facet"), column.label("value"), count.label("count")
+        ).select_from(Problem)
+        if join is not None:
+            statement = join(statement)
+        statement = statement.where(column.isnot(None), *conditions)
+        for other, value in selected.items():
+            if value and other != facet:
+                statement = _filter(statement, other, value)
+        branches.append(
+            statement.group_by(column)
+            .order_by(count.desc(), column)
+            .limit(limit)
+            .subquery()
+        )
+
+    facets = {facet: [] for facet in FACETS}
+    counts = union_all(*(select(branch) for branch in branches)).subquery()
+    for row in db.session.execute(
+        select(counts).order_by(counts.c.facet, counts.c.count.desc(), counts.c.value)
+    ):
+        facets[row.facet].append({"value": row.value, "count": row.count})
+    return facets
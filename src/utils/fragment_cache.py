@@ -0,0 +1,99 @@
+"""
+Jinja fragment caching for repeated template markup such as problem cards
+
+Usage in templates::
+
+    {% cache fragment_key("problem-card", problem), 600 %}
+        ... markup that is identical for every viewer ...
+    {% endcache %}
+
+Keys built with ``fragment_key`` embed the entity's ``updated_at`` so an edit
+produces a new key instead of requiring explicit invalidation, plus its
+``stats_updated_at`` where present, as counter and score writes leave
+``updated_at`` alone. Values a fragment shows that neither tracks (vote
+tallies) are passed as extra parts. Anything that depends on the viewer
+(identity reveal for admins, edit buttons) must stay outside the cached
+block.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from flask import current_app
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from .cache import TTLCache
+
+
+def _stamp(version: Any) -> Any:
+    return version.timestamp() if isinstance(version, datetime) else version
+
+
+def fragment_key(name: str, *parts: Any) -> str:
+    """Build a versioned cache key from a fragment name and entities/values"""
+    key_parts = [name]
+
+    for part in parts:
+        if hasattr(part, "__tablename__") or hasattr(part, "updated_at"):
+            version = getattr(part, "updated_at", None) or getattr(
+                part, "created_at", None
+            )
+            key_parts.append(
+                f"{getattr(part, '__tablename__', type(part).__name__)}"
+                f":{getattr(part, 'id', '')}:{_stamp(version)}"
+                f":{_stamp(getattr(part, 'stats_updated_at', None))}"
+            )
+        else:
+            key_parts.append(str(part))
+
+    return "|".join(key_parts)
+
+
+def get_fragment_cache() -> TTLCache:
+    """Return the fragment cache bound to the current application"""
+    cache = current_app.extensions.get("fragment_cache")
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get("FRAGMENT_CACHE_SIZE", 4096),
+            ttl=current_app.config.get("FRAGMENT_CACHE_TIMEOUT", 300),
+        )
+        current_app.extensions["fragment_cache"] = cache
+    return cache
+
+
+class FragmentCacheExtension(Extension):
+    """Adds a ``{% cache key[, ttl] %}...{% endcache %}`` block tag"""
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.globals.setdefault("fragment_key", fragment_key)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+
+        body = parser.parse_statements(["name:endcache"], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render_cached", args), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_cached(self, key, timeout, caller):
+        """Return cached markup for key, rendering the block on a miss"""
+        if not current_app.config.get("FRAGMENT_CACHE_ENABLED", True):
+            return caller()
+
+        cache = get_fragment_cache()
+        rendered = cache.get(key)
+        if rendered is None:
+            rendered = Markup(caller())
+            cache.set(key, rendered, timeout)
+        return rendered
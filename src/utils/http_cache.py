@@ -0,0 +1,61 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified) for API responses
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from flask import request, make_response
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a compact ETag value from version components"""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, datetime):
+            part = part.isoformat()
+        digest.update(repr(part).encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:32]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize naive UTC timestamps from the database to aware datetimes"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    # HTTP dates have second precision
+    return value.replace(microsecond=0)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None):
+    """Return a 304 response when the request validators match, else None
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    Call this before serializing so unchanged resources skip that work.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif last_modified is not None and request.if_modified_since:
+        if _as_utc(last_modified) > request.if_modified_since:
+            return None
+    else:
+        return None
+
+    response = make_response("", 304)
+    return add_validators(response, etag, last_modified)
+
+
+def add_validators(response, etag: str, last_modified: Optional[datetime] = None):
+    """Attach ETag, Last-Modified and revalidation headers to a response"""
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    response.cache_control.no_cache = True
+    return response
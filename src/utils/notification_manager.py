@@ -8,7 +8,8 @@ from typing import List, Dict, Any, Optional
 from flask import current_app
 from flask_mail import Message
 from ..extensions import db, mail
-from ..models.supporting import Notification, User
+from ..models.supporting import Notification
+from ..models.user import User
 from ..models.problem import Problem
 from ..models.solution import Solution
 from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
@@ -151,7 +152,9 @@ class NotificationManager:
         )
 
     @staticmethod
-    def mark_notification_read(notification_id: int, user_id: int) -> bool:
+    def mark_notification_read(
+        notification_id: int, user_id: int, commit: bool = True
+    ) -> bool:
         """Mark a notification as read"""
         notification = Notification.query.filter_by(
             id=notification_id, user_id=user_id
@@ -159,7 +162,25 @@ class NotificationManager:
 
         if notification:
             notification.is_read = True
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            return True
+
+        return False
+
+    @staticmethod
+    def delete_notification(
+        notification_id: int, user_id: int, commit: bool = True
+    ) -> bool:
+        """Delete a notification owned by the user"""
+        notification = Notification.query.filter_by(
+            id=notification_id, user_id=user_id
+        ).first()
+
+        if notification:
+            db.session.delete(notification)
+            if commit:
+                db.session.commit()
             return True
 
         return False
@@ -0,0 +1,341 @@
+"""
+Solution ranking: confidence-adjusted scores from votes and evaluations
+
+Raw ``upvotes - downvotes`` lets a solution with one vote beat one that has
+been argued over at length. Each solution instead gets:
+
+* ``vote_lower_bound`` - the Wilson score lower bound of its upvote share,
+  which stays low until enough votes back the ratio up;
+* ``evaluation_score`` - its mean weighted evaluation score (criteria weights
+  from ``utils.scoring``) shrunk toward a prior mean, so a handful of
+  evaluations can't outrank a well-evaluated solution;
+* ``rank_score`` - a blend of both on a 0-1 scale, indexed per problem.
+
+Scores are computed with numpy over all solutions of a problem at once and
+stored. A change-feed flush hook recomputes only problems whose votes,
+evaluations or solutions changed, in the same transaction; it also keeps
+``Problem.aggregate_score`` current. ``rescore`` recomputes everything with
+set-based UPDATEs after the criteria change.
+
+Like the counter caches, score writes keep ``updated_at`` (it means
+"edited", and fragment caches, ETags and ``export?since`` key on it) and
+stamp ``stats_updated_at`` instead.
+"""
+
+import math
+from datetime import datetime
+from typing import Iterable, Set
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import bindparam, func, literal, or_, select, update
+
+from ..extensions import db
+from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
+from ..models.problem import Problem
+from ..models.solution import Solution
+from .change_feed import ChangeFeed
+from .scoring import RATING_MIN, RATING_MAX, criteria_version, criteria_weights
+from .scoring import weighted_rating
+
+# Share of rank_score taken by votes; evaluations get the rest
+VOTE_WEIGHT = 0.5
+
+
+def wilson_lower_bound(upvotes, downvotes, z: float = 1.96) -> np.ndarray:
+    """Lower bound of the Wilson score interval for the upvote share
+
+    Solutions without votes score 0.
+    """
+    upvotes = np.asarray(upvotes, dtype=float)
+    total = upvotes + np.asarray(downvotes, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = upvotes / total
+        z2 = z * z
+        bound = (
+            share
+            + z2 / (2 * total)
+            - z * np.sqrt((share * (1 - share) + z2 / (4 * total)) / total)
+        ) / (1 + z2 / total)
+    return np.where(total > 0, bound, 0.0)
+
+
+def shrunk_mean(totals, counts, prior_mean: float, prior_weight: float) -> np.ndarray:
+    """Bayesian average: the sample mean pulled toward prior_mean
+
+    prior_weight is how many pseudo-ratings at prior_mean each solution starts
+    with; solutions without evaluations score exactly prior_mean.
+    """
+    totals = np.asarray(totals, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    return (prior_mean * prior_weight + totals) / (prior_weight + counts)
+
+
+def rank_scores(vote_bounds, evaluation_scores) -> np.ndarray:
+    """Blend vote bounds (0-1) and evaluation scores (rating scale) into 0-1"""
+    scale = RATING_MAX - RATING_MIN
+    normalized = (np.asarray(evaluation_scores) - RATING_MIN) / scale
+    return VOTE_WEIGHT * np.asarray(vote_bounds) + (1 - VOTE_WEIGHT) * normalized
+
+
+def _changed(stored, computed) -> bool:
+    return any(
+        old is None or not math.isclose(old, new, abs_tol=1e-9)
+        for old, new in zip(stored, computed)
+    )
+
+
+def rank_problems(connection, problem_ids: Iterable[int]) -> int:
+    """Recompute and store rankings for every solution of problem_ids
+
+    Runs two SELECTs and one executemany UPDATE regardless of how many
+    solutions are involved. Returns the number of solutions whose stored
+    values changed.
+    """
+    problem_ids = set(problem_ids)
+    if not problem_ids:
+        return 0
+
+    config = current_app.config
+    solutions = connection.execute(
+        select(
+            Solution.id,
+            Solution.upvotes,
+            Solution.downvotes,
+            Solution.vote_lower_bound,
+            Solution.evaluation_score,
+            Solution.aggregate_score,
+            Solution.score_version,
+        )
+        .where(Solution.problem_id.in_(problem_ids))
+        .order_by(Solution.id)
+    ).all()
+    if not solutions:
+        return 0
+
+    criteria_weight = criteria_weights("solution")
+    criteria = list(criteria_weight)
+    version = criteria_version()
+    evaluations = connection.execute(
+        select(
+            SolutionEvaluation.solution_id,
+            *(getattr(SolutionEvaluation, name) for name in criteria),
+        )
+        .join(Solution, Solution.id == SolutionEvaluation.solution_id)
+        .where(Solution.problem_id.in_(problem_ids))
+    ).all()
+
+    ids = np.array([row[0] for row in solutions])
+    upvotes = np.array([row[1] or 0 for row in solutions], dtype=float)
+    downvotes = np.array([row[2] or 0 for row in solutions], dtype=float)
+
+    totals = np.zeros(len(ids))
+    counts = np.zeros(len(ids))
+    if evaluations:
+        ratings = np.array([row[1:] for row in evaluations], dtype=float)
+        weights = np.array([criteria_weight[name] for name in criteria])
+        # ids is sorted, so searchsorted maps each evaluation to its solution
+        index = np.searchsorted(ids, [row[0] for row in evaluations])
+        totals = np.bincount(index, weights=ratings @ weights, minlength=len(ids))
+        counts = np.bincount(index, minlength=len(ids)).astype(float)
+
+    vote_bounds = wilson_lower_bound(upvotes, downvotes)
+    evaluation_scores = shrunk_mean(
+        totals,
+        counts,
+        config.get("RANKING_PRIOR_MEAN", 3.0),
+        config.get("RANKING_PRIOR_WEIGHT", 5),
+    )
+    ranks = rank_scores(vote_bounds, evaluation_scores)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        averages = np.where(counts > 0, totals / counts, 0.0)
+
+    # Only rewrite rows whose values moved, so stats_updated_at means "changed"
+    stored = {row[0]: row[3:6] for row in solutions}
+    versions = {row[0]: row[6] for row in solutions}
+    params = []
+    for solution_id, vote_bound, evaluation_score, rank, average in zip(
+        ids.tolist(),
+        vote_bounds.tolist(),
+        evaluation_scores.tolist(),
+        ranks.tolist(),
+        averages.tolist(),
+    ):
+        if versions[solution_id] == version and not _changed(
+            stored[solution_id], (vote_bound, evaluation_score, average)
+        ):
+            continue
+        params.append(
+            {
+                "b_id": solution_id,
+                "b_votes": vote_bound,
+                "b_evaluation": evaluation_score,
+                "b_rank": rank,
+                "b_average": average,
+            }
+        )
+
+    if params:
+        table = Solution.__table__
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                vote_lower_bound=bindparam("b_votes"),
+                evaluation_score=bindparam("b_evaluation"),
+                rank_score=bindparam("b_rank"),
+                aggregate_score=bindparam("b_average"),
+                score_version=version,
+                updated_at=table.c.updated_at,
+                stats_updated_at=datetime.utcnow(),
+            ),
+            params,
+        )
+    return len(params)
+
+
+def _evaluation_totals(kind: str, evaluation_model, foreign_key, item_id):
+    """Correlated (sum, count) of weighted ratings for one problem or solution"""
+    rating = weighted_rating(evaluation_model, kind)
+    return (
+        select(func.coalesce(func.sum(rating), 0.0))
+        .where(foreign_key == item_id)
+        .scalar_subquery(),
+        select(func.count(evaluation_model.id))
+        .where(foreign_key == item_id)
+        .scalar_subquery(),
+    )
+
+
+def problem_score_values():
+    """UPDATE values scoring problems from their evaluations in SQL"""
+    total, count = _evaluation_totals(
+        "problem", ProblemEvaluation, ProblemEvaluation.problem_id, Problem.id
+    )
+    return {
+        "aggregate_score": total / func.nullif(count, 0),
+        "score_version": criteria_version(),
+        "updated_at": Problem.updated_at,
+        "stats_updated_at": datetime.utcnow(),
+    }
+
+
+def solution_score_values():
+    """UPDATE values matching rank_problems, for set-based rescoring"""
+    config = current_app.config
+    prior_mean = config.get("RANKING_PRIOR_MEAN", 3.0)
+    prior_weight = config.get("RANKING_PRIOR_WEIGHT", 5)
+    total, count = _evaluation_totals(
+        "solution", SolutionEvaluation, SolutionEvaluation.solution_id, Solution.id
+    )
+    evaluation_score = (literal(prior_mean * prior_weight) + total) / (
+        literal(prior_weight) + count
+    )
+    normalized = (evaluation_score - RATING_MIN) / (RATING_MAX - RATING_MIN)
+    return {
+        "aggregate_score": func.coalesce(total / func.nullif(count, 0), 0.0),
+        "evaluation_score": evaluation_score,
+        "rank_score": VOTE_WEIGHT * Solution.vote_lower_bound
+        + (1 - VOTE_WEIGHT) * normalized,
+        "score_version": criteria_version(),
+        "updated_at": Solution.updated_at,
+        "stats_updated_at": datetime.utcnow(),
+    }
+
+
+def rescore(batch_size: int = 1000, force: bool = False) -> dict:
+    """Recompute stored scores with set-based UPDATEs in primary-key chunks
+
+    Each chunk commits on its own, so row locks are held only briefly. Rows
+    already scored with the current criteria version are skipped unless
+    force is set. Returns the number of rows updated per table.
+    """
+    version = criteria_version()
+    updated = {}
+
+    for model, values in (
+        (Problem, problem_score_values),
+        (Solution, solution_score_values),
+    ):
+        max_id = db.session.scalar(select(func.max(model.id))) or 0
+        updated[model.__tablename__] = 0
+
+        for low in range(0, max_id, batch_size):
+            statement = update(model).where(
+                model.id > low, model.id <= low + batch_size
+            )
+            if not force:
+                statement = statement.where(
+                    or_(model.score_version.is_(None), model.score_version != version)
+                )
+            result = db.session.execute(
+                statement.values(**values()).execution_options(
+                    synchronize_session=False
+                )
+            )
+            db.session.commit()
+            updated[model.__tablename__] += result.rowcount
+
+    return updated
+
+
+class SolutionRanking:
+    """Keeps stored scores and rankings in step with votes and evaluations"""
+
+    @classmethod
+    def register(cls) -> None:
+        """Subscribe to the change feed (idempotent)"""
+        ChangeFeed.on_flush(cls.apply)
+
+    @staticmethod
+    def apply(session, changes) -> None:
+        """Re-rank problems touched by a flush"""
+        problem_ids: Set[int] = set()
+        solution_ids: Set[int] = set()
+        evaluated_problems: Set[int] = set()
+
+        for change in changes:
+            entity_type = change["entity_type"]
+            if entity_type == "solution" and change["action"] == "created":
+                problem_ids.add(change["payload"]["problem_id"])
+            elif entity_type == "vote":
+                solution_ids.add(change["entity_id"])
+            elif entity_type == "solution_evaluation":
+                solution_ids.add(change["payload"]["solution_id"])
+            elif entity_type == "problem_evaluation":
+                evaluated_problems.add(change["payload"]["problem_id"])
+
+        connection = session.connection()
+        if solution_ids:
+            problem_ids.update(
+                connection.execute(
+                    select(Solution.problem_id).where(Solution.id.in_(solution_ids))
+                ).scalars()
+            )
+        problem_ids.discard(None)
+        rank_problems(connection, problem_ids)
+
+        if evaluated_problems:
+            connection.execute(
+                update(Problem)
+                .where(Problem.id.in_(evaluated_problems))
+                .values(**problem_score_values())
+            )
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> int:
+        """Recompute every problem's rankings in primary-key chunks"""
+        total = 0
+        last_id = 0
+        while True:
+            problem_ids = db.session.scalars(
+                select(Problem.id)
+                .where(Problem.id > last_id)
+                .order_by(Problem.id)
+                .limit(batch_size)
+            ).all()
+            if not problem_ids:
+                return total
+            total += rank_problems(db.session.connection(), problem_ids)
+            db.session.commit()
+            last_id = problem_ids[-1]
@@ -0,0 +1,262 @@
+"""
+Token-bucket rate limiting for the REST API
+
+Each client gets a bucket holding up to ``API_RATE_LIMIT`` tokens that refills
+continuously over ``API_RATE_LIMIT_WINDOW`` seconds; every request spends one
+token. Bucket state lives in a pluggable storage backend selected by
+``API_RATE_LIMIT_STORAGE``:
+
+* ``memory`` - per-process dict; fine for a single worker and for tests.
+* ``sqlite:///path/to/file.db`` - a shared SQLite file updated under
+  ``BEGIN IMMEDIATE``, so every gunicorn worker on the host sees the same
+  buckets.
+* ``redis://host:port/db`` - atomic Lua script on a Redis server, for limits
+  shared across hosts. Falls back to ``memory`` when the ``redis`` package is
+  not installed.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Tuple
+
+from flask import current_app, g, request
+from flask_login import current_user
+
+RateLimitResult = namedtuple(
+    "RateLimitResult", ["allowed", "limit", "remaining", "reset", "retry_after"]
+)
+
+# Buckets untouched for this many windows are dropped from storage
+_PRUNE_AFTER_WINDOWS = 2
+_PRUNE_EVERY = 1000
+
+
+def _refill(
+    tokens: float, updated: float, now: float, capacity: float, rate: float
+) -> float:
+    """Return the token count after refilling from updated to now"""
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryStorage:
+    """In-process bucket storage (not shared between workers)"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def consume(
+        self, key: str, capacity: float, rate: float, now: float, cost: float = 1
+    ) -> Tuple[bool, float]:
+        """Spend cost tokens from key's bucket; return (allowed, tokens left)"""
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+
+            self._calls += 1
+            if self._calls % _PRUNE_EVERY == 0:
+                horizon = now - _PRUNE_AFTER_WINDOWS * capacity / rate
+                for stale in [k for k, v in self._buckets.items() if v[1] < horizon]:
+                    del self._buckets[stale]
+
+            return allowed, tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteStorage:
+    """Bucket storage in a SQLite file shared by all workers on a host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            self._local.connection = connection
+        return connection
+
+    def consume(
+        self, key: str, capacity: float, rate: float, now: float, cost: float = 1
+    ) -> Tuple[bool, float]:
+        """Spend cost tokens from key's bucket; return (allowed, tokens left)"""
+        connection = self._connect()
+        # IMMEDIATE takes the write lock up front so the read-modify-write
+        # below cannot interleave with another worker's
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            connection.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                "updated = excluded.updated",
+                (key, tokens, now),
+            )
+
+            self._calls += 1
+            if self._calls % _PRUNE_EVERY == 0:
+                connection.execute(
+                    "DELETE FROM rate_limit_buckets WHERE updated < ?",
+                    (now - _PRUNE_AFTER_WINDOWS * capacity / rate,),
+                )
+
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        return allowed, tokens
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit_buckets")
+
+
+class RedisStorage:
+    """Bucket storage on a Redis server, updated atomically with a Lua script"""
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(
+        self, key: str, capacity: float, rate: float, now: float, cost: float = 1
+    ) -> Tuple[bool, float]:
+        """Spend cost tokens from key's bucket; return (allowed, tokens left)"""
+        allowed, tokens = self._script(
+            keys=[self.prefix + key], args=[capacity, rate, now, cost]
+        )
+        return bool(allowed), float(tokens)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+
+def create_storage(url: str):
+    """Build a storage backend from an API_RATE_LIMIT_STORAGE URL"""
+    if not url or url in ("memory", "memory://"):
+        return MemoryStorage()
+
+    if url.startswith("sqlite:///"):
+        return SQLiteStorage(url[len("sqlite:///") :] or ":memory:")
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            return RedisStorage(url)
+        except ImportError:
+            current_app.logger.warning(
+                "redis package not installed; API rate limits fall back to "
+                "per-process memory storage"
+            )
+            return MemoryStorage()
+
+    raise ValueError(f"Unsupported rate limit storage: {url}")
+
+
+class RateLimiter:
+    """Token-bucket limiter allowing limit requests per window seconds"""
+
+    def __init__(self, storage, limit: int, window: int):
+        self.storage = storage
+        self.limit = limit
+        self.window = window
+        self.rate = limit / float(window)
+
+    def hit(self, key: str, cost: float = 1, now: float = None) -> RateLimitResult:
+        """Record a request for key and report whether it is allowed"""
+        now = time.time() if now is None else now
+        allowed, tokens = self.storage.consume(key, self.limit, self.rate, now, cost)
+
+        retry_after = 0 if allowed else math.ceil((cost - tokens) / self.rate)
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=max(0, int(tokens)),
+            reset=math.ceil((self.limit - tokens) / self.rate),
+            retry_after=retry_after,
+        )
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the API rate limiter bound to the current application"""
+    limiter = current_app.extensions.get("rate_limiter")
+    if limiter is None:
+        limiter = RateLimiter(
+            create_storage(current_app.config.get("API_RATE_LIMIT_STORAGE", "memory")),
+            limit=current_app.config.get("API_RATE_LIMIT", 100),
+            window=current_app.config.get("API_RATE_LIMIT_WINDOW", 60),
+        )
+        current_app.extensions["rate_limiter"] = limiter
+    return limiter
+
+
+def client_key() -> str:
+    """Identify the API client: its token, the signed-in user, else the address"""
+    if current_user.is_authenticated:
+        token_id = g.get("api_token_id")
+        if token_id is not None:
+            return f"token:{token_id}"
+        return f"user:{current_user.id}"
+    return f"ip:{request.remote_addr or 'unknown'}"
+
+
+def rate_limit_headers(result: RateLimitResult) -> dict:
+    """X-RateLimit-* (and Retry-After when throttled) response headers"""
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(result.reset),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(result.retry_after)
+    return headers
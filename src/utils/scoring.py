@@ -0,0 +1,90 @@
+"""
+Evaluation criteria: configurable, versioned weights for evaluation scores
+
+Organizations tune how ratings combine through ``EVALUATION_CRITERIA``::
+
+    EVALUATION_CRITERIA = {
+        "version": 2,
+        "problem": {"severity_rating": 0.6, "impact_rating": 0.4},
+        "solution": {
+            "feasibility_rating": 0.5,
+            "creativity_rating": 0.2,
+            "completeness_rating": 0.3,
+        },
+    }
+
+Set it in the config class or as JSON in the ``EVALUATION_CRITERIA``
+environment variable. Weights are normalized to sum to 1, so overall scores
+stay on the rating scale. Bump ``version`` whenever the weights change:
+stored scores record the version they were computed with (``score_version``),
+and ``flask rescore`` brings stale rows up to date.
+"""
+
+from typing import Any, Dict
+
+from flask import current_app, has_app_context
+
+RATING_MIN = 1
+RATING_MAX = 5
+
+DEFAULT_CRITERIA = {
+    "version": 1,
+    "problem": {"severity_rating": 0.5, "impact_rating": 0.5},
+    "solution": {
+        "feasibility_rating": 0.4,
+        "creativity_rating": 0.3,
+        "completeness_rating": 0.3,
+    },
+}
+
+CRITERIA_COLUMNS = {
+    "problem": {"severity_rating", "impact_rating"},
+    "solution": {"feasibility_rating", "creativity_rating", "completeness_rating"},
+}
+
+
+def validate_criteria(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """Check a criteria mapping, raising ValueError if it is unusable"""
+    if not isinstance(criteria.get("version"), int):
+        raise ValueError("Evaluation criteria need an integer version")
+
+    for kind, columns in CRITERIA_COLUMNS.items():
+        weights = criteria.get(kind)
+        if not weights:
+            raise ValueError(f"No {kind} evaluation criteria configured")
+        unknown = set(weights) - columns
+        if unknown:
+            raise ValueError(f"Unknown {kind} criteria: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in weights.values()) or not sum(
+            weights.values()
+        ):
+            raise ValueError(f"{kind} criteria weights must be positive")
+
+    return criteria
+
+
+def get_criteria() -> Dict[str, Any]:
+    """Configured criteria, or the defaults outside an application"""
+    if has_app_context():
+        return current_app.config.get("EVALUATION_CRITERIA") or DEFAULT_CRITERIA
+    return DEFAULT_CRITERIA
+
+
+def criteria_version() -> int:
+    """Version of the configured criteria"""
+    return get_criteria()["version"]
+
+
+def criteria_weights(kind: str) -> Dict[str, float]:
+    """Normalized rating column -> weight mapping for problem or solution"""
+    weights = get_criteria()[kind]
+    total = sum(weights.values())
+    return {column: weight / total for column, weight in weights.items()}
+
+
+def weighted_rating(evaluation_model, kind: str):
+    """SQL expression for an evaluation row's overall score"""
+    return sum(
+        getattr(evaluation_model, column) * weight
+        for column, weight in criteria_weights(kind).items()
+    )
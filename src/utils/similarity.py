@@ -0,0 +1,276 @@
+"""
+Related problems: top-k TF-IDF neighbours, precomputed in a batch job
+
+``build_similarity`` turns every problem's title and description into a
+TF-IDF vector (sublinear term frequency, smoothed IDF, titles counted
+``TITLE_WEIGHT`` times) and stores each problem's ``TOP_K`` most similar
+problems by cosine similarity in ``problem_similarity``. The detail page
+then reads a handful of rows.
+
+Vectors are rows of a dense float32 matrix over the ``MAX_FEATURES`` most
+widespread terms seen in at least two problems (only shared terms add to a
+dot product; row norms still count every term), i.e. 8 KB per problem.
+Similarities are computed ``BLOCK_SIZE`` rows at a time as one matrix
+product, and ``argpartition`` picks each row's neighbours.
+
+Runs are incremental: problems named in the change feed since the last run
+(cursor in ``job_state``) get fresh neighbour lists, and are offered to
+every other problem's list. Scores elsewhere aren't re-weighted as the IDF
+drifts, and a problem that stops being similar can leave another list one
+short; ``flask build-similarity --full`` recomputes everything.
+"""
+
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import delete, insert, or_, select
+
+from ..extensions import db
+from ..models.job_state import JobState
+from ..models.problem import Problem
+from ..models.similarity import ProblemSimilarity
+from .change_feed import ChangeFeed
+
+JOB_NAME = "problem_similarity"
+
+TOP_K = 5
+MIN_SCORE = 0.1
+TITLE_WEIGHT = 2
+MAX_FEATURES = 2048
+BLOCK_SIZE = 256
+
+_WORD = re.compile(r"[^\W\d_]{2,}")
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be been but by can do does for from had has have how i
+    if in into is it its me my no not of on or our so that the their them then
+    there these they this to too up us was we were what when where which who
+    will with would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of two or more letters, minus stop words"""
+    return [
+        word for word in _WORD.findall(text.casefold()) if word not in STOP_WORDS
+    ]
+
+
+def tfidf_matrix(documents: List[Tuple[str, str]]) -> np.ndarray:
+    """L2-normalized TF-IDF rows for (title, description) pairs"""
+    rows, columns, counts = [], [], []
+    vocabulary: Dict[str, int] = {}
+    for row, (title, description) in enumerate(documents):
+        terms = Counter(tokenize(description or ""))
+        for term in tokenize(title or ""):
+            terms[term] += TITLE_WEIGHT
+        for term, count in terms.items():
+            rows.append(row)
+            columns.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+
+    n = len(documents)
+    rows = np.array(rows, dtype=np.int64)
+    columns = np.array(columns, dtype=np.int64)
+    document_frequency = np.bincount(columns, minlength=len(vocabulary))
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(np.array(counts, dtype=np.float64))) * idf[columns]
+    norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=n))
+
+    shared = np.flatnonzero(document_frequency >= 2)
+    features = shared[
+        np.argsort(-document_frequency[shared], kind="stable")[:MAX_FEATURES]
+    ]
+    feature_of = np.full(len(vocabulary), -1, dtype=np.int64)
+    feature_of[features] = np.arange(len(features))
+
+    kept = feature_of[columns] >= 0
+    matrix = np.zeros((n, len(features)), dtype=np.float32)
+    matrix[rows[kept], feature_of[columns[kept]]] = (
+        weights[kept] / norms[rows[kept]]
+    )
+    return matrix
+
+
+def similarity_blocks(matrix: np.ndarray, positions: np.ndarray):
+    """Yield (positions, cosine block) for the given rows, BLOCK_SIZE at a time
+
+    Each block holds the rows' similarity to every problem, with a row's
+    similarity to itself set to -1.
+    """
+    for start in range(0, len(positions), BLOCK_SIZE):
+        block = positions[start : start + BLOCK_SIZE]
+        scores = matrix[block] @ matrix.T
+        scores[np.arange(len(block)), block] = -1
+        yield block, scores
+
+
+def top_k(scores: np.ndarray, k: int = TOP_K) -> Tuple[np.ndarray, np.ndarray]:
+    """(columns, scores) of each row's k best scores, best first"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((len(scores), 0))
+        return empty.astype(np.int64), empty
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(best, order, axis=1),
+        np.take_along_axis(best_scores, order, axis=1),
+    )
+
+
+def _load_documents():
+    rows = db.session.execute(
+        select(Problem.id, Problem.title, Problem.description).order_by(Problem.id)
+    ).all()
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    return ids, tfidf_matrix([(row.title, row.description) for row in rows])
+
+
+def _neighbour_rows(ids, positions, matrix, now) -> Iterable[dict]:
+    for block, scores in similarity_blocks(matrix, positions):
+        columns, best = top_k(scores)
+        for row, position in enumerate(block):
+            for column, score in zip(columns[row], best[row]):
+                if score >= MIN_SCORE:
+                    yield {
+                        "problem_id": int(ids[position]),
+                        "similar_id": int(ids[column]),
+                        "score": float(score),
+                        "computed_at": now,
+                    }
+
+
+def _insert(rows: Iterable[dict], batch_size: int = 1000) -> int:
+    table = ProblemSimilarity.__table__
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(table), batch)
+        total += len(batch)
+    return total
+
+
+def _offer(ids, positions, matrix, now) -> Tuple[set, List[dict]]:
+    """Merge changed problems into the other problems' stored lists
+
+    Returns the problems whose lists changed and their new rows.
+    """
+    changed_ids = {int(ids[position]) for position in positions}
+    candidates: Dict[int, Dict[int, float]] = {}
+    for block, scores in similarity_blocks(matrix, positions):
+        rows, columns = np.nonzero(scores >= MIN_SCORE)
+        for row, column in zip(rows, columns):
+            problem_id = int(ids[column])
+            if problem_id not in changed_ids:
+                candidates.setdefault(problem_id, {})[int(ids[block[row]])] = float(
+                    scores[row, column]
+                )
+
+    table = ProblemSimilarity.__table__
+    for problem_id, similar_id, score in db.session.execute(
+        select(table.c.problem_id, table.c.similar_id, table.c.score).where(
+            table.c.problem_id.in_(candidates)
+        )
+    ):
+        # Stored scores of changed problems are superseded by the fresh ones
+        if similar_id not in changed_ids:
+            candidates[problem_id][similar_id] = score
+
+    updated = set()
+    rows = []
+    for problem_id, scores in candidates.items():
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:TOP_K]
+        if any(similar_id in changed_ids for similar_id, _ in best):
+            updated.add(problem_id)
+            rows.extend(
+                {
+                    "problem_id": problem_id,
+                    "similar_id": similar_id,
+                    "score": score,
+                    "computed_at": now,
+                }
+                for similar_id, score in best
+            )
+    return updated, rows
+
+
+def build_similarity(full: bool = False) -> int:
+    """Refresh stored neighbour lists; returns the number of problems updated
+
+    The first run, and any run with full, recomputes every list. The lists
+    and the feed cursor commit together.
+    """
+    config = current_app.config
+    state = JobState.load(JOB_NAME)
+    full = full or not state.cursor
+
+    changed = set()
+    has_more = True
+    while has_more:
+        rows, has_more = ChangeFeed.read(
+            state.cursor,
+            config.get("CHANGE_FEED_PAGE_SIZE", 500),
+            ("problem",),
+        )
+        if not rows:
+            break
+        changed.update(row.entity_id for row in rows)
+        state.cursor = rows[-1].id
+
+    if not full and not changed:
+        db.session.commit()
+        return 0
+
+    ids, matrix = _load_documents()
+    now = datetime.utcnow()
+    table = ProblemSimilarity.__table__
+
+    if full:
+        db.session.execute(delete(table))
+        _insert(_neighbour_rows(ids, np.arange(len(ids)), matrix, now))
+        db.session.commit()
+        return len(ids)
+
+    # Deleted problems just drop out; the rest are recomputed and offered
+    positions = np.flatnonzero(np.isin(ids, list(changed)))
+    db.session.execute(
+        delete(table).where(
+            or_(table.c.problem_id.in_(changed), table.c.similar_id.in_(changed))
+        )
+    )
+    _insert(_neighbour_rows(ids, positions, matrix, now))
+    updated, rows = _offer(ids, positions, matrix, now)
+    if updated:
+        db.session.execute(delete(table).where(table.c.problem_id.in_(updated)))
+        _insert(rows)
+    db.session.commit()
+    return len(positions) + len(updated)
+
+
+def related_problems(problem_id: int, limit: int = TOP_K):
+    """Stored neighbours of a problem with their titles, most similar first"""
+    return db.session.execute(
+        select(
+            Problem.id,
+            Problem.title,
+            Problem.status,
+            Problem.solution_count,
+            ProblemSimilarity.score,
+        )
+        .join(ProblemSimilarity, ProblemSimilarity.similar_id == Problem.id)
+        .where(ProblemSimilarity.problem_id == problem_id)
+        .order_by(ProblemSimilarity.score.desc())
+        .limit(limit)
+    ).all()
@@ -0,0 +1,203 @@
+"""
+Autocomplete: a per-worker prefix index over problem titles, tags and departments
+
+``/api/v1/suggest`` answers type-ahead lookups from memory instead of a
+``LIKE 'q%'`` query per keystroke. A ``SuggestSnapshot`` keeps each kind of
+suggestion as sorted parallel arrays of normalized keys and values, so a
+lookup is a ``bisect`` to the first key with the prefix plus a short scan.
+Titles are indexed from every word onwards, so "print" finds
+"Broken printer in lobby".
+
+Snapshots are immutable and swapped in by ``SuggestIndex`` (a
+``FeedIndex``) at most every ``SUGGEST_REFRESH_SECONDS``. Catching up
+reloads only the problems named in new change feed entries and merges them
+into copies of the arrays; tag and department edits bump their problem, so
+they arrive the same way.
+"""
+
+import re
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.supporting import Tag, ProblemTag, ProblemDepartment
+from .change_feed import FeedIndex
+
+WORD = re.compile(r"\w+")
+# Later title words aren't indexed; type-ahead queries are short
+MAX_TITLE_WORDS = 12
+
+# problem id -> (title, tag names, department names)
+ProblemEntry = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+
+def normalize(text: str) -> str:
+    """Case-folded words separated by single spaces"""
+    return " ".join(WORD.findall(text.casefold()))
+
+
+def title_keys(title: str) -> List[str]:
+    """Index keys of a title: its normalized text from each word onwards"""
+    words = WORD.findall(title.casefold())[:MAX_TITLE_WORDS]
+    return [" ".join(words[start:]) for start in range(len(words))]
+
+
+def _scan(keys: List[str], values: list, prefix: str, limit: int) -> list:
+    """Distinct values of the keys starting with prefix, in key order"""
+    found = []
+    seen = set()
+    index = bisect_left(keys, prefix)
+    while index < len(keys) and len(found) < limit:
+        if not keys[index].startswith(prefix):
+            break
+        if values[index] not in seen:
+            seen.add(values[index])
+            found.append(values[index])
+        index += 1
+    return found
+
+
+def _name_arrays(names: Iterable[str]) -> Tuple[List[str], List[str]]:
+    entries = sorted((normalize(name), name) for name in set(names))
+    return [key for key, _ in entries], [name for _, name in entries]
+
+
+class SuggestSnapshot:
+    """Immutable sorted-array prefix index; safe to share between threads"""
+
+    def __init__(
+        self,
+        problems: Dict[int, ProblemEntry],
+        cursor: int,
+        titles: Optional[Tuple[List[str], List[int]]] = None,
+    ):
+        self.problems = problems
+        self.cursor = cursor
+
+        if titles is None:
+            entries = sorted(
+                (key, problem_id)
+                for problem_id, (title, _, _) in problems.items()
+                for key in title_keys(title)
+            )
+            titles = [key for key, _ in entries], [pid for _, pid in entries]
+        self.title_keys, self.title_ids = titles
+
+        # Tag and department vocabularies are small enough to rebuild each time
+        self.tag_keys, self.tags = _name_arrays(
+            name for _, tags, _ in problems.values() for name in tags
+        )
+        self.department_keys, self.departments = _name_arrays(
+            name for _, _, departments in problems.values() for name in departments
+        )
+
+    def apply(
+        self, changed: Dict[int, Optional[ProblemEntry]], cursor: int
+    ) -> "SuggestSnapshot":
+        """New snapshot with changed problems replaced (None removes them)"""
+        problems = dict(self.problems)
+        for problem_id, entry in changed.items():
+            if entry is None:
+                problems.pop(problem_id, None)
+            else:
+                problems[problem_id] = entry
+
+        # Merge rather than re-sort: only the changed titles need sorting
+        kept = (
+            (key, problem_id)
+            for key, problem_id in zip(self.title_keys, self.title_ids)
+            if problem_id not in changed
+        )
+        added = sorted(
+            (key, problem_id)
+            for problem_id, entry in changed.items()
+            if entry is not None
+            for key in title_keys(entry[0])
+        )
+        entries = list(merge(kept, added))
+        titles = [key for key, _ in entries], [pid for _, pid in entries]
+        return SuggestSnapshot(problems, cursor, titles)
+
+    def lookup(self, query: str, limit: int = 10) -> Dict[str, List[dict]]:
+        """Suggestions per kind for a typed prefix"""
+        prefix = normalize(query)
+        if not prefix:
+            return {"problems": [], "tags": [], "departments": []}
+
+        return {
+            "problems": [
+                {"id": problem_id, "title": self.problems[problem_id][0]}
+                for problem_id in _scan(
+                    self.title_keys, self.title_ids, prefix, limit
+                )
+            ],
+            "tags": [
+                {"name": name}
+                for name in _scan(self.tag_keys, self.tags, prefix, limit)
+            ],
+            "departments": [
+                {"name": name}
+                for name in _scan(
+                    self.department_keys, self.departments, prefix, limit
+                )
+            ],
+        }
+
+
+def load_problems(problem_ids: Optional[Iterable[int]] = None):
+    """Index entries for problem_ids (every problem when None), three queries"""
+    titles = select(Problem.id, Problem.title)
+    tags = select(ProblemTag.problem_id, Tag.name).join(
+        Tag, Tag.id == ProblemTag.tag_id
+    )
+    departments = select(ProblemDepartment.problem_id, ProblemDepartment.department)
+    if problem_ids is not None:
+        problem_ids = list(problem_ids)
+        titles = titles.where(Problem.id.in_(problem_ids))
+        tags = tags.where(ProblemTag.problem_id.in_(problem_ids))
+        departments = departments.where(
+            ProblemDepartment.problem_id.in_(problem_ids)
+        )
+
+    names: Dict[int, Tuple[list, list]] = {}
+    for problem_id, name in db.session.execute(tags):
+        names.setdefault(problem_id, ([], []))[0].append(name)
+    for problem_id, name in db.session.execute(departments):
+        names.setdefault(problem_id, ([], []))[1].append(name)
+
+    entries: Dict[int, ProblemEntry] = {}
+    for problem_id, title in db.session.execute(titles):
+        tag_names, department_names = names.get(problem_id, ([], []))
+        entries[problem_id] = (title, tuple(tag_names), tuple(department_names))
+    return entries
+
+
+class SuggestIndex(FeedIndex):
+    """Autocomplete snapshots, caught up with problem changes"""
+
+    entity_types = ("problem",)
+
+    def build(self, cursor: int) -> SuggestSnapshot:
+        return SuggestSnapshot(load_problems(), cursor)
+
+    def update(self, snapshot: SuggestSnapshot, entity_ids, cursor: int):
+        loaded = load_problems(entity_ids)
+        return snapshot.apply(
+            {problem_id: loaded.get(problem_id) for problem_id in entity_ids}, cursor
+        )
+
+
+def get_suggest_index() -> SuggestIndex:
+    """Return the autocomplete index bound to the current application"""
+    index = current_app.extensions.get("suggest_index")
+    if index is None:
+        index = SuggestIndex(
+            refresh_seconds=current_app.config.get("SUGGEST_REFRESH_SECONDS", 5),
+        )
+        current_app.extensions["suggest_index"] = index
+    return index
@@ -0,0 +1,170 @@
+"""
+Problem tags and departments: relation tables with JSON read caches
+
+``ProblemTag`` and ``ProblemDepartment`` are the source of truth. Tag and
+department filters (and facet counts) are joins on their indexes, which
+JSON containment can't offer portably. ``Problem.tags`` and
+``Problem.affected_departments`` remain as denormalized copies so detail
+pages and the API can show them without a join; change them only through
+``set_problem_tags`` / ``set_problem_departments``, which write both.
+``flask backfill-taxonomy`` builds relation rows for older problems.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only, selectinload
+
+from ..extensions import db
+from ..models.problem import Problem
+from ..models.supporting import Tag, ProblemTag, ProblemDepartment
+
+MAX_NAME_LENGTH = 100
+
+
+def parse_names(values: Iterable[str]) -> List[str]:
+    """Split comma separated form values into unique, trimmed names"""
+    names: Dict[str, str] = {}
+    for value in values:
+        for name in value.split(","):
+            name = name.strip()[:MAX_NAME_LENGTH]
+            if name and name.lower() not in names:
+                names[name.lower()] = name
+    return list(names.values())
+
+
+def get_or_create_tags(
+    names: Iterable[str], colors: Optional[Dict[str, str]] = None
+) -> Dict[str, Tag]:
+    """Tags by name, in the order given, adding the missing ones
+
+    Existing tags match case-insensitively. New tags take their color from
+    colors when given.
+    """
+    names = list(dict.fromkeys(names))
+    existing = {
+        tag.name.lower(): tag
+        for tag in db.session.scalars(
+            select(Tag).where(func.lower(Tag.name).in_([n.lower() for n in names]))
+        )
+    }
+    missing = {}
+    for name in names:
+        if name.lower() not in existing and name.lower() not in missing:
+            missing[name.lower()] = Tag(name=name, color=(colors or {}).get(name))
+    if missing:
+        db.session.add_all(missing.values())
+        db.session.flush()
+        existing.update(missing)
+    return {name: existing[name.lower()] for name in names}
+
+
+def set_problem_tags(problem: Problem, tags: Iterable[Tag]) -> None:
+    """Replace a problem's tags and refresh its JSON copy"""
+    tags = list(tags)
+    current = {link.tag_id: link for link in problem.tags_relation}
+    problem.tags_relation = [
+        current.get(tag.id) or ProblemTag(tag=tag) for tag in tags
+    ]
+    cache = [{"name": tag.name, "color": tag.color} for tag in tags]
+    if problem.tags != cache:
+        problem.tags = cache
+
+
+def set_problem_departments(problem: Problem, departments: Iterable[str]) -> None:
+    """Replace a problem's departments and refresh its JSON copy"""
+    departments = list(dict.fromkeys(departments))
+    current = {link.department: link for link in problem.departments_relation}
+    problem.departments_relation = [
+        current.get(name) or ProblemDepartment(department=name)
+        for name in departments
+    ]
+    if problem.affected_departments != departments:
+        problem.affected_departments = departments
+
+
+def join_tags(statement):
+    """Join a problem select (or query) to its tags"""
+    return statement.join(ProblemTag, ProblemTag.problem_id == Problem.id).join(
+        Tag, Tag.id == ProblemTag.tag_id
+    )
+
+
+def join_departments(statement):
+    """Join a problem select (or query) to its departments"""
+    return statement.join(
+        ProblemDepartment, ProblemDepartment.problem_id == Problem.id
+    )
+
+
+def filter_by_tag(statement, name: str):
+    """Restrict a problem select (or query) to problems tagged name"""
+    return join_tags(statement).where(Tag.name == name)
+
+
+def filter_by_department(statement, department: str):
+    """Restrict a problem select (or query) to problems affecting department"""
+    return join_departments(statement).where(
+        ProblemDepartment.department == department
+    )
+
+
+def _cached_tags(problem: Problem) -> Dict[str, Optional[str]]:
+    """Tag name -> color from the JSON cache (older rows hold bare names)"""
+    return {
+        tag["name"] if isinstance(tag, dict) else tag: (
+            tag.get("color") if isinstance(tag, dict) else None
+        )
+        for tag in problem.tags or []
+        if tag
+    }
+
+
+def backfill_taxonomy(batch_size: int = 500) -> int:
+    """Merge the JSON columns into the relation tables and resync the caches
+
+    Relation rows are never dropped: a problem ends up with the union of both
+    representations. Returns the number of problems processed.
+    """
+    total = 0
+    last_id = 0
+    while True:
+        problems = db.session.scalars(
+            select(Problem)
+            .options(
+                load_only(Problem.id, Problem.tags, Problem.affected_departments),
+                selectinload(Problem.tags_relation).joinedload(ProblemTag.tag),
+                selectinload(Problem.departments_relation),
+            )
+            .where(Problem.id > last_id)
+            .order_by(Problem.id)
+            .limit(batch_size)
+        ).all()
+        if not problems:
+            return total
+
+        names = {}
+        colors = {}
+        for problem in problems:
+            cached = _cached_tags(problem)
+            colors.update((name, color) for name, color in cached.items() if color)
+            names[problem.id] = parse_names(
+                [link.tag.name for link in problem.tags_relation] + list(cached)
+            )
+        tags = get_or_create_tags(
+            (name for group in names.values() for name in group), colors
+        )
+
+        for problem in problems:
+            set_problem_tags(problem, (tags[name] for name in names[problem.id]))
+            set_problem_departments(
+                problem,
+                parse_names(
+                    (problem.affected_departments or [])
+                    + [link.department for link in problem.departments_relation]
+                ),
+            )
+
+        db.session.commit()
+        total += len(problems)
+        last_id = problems[-1].id
@@ -0,0 +1,24 @@
+"""
+Text helpers shared by models and templates
+"""
+
+import re
+
+SUMMARY_LENGTH = 200
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def summarize(text: str, length: int = SUMMARY_LENGTH) -> str:
+    """Collapse whitespace and cut text at a word boundary for list snippets"""
+    if not text:
+        return ""
+
+    text = _WHITESPACE.sub(" ", text).strip()
+    if len(text) <= length:
+        return text
+
+    cut = text[: length - 3]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" .,;:") + "..."
@@ -0,0 +1,203 @@
+"""
+Trending ranking: time-decayed activity scores for problems
+
+Every event (creation, view, vote, new solution, evaluation) adds
+``weight * exp(-rate * age)`` to a problem's trending score. Rather than
+decaying all stored scores as time passes, scores are kept relative to a
+fixed epoch in log space::
+
+    trending_score = log(sum(weight * exp(rate * (event_time - EPOCH))))
+
+Scaling every score by the same ``exp(-rate * (now - EPOCH))`` does not change
+their order, so ``ORDER BY trending_score DESC`` ranks by decayed activity at
+any moment, straight off the index. New events fold in with a log-add-exp,
+so ``refresh_trending`` only touches problems with new activity. It consumes
+the change feed from a cursor persisted in ``job_state`` and picks up views
+from ``view_count - trending_view_count``; run it from cron like the other
+maintenance commands (``flask refresh-trending``).
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from flask import current_app
+from sqlalchemy import bindparam, select, update
+
+from ..extensions import db
+from ..models.job_state import JobState
+from ..models.problem import Problem
+from ..models.solution import Solution
+from .change_feed import ChangeFeed
+
+EPOCH = datetime(2024, 1, 1)
+JOB_NAME = "trending"
+
+DEFAULT_WEIGHTS = {
+    "created": 2.0,
+    "view": 1.0,
+    "vote": 3.0,
+    "solution": 5.0,
+    "evaluation": 4.0,
+}
+
+# change feed entity type -> (weight key, how to find the problem)
+FEED_EVENTS = {
+    "problem": ("created", "entity_id"),
+    "solution": ("solution", "problem_id"),
+    "problem_evaluation": ("evaluation", "problem_id"),
+    "solution_evaluation": ("evaluation", "solution_id"),
+    "vote": ("vote", "solution_id"),
+}
+
+
+def decay_rate(half_life_hours: float) -> float:
+    """Per-second decay rate for a half-life"""
+    return math.log(2) / (half_life_hours * 3600)
+
+
+def event_score(weight: float, at: datetime, rate: float) -> float:
+    """Log-space contribution of one event relative to EPOCH"""
+    return math.log(weight) + rate * (at - EPOCH).total_seconds()
+
+
+def log_sum_exp(scores: Iterable[float]) -> float:
+    """Numerically stable log(sum(exp(score)))"""
+    scores = list(scores)
+    peak = max(scores)
+    return peak + math.log(sum(math.exp(score - peak) for score in scores))
+
+
+def decayed_score(trending_score: float, rate: float, now: datetime = None) -> float:
+    """Convert a stored score into the plain decayed activity total at now"""
+    now = now or datetime.utcnow()
+    return math.exp(trending_score - rate * (now - EPOCH).total_seconds())
+
+
+def _feed_events(changes) -> Tuple[List[tuple], set]:
+    """Map change records to (weight key, id kind, id, time) events
+
+    Also returns the solution ids whose problem still needs looking up.
+    """
+    events = []
+    solution_ids = set()
+    for change in changes:
+        if change.action != "created" or change.entity_type not in FEED_EVENTS:
+            continue
+        kind, key = FEED_EVENTS[change.entity_type]
+        if key == "entity_id":
+            target = change.entity_id
+        else:
+            target = (change.payload or {}).get(key)
+        if target is None:
+            continue
+        if key == "solution_id":
+            solution_ids.add(target)
+        events.append((kind, key, target, change.created_at))
+    return events, solution_ids
+
+
+def trending_version():
+    """When scores last changed (for ETags of trending-ordered listings)"""
+    state = db.session.get(JobState, JOB_NAME)
+    return state.updated_at if state else None
+
+
+def refresh_trending(now: datetime = None) -> int:
+    """Fold activity since the last run into trending scores
+
+    Returns the number of problems whose score changed. The scores, the view
+    watermark and the feed cursor commit together, so an interrupted run is
+    simply repeated by the next one.
+    """
+    now = now or datetime.utcnow()
+    config = current_app.config
+    rate = decay_rate(config.get("TRENDING_HALF_LIFE_HOURS", 24))
+    weights = dict(DEFAULT_WEIGHTS, **config.get("TRENDING_WEIGHTS", {}))
+    page_size = config.get("CHANGE_FEED_PAGE_SIZE", 500)
+
+    state = JobState.load(JOB_NAME)
+    contributions: Dict[int, List[float]] = defaultdict(list)
+
+    # Feed events since the cursor
+    events, solution_ids = [], set()
+    has_more = True
+    while has_more:
+        rows, has_more = ChangeFeed.read(
+            state.cursor,
+            page_size,
+            FEED_EVENTS,
+        )
+        if not rows:
+            break
+        page_events, page_solutions = _feed_events(rows)
+        events.extend(page_events)
+        solution_ids |= page_solutions
+        state.cursor = rows[-1].id
+
+    solution_problems = {}
+    if solution_ids:
+        solution_problems = dict(
+            db.session.execute(
+                select(Solution.id, Solution.problem_id).where(
+                    Solution.id.in_(solution_ids)
+                )
+            ).all()
+        )
+    for kind, key, target, at in events:
+        problem_id = solution_problems.get(target) if key == "solution_id" else target
+        if problem_id is not None:
+            contributions[problem_id].append(event_score(weights[kind], at, rate))
+
+    # Views counted since the previous run, stamped with the run time
+    viewed = db.session.execute(
+        select(Problem.id, Problem.view_count, Problem.trending_view_count).where(
+            Problem.view_count > Problem.trending_view_count
+        )
+    ).all()
+    view_counts = {}
+    for problem_id, view_count, seen in viewed:
+        new_views = view_count - (seen or 0)
+        contributions[problem_id].append(
+            event_score(weights["view"] * new_views, now, rate)
+        )
+        view_counts[problem_id] = view_count
+
+    current = {
+        row.id: (row.trending_score, row.trending_view_count)
+        for row in db.session.execute(
+            select(
+                Problem.id, Problem.trending_score, Problem.trending_view_count
+            ).where(Problem.id.in_(contributions))
+        )
+    }
+    params = [
+        {
+            "b_id": problem_id,
+            "b_score": log_sum_exp(scores + [current[problem_id][0]]),
+            "b_views": view_counts.get(problem_id, current[problem_id][1]),
+        }
+        for problem_id, scores in contributions.items()
+        if problem_id in current  # skip problems deleted since the event
+    ]
+
+    if params:
+        # updated_at is kept: a ranking change is not a content change
+        table = Problem.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                trending_score=bindparam("b_score"),
+                trending_view_count=bindparam("b_views"),
+                updated_at=table.c.updated_at,
+            ),
+            params,
+        )
+        # Versions trending listings; onupdate alone misses view-only runs,
+        # which don't move the cursor. Wall clock, as now may be backdated.
+        state.updated_at = datetime.utcnow()
+
+    db.session.commit()
+    return len(params)
@@ -0,0 +1,179 @@
+"""
+Per-worker cache of lightweight user snapshots for Flask-Login
+
+``load_user`` returns a ``UserSnapshot`` built from cached columns instead of
+querying the users table on every request. Attributes outside the snapshot
+(relationships, ``get_display_name`` ...) transparently load the ORM ``User``
+on first access, and attribute writes are forwarded to it, so views that
+need the full object keep working unchanged.
+
+Cached entries are dropped when a flush touching a ``User`` commits. Other
+workers pick up the change within ``USER_CACHE_TTL`` seconds.
+"""
+
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import event
+
+from ..extensions import db
+from ..models.user import User
+from ..models.supporting import Notification
+from .anonymizer import Anonymizer
+from .cache import TTLCache
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "role",
+    "pseudonym_seed",
+    "pseudonym",
+    "visibility_preference",
+    "email_notifications",
+    "digest_frequency",
+    "notification_types",
+    "is_active",
+)
+
+_PENDING_KEY = "user_cache_invalidate"
+
+
+class UserSnapshot:
+    """Read-mostly stand-in for ``User`` that loads the ORM row lazily"""
+
+    __slots__ = SNAPSHOT_FIELDS + ("_user",)
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, **fields):
+        for name in SNAPSHOT_FIELDS:
+            object.__setattr__(self, name, fields.get(name))
+        object.__setattr__(self, "_user", None)
+
+    @staticmethod
+    def fields_from(user) -> Dict[str, Any]:
+        """Extract the cached columns from an ORM user"""
+        fields = {
+            name: getattr(user, name) for name in SNAPSHOT_FIELDS if name != "pseudonym"
+        }
+        fields["pseudonym"] = Anonymizer.get_user_pseudonym(user)
+        return fields
+
+    def get_user(self):
+        """Return the full ORM user, loading it on first use"""
+        user = object.__getattribute__(self, "_user")
+        if user is None:
+            user = db.session.get(User, self.id)
+            object.__setattr__(self, "_user", user)
+        return user
+
+    def get_id(self):
+        return str(self.id)
+
+    def get_pseudonym(self):
+        return self.pseudonym
+
+    def is_admin(self):
+        """Check if user has admin role"""
+        return self.role in ["admin", "moderator"]
+
+    def get_unread_notifications_count(self) -> int:
+        """Count unread notifications without loading the collection"""
+        return Notification.query.filter_by(user_id=self.id, is_read=False).count()
+
+    def __getattr__(self, name):
+        # Only reached for attributes outside the snapshot
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+
+    def __setattr__(self, name, value):
+        if name in SNAPSHOT_FIELDS:
+            object.__setattr__(self, name, value)
+        setattr(self.get_user(), name, value)
+
+    def __eq__(self, other):
+        if isinstance(other, (UserSnapshot, User)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((User, self.id))
+
+    def __repr__(self):
+        return f"<UserSnapshot {self.id}>"
+
+
+def get_user_cache() -> TTLCache:
+    """Return the user snapshot cache bound to the current application"""
+    cache = current_app.extensions.get("user_cache")
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get("USER_CACHE_SIZE", 4096),
+            ttl=current_app.config.get("USER_CACHE_TTL", 30),
+        )
+        current_app.extensions["user_cache"] = cache
+    return cache
+
+
+def _fetch_fields(user_id: int) -> Optional[Dict[str, Any]]:
+    user = db.session.get(User, user_id)
+    return UserSnapshot.fields_from(user) if user else None
+
+
+def load_user_snapshot(user_id: int) -> Optional[UserSnapshot]:
+    """Return a snapshot for user_id, querying the database only on a miss"""
+    fields = get_user_cache().get_or_set(user_id, lambda: _fetch_fields(user_id))
+    return UserSnapshot(**fields) if fields else None
+
+
+def invalidate_users(user_ids) -> None:
+    """Drop cached snapshots (and verified API tokens) for changed users"""
+    cache = current_app.extensions.get("user_cache")
+    if cache is not None:
+        for user_id in user_ids:
+            cache.delete(user_id)
+
+    # Token entries embed user state too; user changes are rare, so drop all
+    token_cache = current_app.extensions.get("api_token_cache")
+    if token_cache is not None:
+        token_cache.clear()
+
+
+class UserCacheInvalidator:
+    """Session hooks that invalidate cached users once their changes commit"""
+
+    @classmethod
+    def register(cls, session=None) -> None:
+        """Attach the session hooks (idempotent)"""
+        session = session or db.session
+        for name, handler in (
+            ("after_flush", cls._after_flush),
+            ("after_commit", cls._after_commit),
+            ("after_soft_rollback", cls._after_rollback),
+        ):
+            if not event.contains(session, name, handler):
+                event.listen(session, name, handler)
+
+    @staticmethod
+    def _after_flush(session, flush_context) -> None:
+        changed = {
+            obj.id
+            for obj in list(session.dirty) + list(session.deleted)
+            if isinstance(obj, User)
+        }
+        if changed:
+            session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+    @staticmethod
+    def _after_commit(session) -> None:
+        changed = session.info.pop(_PENDING_KEY, None)
+        if changed:
+            invalidate_users(changed)
+
+    @staticmethod
+    def _after_rollback(session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
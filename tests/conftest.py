@@ -3,15 +3,19 @@ Test configuration and fixtures for pytest
 """
 
 import os
+import sys
+
 import pytest
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
 # Test configuration
 TEST_CONFIG = {
     "TESTING": True,
     "WTF_CSRF_ENABLED": False,
     "SECRET_KEY": "test-secret-key",
-    "DATABASE_URI": "sqlite:///:memory:",
     "MAIL_DEFAULT_SENDER": "test@example.com",
     "GOOGLE_CLIENT_ID": "test-client-id",
     "GOOGLE_CLIENT_SECRET": "test-client-secret",
@@ -19,40 +23,33 @@ TEST_CONFIG = {
 }
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture
 def app():
-    """Create test application with testing configuration"""
-    from .. import create_app
-
-    # Override configuration for testing
-    original_config = {}
-    for key, value in TEST_CONFIG.items():
-        original_config[key] = os.environ.get(key)
-        if original_config[key] is None:
-            os.environ[key] = value
-
-    app = create_app("testing")
+    """Create test application with a fresh in-memory database"""
+    from src import create_app
+    from src.extensions import db
 
-    # Store original config to restore later
-    app.original_config = original_config
+    app = create_app("test")
+    app.config.update(TEST_CONFIG)
 
     with app.app_context():
         db.create_all()
         yield app
+        db.session.remove()
+        db.drop_all()
 
-    # Restore original config
-    for key, value in original_config.items():
-        if original_config[key] is not None:
-            os.environ[key] = original_config[key]
-        elif os.environ.get(key) is not None:
-            del os.environ[key]
+
+@pytest.fixture
+def client(app):
+    """Test client for the application"""
+    return app.test_client()
 
 
 @pytest.fixture
-def sample_user():
+def sample_user(app):
     """Create a sample user for testing"""
-    from ..models.user import User
-    from ..extensions import db
+    from src.models.user import User
+    from src.extensions import db
 
     user = User(
         email="test@example.com",
@@ -66,17 +63,14 @@ def sample_user():
     db.session.add(user)
     db.session.commit()
 
-    yield user
-
-    with app.app_context():
-        db.session.delete(user)
+    return user
 
 
 @pytest.fixture
 def sample_problem(sample_user):
     """Create a sample problem for testing"""
-    from ..models.problem import Problem
-    from ..extensions import db
+    from src.models.problem import Problem
+    from src.extensions import db
 
     problem = Problem(
         title="Test Problem",
@@ -92,69 +86,56 @@ def sample_problem(sample_user):
     db.session.add(problem)
     db.session.commit()
 
-    yield problem
-
-    with app.app_context():
-        db.session.delete(problem)
+    return problem
 
 
 @pytest.fixture
 def sample_solution(sample_user, sample_problem):
     """Create a sample solution for testing"""
-    from ..models.solution import Solution
-    from ..extensions import db
+    from src.models.solution import Solution
+    from src.extensions import db
 
     solution = Solution(
         problem_id=sample_problem.id,
         submitter=sample_user,
         content="This is a test solution for unit testing.",
         status="proposed",
-        visibility="identified",
         cost_estimate="1000",
         time_estimate="2 weeks",
-        required_resources="Development team, budget",
+        required_resources=["Development team", "Budget"],
     )
 
     db.session.add(solution)
     db.session.commit()
 
-    yield solution
-
-    with app.app_context():
-        db.session.delete(solution)
+    return solution
 
 
 @pytest.fixture
-def sample_evaluation(sample_user, sample_solution):
+def sample_evaluation(sample_user, sample_problem):
     """Create a sample evaluation for testing"""
-    from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
-    from ..extensions import db
+    from src.models.evaluation import ProblemEvaluation
+    from src.extensions import db
 
     evaluation = ProblemEvaluation(
         problem_id=sample_problem.id,
         evaluator=sample_user,
-        severity_score=4,
-        impact_score=4,
-        feasibility_score=3,
-        creativity_score=5,
-        completemess_score=4,
-        comments="Test evaluation with comprehensive scoring.",
+        severity_rating=4,
+        impact_rating=4,
+        comment="Test evaluation with comprehensive scoring.",
     )
 
     db.session.add(evaluation)
     db.session.commit()
 
-    yield evaluation
-
-    with app.app_context():
-        db.session.delete(evaluation)
+    return evaluation
 
 
 @pytest.fixture
 def sample_vote(sample_user, sample_solution):
     """Create a sample vote for testing"""
-    from ..models.vote import Vote
-    from ..extensions import db
+    from src.models.supporting import Vote
+    from src.extensions import db
 
     vote = Vote(
         user_id=sample_user.id,
@@ -165,17 +146,14 @@ def sample_vote(sample_user, sample_solution):
     db.session.add(vote)
     db.session.commit()
 
-    yield vote
-
-    with app.app_context():
-        db.session.delete(vote)
+    return vote
 
 
 @pytest.fixture
 def sample_notification(sample_user):
     """Create a sample notification for testing"""
-    from ..models.supporting import Notification
-    from ..extensions import db
+    from src.models.supporting import Notification
+    from src.extensions import db
 
     notification = Notification(
         user_id=sample_user.id,
@@ -190,7 +168,4 @@ def sample_notification(sample_user):
     db.session.add(notification)
     db.session.commit()
 
-    yield notification
-
-    with app.app_context():
-        db.session.delete(notification)
+    return notification
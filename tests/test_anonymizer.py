@@ -4,7 +4,7 @@ Test cases for anonymizer utility
 
 import pytest
 from datetime import datetime, timedelta
-from ..utils.anonymizer import Anonymizer
+from src.utils.anonymizer import Anonymizer
 
 
 class TestAnonymizer:
@@ -68,8 +68,8 @@ class TestAnonymizer:
 
     def test_get_display_name(self):
         """Test display name logic"""
-        from ..models.user import User
-        from ..utils.anonymizer import Anonymizer
+        from src.models.user import User
+        from src.utils.anonymizer import Anonymizer
 
         # Create mock users
         regular_user = User(id=1, name="Regular User")
@@ -4,13 +4,13 @@ Test cases for API endpoints
 
 import pytest
 import json
-from .. import create_app
+from src import create_app
 
 
 class TestAPI:
     """Test suite for REST API endpoints"""
 
-    def test_api_problems_endpoint(self, client):
+    def test_api_problems_endpoint(self, client, sample_solution):
         """Test problems API endpoints"""
         # Test getting all problems
         response = client.get("/api/v1/problems")
@@ -45,10 +45,10 @@ class TestAPI:
         for problem in problems:
             assert (
                 "test" in problem["title"].lower()
-                or "test" in problem["description"].lower()
+                or "test" in problem["summary"].lower()
             ), "Search should match"
 
-    def test_api_solutions_endpoint(self, client):
+    def test_api_solutions_endpoint(self, client, sample_solution):
         """Test solutions API endpoints"""
         # Test getting solutions for problem
         response = client.get("/api/v1/solutions?problem_id=1")
@@ -61,7 +61,8 @@ class TestAPI:
 
         for solution in solutions:
             assert "problem_id" in solution, "Solution should have problem_id"
-            assert solution["content"], "Solution should have content"
+            assert solution["summary"], "Solution should have a summary"
+            assert "content" not in solution, "Lists should omit full content"
 
     def test_api_evaluations_endpoint(self, client):
         """Test evaluations API endpoints"""
@@ -107,6 +108,114 @@ class TestAPI:
             if user["role"] == "admin":
                 assert "admin" in user["name"].lower(), "Search should find admin user"
 
+    def test_api_conditional_get(self, client, sample_solution):
+        """Test ETag and Last-Modified revalidation"""
+        response = client.get("/api/v1/problems/1")
+        assert response.status_code == 200, "Should return 200"
+        etag = response.headers.get("ETag")
+        assert etag, "Should include an ETag"
+        assert response.headers.get("Last-Modified"), "Should include Last-Modified"
+
+        response = client.get("/api/v1/problems/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304, "Unchanged resource should return 304"
+        assert not response.data, "304 response should have no body"
+
+        response = client.get("/api/v1/problems")
+        etag = response.headers.get("ETag")
+        response = client.get("/api/v1/problems", headers={"If-None-Match": etag})
+        assert response.status_code == 304, "Unchanged collection should return 304"
+
+        response = client.get(
+            "/api/v1/problems?severity=high", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200, "Different filters should not match"
+
+    def test_api_sparse_fieldsets(self, client, sample_solution):
+        """Test ?fields= and ?include= shaping and nested pagination"""
+        response = client.get("/api/v1/problems?fields=id,title&include=")
+        assert response.status_code == 200, "Should return 200"
+        for problem in response.get_json()["problems"]:
+            assert set(problem) == {"id", "title"}, "Should only return requested fields"
+
+        response = client.get("/api/v1/problems?fields=id,bogus")
+        assert response.status_code == 400, "Unknown fields should be rejected"
+
+        response = client.get(
+            "/api/v1/problems/1?include=solutions&solutions_per_page=1"
+        )
+        data = response.get_json()
+        assert "evaluations" not in data, "Excluded collections should be omitted"
+        assert len(data["solutions"]) <= 1, "Nested collection should be bounded"
+        assert data["pagination"]["solutions"]["per_page"] == 1, (
+            "Should report nested pagination"
+        )
+
+    def test_api_batch_endpoint(self, client):
+        """Test batched sub-requests and ?ids= lookups"""
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"op": "get", "entity": "problem", "id": 1},
+                    {"op": "get", "entity": "problem", "id": 999999},
+                    {"op": "vote", "solution_id": 1, "vote_type": "upvote"},
+                    {"op": "get", "entity": "problem", "id": [1]},
+                    {"op": "get", "entity": "solution", "id": {"id": 1}},
+                ]
+            },
+        )
+        assert response.status_code == 200, "Batch should return 200"
+        statuses = [result["status"] for result in response.get_json()["results"]]
+        assert statuses[1] == 404, "Missing entity should report 404"
+        assert statuses[2] == 401, "Anonymous writes should be rejected"
+        assert statuses[3:] == [400, 400], "Non-integer ids should report 400"
+
+        response = client.post("/api/v1/batch", json={"requests": "nope"})
+        assert response.status_code == 400, "Malformed batch should return 400"
+
+        response = client.get("/api/v1/problems?ids=1,2")
+        assert response.status_code == 200, "Should return 200"
+        ids = {problem["id"] for problem in response.get_json()["problems"]}
+        assert ids <= {1, 2}, "Should only return requested ids"
+
+    def test_api_batch_atomic(
+        self, client, sample_user, sample_solution, sample_notification
+    ):
+        """Test that a failed atomic batch leaves no writes behind"""
+        from src.extensions import db
+        from src.models.api_token import ApiToken
+        from src.models.supporting import Vote
+
+        token, raw_token = ApiToken.issue(sample_user, "batch", scopes=["write"])
+        db.session.add(token)
+        db.session.commit()
+
+        response = client.post(
+            "/api/v1/batch",
+            headers={"Authorization": f"Bearer {raw_token}"},
+            json={
+                "atomic": True,
+                "requests": [
+                    {
+                        "op": "vote",
+                        "solution_id": sample_solution.id,
+                        "vote_type": "upvote",
+                    },
+                    {"op": "mark_read", "notification_id": sample_notification.id},
+                    {"op": "vote", "solution_id": 999999, "vote_type": "upvote"},
+                ],
+            },
+        )
+        statuses = [result["status"] for result in response.get_json()["results"]]
+        assert statuses == [409, 409, 404], "Earlier writes should report rollback"
+
+        db.session.expire_all()
+        assert sample_solution.upvotes == 0, "Vote counter should be rolled back"
+        assert db.session.get(Vote, (sample_user.id, sample_solution.id)) is None, (
+            "Vote row should be rolled back"
+        )
+        assert not sample_notification.is_read, "Mark-read should be rolled back"
+
     def test_api_health_endpoint(self, client):
         """Test health check endpoint"""
         response = client.get("/api/v1/health")
@@ -9,7 +9,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from .. import create_app
+from src import create_app
 
 
 class TestBasicFunctionality:
@@ -31,6 +31,14 @@ class TestBasicFunctionality:
         assert response.status_code == 200, "Main page should be accessible"
         assert b"Problem Solver" in response.data, "Should contain platform name"
 
+    def test_index_logged_out(self, client, sample_solution):
+        """Test that the home page renders submitters for anonymous visitors"""
+        response = client.get("/")
+        assert response.status_code == 200, "Home page should render logged out"
+        assert sample_solution.submitter.name.encode() in response.data, (
+            "Should show identified submitters"
+        )
+
     def test_auth_required_redirect(self, client):
         """Test authentication requirements"""
         # Test accessing protected route without login
@@ -62,7 +70,7 @@ class TestBasicFunctionality:
             assert response.status_code == 302, "Should redirect after problem creation"
 
             # Check that problem was created
-            from ..models.problem import Problem
+            from src.models.problem import Problem
 
             problem = Problem.query.filter_by(title="Test Problem").first()
             assert problem is not None, "Problem should exist in database"
@@ -0,0 +1,49 @@
+"""
+Test cases for MinHash duplicate detection
+"""
+
+import numpy as np
+
+from src.utils.duplicates import (
+    NUM_PERM,
+    DuplicateSnapshot,
+    decode,
+    encode,
+    minhash,
+)
+
+PRINTER = "The printer on the third floor keeps jamming every morning"
+REWORDED = "The printer on the 3rd floor keeps jamming every single morning"
+COFFEE = "The coffee machine in the kitchen is leaking water again"
+
+
+class TestDuplicates:
+    """Test suite for signatures and LSH candidate lookup"""
+
+    def test_minhash(self):
+        """Test signatures estimate similarity and survive storage"""
+        signature = minhash(PRINTER)
+        assert signature.shape == (NUM_PERM,), "One value per permutation"
+        assert np.array_equal(signature, minhash(PRINTER.upper())), (
+            "Signatures should ignore case"
+        )
+        assert np.array_equal(decode(encode(signature)), signature)
+
+        similar = (signature == minhash(REWORDED)).mean()
+        different = (signature == minhash(COFFEE)).mean()
+        assert similar > 0.4 > different, "Rewording should stay close"
+
+    def test_snapshot(self):
+        """Test lookups find near duplicates and updates copy on write"""
+        snapshot = DuplicateSnapshot(
+            np.array([1, 2]), np.array([minhash(PRINTER), minhash(COFFEE)]), 0
+        )
+        matches = snapshot.similar(minhash(REWORDED), threshold=0.4, limit=5)
+        assert [problem_id for problem_id, _ in matches] == [1], (
+            "Only the printer problem should match"
+        )
+
+        updated = snapshot.apply({1: None, 3: minhash(REWORDED)}, cursor=4)
+        assert updated.similar(minhash(PRINTER), 0.4, 5)[0][0] == 3
+        assert len(snapshot.ids) == 2, "The old snapshot is unchanged"
+        assert DuplicateSnapshot.from_rows([], 0).similar(minhash(PRINTER), 0, 5) == []
@@ -0,0 +1,47 @@
+"""
+Test cases for evaluation analytics statistics
+"""
+
+import math
+
+import numpy as np
+
+from src.utils.evaluation_analytics import item_stats, krippendorff_alpha, rater_bias
+
+
+class TestEvaluationAnalytics:
+    """Test suite for per-item stats, agreement and rater bias"""
+
+    def test_item_stats(self):
+        """Test per-item means and sample variances"""
+        ids, counts, means, variances = item_stats(
+            np.array([7, 3, 7, 7]), np.array([1.0, 4.0, 2.0, 3.0])
+        )
+        assert ids.tolist() == [3, 7], "Items should come back sorted by id"
+        assert counts.tolist() == [1, 3], "Counts should match evaluations"
+        assert means[1] == 2.0, "Mean should average the item's scores"
+        assert variances[1] == 1.0, "Variance should be the sample variance"
+        assert math.isnan(variances[0]), "One evaluation has no variance"
+
+    def test_krippendorff_alpha(self):
+        """Test alpha is 1 for full agreement and near 0 for noise"""
+        items = np.repeat(np.arange(4), 2)
+        assert krippendorff_alpha(items, [1, 1, 2, 2, 4, 4, 5, 5]) == 1.0
+
+        rng = np.random.default_rng(0)
+        noise = rng.integers(1, 6, 2000)
+        alpha = krippendorff_alpha(np.repeat(np.arange(1000), 2), noise)
+        assert abs(alpha) < 0.1, "Random ratings should agree only by chance"
+
+    def test_rater_bias(self):
+        """Test a consistently harsh evaluator gets a large negative z-score"""
+        rng = np.random.default_rng(0)
+        items = np.repeat(np.arange(100), 3)
+        raters = np.tile(np.arange(3), 100)
+        scores = rng.normal(3, 1, 100)[items] + rng.normal(0, 0.3, 300)
+        scores[raters == 1] -= 1.0
+
+        ids, counts, bias, z_scores = rater_bias(items, raters, scores)
+        assert counts.tolist() == [100, 100, 100], "Every rating is shared"
+        assert bias[1] < -0.5, "Harsh evaluator should show negative bias"
+        assert z_scores[1] < -3 < z_scores[0], "Outlier should stand out"
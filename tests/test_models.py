@@ -3,15 +3,16 @@ Test cases for database models
 """
 
 import pytest
-from .. import create_app
+from src import create_app
+from src.extensions import db
 
 
 class TestModels:
     """Test database model functionality"""
 
-    def test_user_creation(self, app, sample_user):
+    def test_user_creation(self, app):
         """Test user creation and properties"""
-        from ..models.user import User
+        from src.models.user import User
 
         # Test that user can be created
         user = User(
@@ -41,153 +42,507 @@ class TestModels:
 
     def test_problem_creation(self, app, sample_user):
         """Test problem creation and relationships"""
-        from ..models.problem import Problem
-
-        with app.app_context():
-            problem = Problem(
-                title="Test Problem for Models",
-                description="This problem tests model relationships.",
-                severity="high",
-                status="open",
-                visibility="identified",
-                submitter_id=sample_user.id,
-            )
+        from src.models.problem import Problem
+
+        problem = Problem(
+            title="Test Problem for Models",
+            description="This problem tests model relationships.",
+            severity="high",
+            status="open",
+            visibility="identified",
+            submitter_id=sample_user.id,
+        )
 
-            db.session.add(problem)
-            db.session.commit()
+        db.session.add(problem)
+        db.session.commit()
 
-            # Test problem properties
-            assert problem.title == "Test Problem for Models", (
-                "Title should be preserved"
-            )
-            assert problem.description == "This problem tests model relationships.", (
-                "Description should be preserved"
-            )
-            assert problem.severity == "high", "Severity should be preserved"
-            assert problem.status == "open", "Status should be preserved"
-            assert problem.visibility == "identified", "Visibility should be preserved"
-            assert problem.submitter_id == sample_user.id, "Submitter ID should be set"
+        # Test problem properties
+        assert problem.title == "Test Problem for Models", (
+            "Title should be preserved"
+        )
+        assert problem.description == "This problem tests model relationships.", (
+            "Description should be preserved"
+        )
+        assert problem.severity == "high", "Severity should be preserved"
+        assert problem.status == "open", "Status should be preserved"
+        assert problem.visibility == "identified", "Visibility should be preserved"
+        assert problem.submitter_id == sample_user.id, "Submitter ID should be set"
 
-            # Test database query
-            retrieved = Problem.query.get(problem.id)
-            assert retrieved is not None, "Problem should be retrievable"
-            assert retrieved.title == problem.title, "Title should match"
+        # Test database query
+        retrieved = Problem.query.get(problem.id)
+        assert retrieved is not None, "Problem should be retrievable"
+        assert retrieved.title == problem.title, "Title should match"
 
     def test_solution_creation(self, app, sample_user, sample_problem):
         """Test solution creation and relationships"""
-        from ..models.solution import Solution
-
-        with app.app_context():
-            solution = Solution(
-                problem_id=sample_problem.id,
-                content="Test solution for Models",
-                status="proposed",
-                visibility="identified",
-                submitter_id=sample_user.id,
-                cost_estimate="500",
-                time_estimate="1 week",
-                required_resources="Test resources",
-            )
+        from src.models.solution import Solution
+
+        solution = Solution(
+            problem_id=sample_problem.id,
+            content="Test solution for Models",
+            status="proposed",
+            submitter_id=sample_user.id,
+            cost_estimate="500",
+            time_estimate="1 week",
+            required_resources=["Test resources"],
+        )
 
-            db.session.add(solution)
-            db.session.commit()
+        db.session.add(solution)
+        db.session.commit()
 
-            # Test solution properties
-            assert solution.problem_id == sample_problem.id, "Problem ID should be set"
-            assert solution.content == "Test solution for Models", (
-                "Content should be preserved"
-            )
-            assert solution.status == "proposed", "Status should be preserved"
-            assert solution.submitter_id == sample_user.id, "Submitter ID should be set"
-
-            # Test relationship
-            retrieved = Solution.query.get(solution.id)
-            assert retrieved is not None, "Solution should be retrievable"
-            assert retrieved.problem_id == sample_problem.id, (
-                "Problem relationship should work"
-            )
+        # Test solution properties
+        assert solution.problem_id == sample_problem.id, "Problem ID should be set"
+        assert solution.content == "Test solution for Models", (
+            "Content should be preserved"
+        )
+        assert solution.status == "proposed", "Status should be preserved"
+        assert solution.submitter_id == sample_user.id, "Submitter ID should be set"
+
+        # Test relationship
+        retrieved = Solution.query.get(solution.id)
+        assert retrieved is not None, "Solution should be retrievable"
+        assert retrieved.problem_id == sample_problem.id, (
+            "Problem relationship should work"
+        )
 
-    def test_evaluation_creation(self, app, sample_user, sample_solution):
+    def test_evaluation_creation(
+        self, app, sample_user, sample_problem, sample_solution
+    ):
         """Test evaluation creation and relationships"""
-        from ..models.evaluation import ProblemEvaluation, SolutionEvaluation
-
-        with app.app_context():
-            # Test problem evaluation
-            problem_eval = ProblemEvaluation(
-                problem_id=sample_problem.id,
-                evaluator_id=sample_user.id,
-                severity_score=5,
-                impact_score=4,
-                feasibility_score=3,
-                creativity_score=4,
-                completemess_score=5,
-                comments="Test evaluation for problem",
-            )
+        from src.models.evaluation import ProblemEvaluation, SolutionEvaluation
+
+        # Test problem evaluation
+        problem_eval = ProblemEvaluation(
+            problem_id=sample_problem.id,
+            evaluator_id=sample_user.id,
+            severity_rating=5,
+            impact_rating=4,
+            comment="Test evaluation for problem",
+        )
 
-            db.session.add(problem_eval)
-            db.session.commit()
+        db.session.add(problem_eval)
+        db.session.commit()
 
-            # Test solution evaluation
-            solution_eval = SolutionEvaluation(
-                solution_id=sample_solution.id,
-                evaluator_id=sample_user.id,
-                severity_score=4,
-                impact_score=4,
-                feasibility_score=3,
-                creativity_score=5,
-                completemess_score=4,
-                comments="Test evaluation for solution",
-            )
+        # Test solution evaluation
+        solution_eval = SolutionEvaluation(
+            solution_id=sample_solution.id,
+            evaluator_id=sample_user.id,
+            feasibility_rating=3,
+            creativity_rating=5,
+            completeness_rating=4,
+            comment="Test evaluation for solution",
+        )
 
-            db.session.add(solution_eval)
-            db.session.commit()
+        db.session.add(solution_eval)
+        db.session.commit()
 
-            # Test evaluation relationships
-            retrieved = ProblemEvaluation.query.get(problem_eval.id)
-            assert retrieved is not None, "Problem evaluation should be retrievable"
-            assert retrieved.evaluator_id == sample_user.id, "Evaluator ID should match"
-            assert retrieved.problem_id == sample_problem.id, "Problem ID should match"
+        # Test evaluation relationships
+        retrieved = ProblemEvaluation.query.get(problem_eval.id)
+        assert retrieved is not None, "Problem evaluation should be retrievable"
+        assert retrieved.evaluator_id == sample_user.id, "Evaluator ID should match"
+        assert retrieved.problem_id == sample_problem.id, "Problem ID should match"
 
     def test_vote_creation(self, app, sample_user, sample_solution):
         """Test vote creation and relationships"""
-        from ..models.vote import Vote
+        from src.models.supporting import Vote
 
-        with app.app_context():
-            vote = Vote(user_id=sample_user.id, solution_id=sample_solution.id, score=1)
+        vote = Vote(user_id=sample_user.id, solution_id=sample_solution.id, score=1)
 
-            db.session.add(vote)
-            db.session.commit()
+        db.session.add(vote)
+        db.session.commit()
 
-            # Test vote properties and relationships
-            retrieved = Vote.query.get(vote.id)
-            assert retrieved is not None, "Vote should be retrievable"
-            assert retrieved.user_id == sample_user.id, "User ID should match"
-            assert retrieved.solution_id == sample_solution.id, (
-                "Solution ID should match"
-            )
-            assert retrieved.score == 1, "Vote score should match"
+        # Test vote properties and relationships
+        retrieved = db.session.get(Vote, (sample_user.id, sample_solution.id))
+        assert retrieved is not None, "Vote should be retrievable"
+        assert retrieved.user_id == sample_user.id, "User ID should match"
+        assert retrieved.solution_id == sample_solution.id, (
+            "Solution ID should match"
+        )
+        assert retrieved.score == 1, "Vote score should match"
 
     def test_notification_creation(self, app, sample_user):
         """Test notification creation and relationships"""
-        from ..models.supporting import Notification
+        from src.models.supporting import Notification
+
+        notification = Notification(
+            user_id=sample_user.id,
+            event_type="test_event",
+            title="Test Notification",
+            message="Test notification for unit testing",
+            link="/test-link",
+            payload={"test": "data"},
+            is_read=False,
+        )
 
-        with app.app_context():
-            notification = Notification(
+        db.session.add(notification)
+        db.session.commit()
+
+        # Test notification properties
+        retrieved = Notification.query.get(notification.id)
+        assert retrieved is not None, "Notification should be retrievable"
+        assert retrieved.user_id == sample_user.id, "User ID should match"
+        assert retrieved.title == "Test Notification", "Title should match"
+        assert not retrieved.is_read, "Notification should be unread by default"
+
+    def test_api_token_issue(self, app, sample_user):
+        """Test API token issuing, hashing and scopes"""
+        from src.models.api_token import ApiToken
+
+        token, raw_token = ApiToken.issue(
+            sample_user, "ci", scopes=["write", "read"], expires_in_days=1
+        )
+
+        db.session.add(token)
+        db.session.commit()
+
+        assert raw_token.startswith(ApiToken.PREFIX), "Token should be prefixed"
+        assert token.token_hash == ApiToken.hash_token(raw_token), (
+            "Only the hash should be stored"
+        )
+        assert raw_token not in token.to_dict().values(), (
+            "Listings should never include the secret"
+        )
+        assert token.get_scopes() == {"read", "write"}, "Scopes should match"
+        assert token.is_valid(), "Fresh token should be valid"
+
+        with pytest.raises(ValueError):
+            ApiToken.issue(sample_user, "bad", scopes=["superuser"])
+
+    def test_user_snapshot(self, app, sample_user):
+        """Test cached user snapshots and lazy ORM fallback"""
+        from src.utils.user_cache import UserSnapshot, load_user_snapshot
+
+        snapshot = load_user_snapshot(sample_user.id)
+
+        assert isinstance(snapshot, UserSnapshot), "Loader should return a snapshot"
+        assert snapshot.role == sample_user.role, "Role should be cached"
+        assert snapshot == sample_user, "Snapshot should compare equal to its user"
+        assert snapshot.email_verified == sample_user.email_verified, (
+            "Uncached attributes should load from the ORM user"
+        )
+
+        sample_user.role = "moderator"
+        db.session.commit()
+
+        assert load_user_snapshot(sample_user.id).is_admin(), (
+            "Committed user changes should invalidate the cache"
+        )
+
+    def test_problem_summary(self, app, sample_user):
+        """Test that summaries track the description for list views"""
+        from src.models.problem import Problem
+        from src.utils.text import SUMMARY_LENGTH
+
+        problem = Problem(
+            title="Summary Problem",
+            description="word " * 200,
+            submitter=sample_user,
+        )
+
+        assert len(problem.summary) <= SUMMARY_LENGTH, "Summary should be bounded"
+        assert problem.summary.endswith("..."), "Long text should be elided"
+
+        problem.description = "Short   and\nsimple"
+        assert problem.summary == "Short and simple", (
+            "Summary should update with the description"
+        )
+
+    def test_problem_rows(self, app, sample_user, sample_problem):
+        """Test read-model rows mirror the list-view fields of the ORM model"""
+        from src.models.problem import Problem
+        from src.models.read_models import problem_rows_select, load_problem_rows
+
+        rows = load_problem_rows(
+            problem_rows_select().where(Problem.id == sample_problem.id)
+        )
+
+        assert len(rows) == 1, "Should return one row per problem"
+        row = rows[0]
+        assert row.title == sample_problem.title, "Row should carry the title"
+        assert row.get_vote_score() == sample_problem.get_vote_score(), (
+            "Row vote score should match the model"
+        )
+        assert row.submitter.id == sample_user.id, "Row should carry the submitter"
+        assert not hasattr(row, "__dict__"), "Rows should use __slots__"
+
+    def test_dashboard_cache(self, app, sample_user, sample_problem):
+        """Test dashboard stats and cache invalidation on the user's writes"""
+        from src.extensions import db
+        from src.utils.dashboard import load_dashboard, get_dashboard_cache
+
+        stats = load_dashboard(sample_user.id)["stats"]
+        assert stats["total_problems"] >= 1, "Should count the user's problems"
+        assert get_dashboard_cache().get(sample_user.id), "Should cache the bundle"
+
+        sample_problem.severity = "critical"
+        db.session.commit()
+        assert get_dashboard_cache().get(sample_user.id) is None, (
+            "Committing the user's own change should drop their dashboard"
+        )
+        stats = load_dashboard(sample_user.id)["stats"]
+        assert stats["high_severity_problems"] >= 1, "Should recount after changes"
+
+    def test_evaluation_queue(self, app, sample_user, sample_problem):
+        """Test the evaluation queue tracks evaluations incrementally"""
+        from src.extensions import db
+        from src.models.user import User
+        from src.models.evaluation import ProblemEvaluation
+        from src.utils.evaluation_queue import EvaluationQueue
+
+        reviewer = User(email="reviewer@example.com", name="Reviewer")
+        db.session.add(reviewer)
+        db.session.commit()
+
+        rows, _ = EvaluationQueue.for_user(reviewer.id, "problem", limit=100)
+        assert sample_problem.id in {row.item_id for row in rows}, (
+            "Open problems should be queued for other users"
+        )
+        rows, _ = EvaluationQueue.for_user(sample_user.id, "problem", limit=100)
+        assert sample_problem.id not in {row.item_id for row in rows}, (
+            "Users should not be asked to evaluate their own problems"
+        )
+
+        db.session.add(
+            ProblemEvaluation(
+                problem_id=sample_problem.id,
+                evaluator_id=reviewer.id,
+                severity_rating=3,
+                impact_rating=3,
+            )
+        )
+        db.session.commit()
+        rows, _ = EvaluationQueue.for_user(reviewer.id, "problem", limit=100)
+        assert sample_problem.id not in {row.item_id for row in rows}, (
+            "Evaluated problems should leave the evaluator's queue"
+        )
+
+    def test_trending_refresh(self, app, sample_user, sample_problem):
+        """Test views fold into the trending score without touching updated_at"""
+        from src.extensions import db
+        from src.models.problem import Problem
+        from src.utils.trending import refresh_trending, trending_version
+
+        refresh_trending()
+        problem = db.session.get(Problem, sample_problem.id)
+        score, updated_at = problem.trending_score, problem.updated_at
+        version = trending_version()
+
+        Problem.record_view(problem.id)
+        refresh_trending()
+        problem = db.session.get(Problem, sample_problem.id)
+        assert problem.trending_score > score, "Views should raise the score"
+        assert problem.updated_at == updated_at, "Views should not bump updated_at"
+        assert trending_version() != version, "View-only runs should re-version"
+        assert problem.trending_view_count == problem.view_count, (
+            "Folded views should be remembered"
+        )
+
+    def test_evaluation_timeline(self, app, sample_user, sample_solution):
+        """Test problem and solution evaluations page together, newest first"""
+        from datetime import datetime, timedelta
+        from src.extensions import db
+        from src.models.evaluation import ProblemEvaluation, SolutionEvaluation
+        from src.models.read_models import evaluation_timeline, parse_timeline_cursor
+
+        start = datetime(2025, 1, 1)
+        for day in range(3):
+            db.session.add(
+                ProblemEvaluation(
+                    problem_id=sample_solution.problem_id,
+                    evaluator_id=sample_user.id,
+                    severity_rating=3,
+                    impact_rating=4,
+                    created_at=start + timedelta(days=day),
+                )
+            )
+            db.session.add(
+                SolutionEvaluation(
+                    solution_id=sample_solution.id,
+                    evaluator_id=sample_user.id,
+                    feasibility_rating=4,
+                    creativity_rating=3,
+                    completeness_rating=5,
+                    created_at=start + timedelta(days=day),
+                )
+            )
+        db.session.commit()
+
+        seen, after = [], None
+        while True:
+            rows, cursor = evaluation_timeline(
+                evaluator_id=sample_user.id, limit=4, after=after
+            )
+            seen.extend(rows)
+            if not cursor:
+                break
+            after = parse_timeline_cursor(cursor)
+
+        keys = [(row.evaluation_type, row.id) for row in seen]
+        assert len(keys) == len(set(keys)) == 6, "Pages should not overlap"
+        dates = [row.created_at for row in seen]
+        assert dates == sorted(dates, reverse=True), "Should be newest first"
+        assert all(
+            row.problem_id == sample_solution.problem_id for row in seen
+        ), "Solution evaluations should carry their problem id"
+
+    def test_comment_threads(self, app, sample_user, sample_solution):
+        """Test replies get materialized paths and load with their thread"""
+        from src.extensions import db
+        from src.models.supporting import Comment
+        from src.utils.comment_threads import load_threads
+
+        root = Comment(
+            solution_id=sample_solution.id, user_id=sample_user.id, content="Root"
+        )
+        db.session.add(root)
+        db.session.flush()
+        reply = Comment(
+            solution_id=sample_solution.id,
+            user_id=sample_user.id,
+            content="Reply",
+            parent_id=root.id,
+        )
+        db.session.add(reply)
+        db.session.flush()
+        db.session.add(
+            Comment(
+                solution_id=sample_solution.id,
                 user_id=sample_user.id,
-                event_type="test_event",
-                title="Test Notification",
-                message="Test notification for unit testing",
-                link="/test-link",
-                payload={"test": "data"},
-                is_read=False,
+                content="Nested",
+                parent_id=reply.id,
             )
+        )
+        db.session.commit()
+
+        thread = load_threads(solution_id=sample_solution.id)
+        assert [c.content for c in thread] == ["Root", "Reply", "Nested"], (
+            "Replies should follow their parents depth-first"
+        )
+        assert [c.depth for c in thread] == [0, 1, 2], "Depth should be stored"
+        assert thread[2].path.startswith(thread[1].path), "Paths should nest"
+        assert thread[0].reply_count == 2, "Root should count all replies"
+
+    def test_counter_caches(self, app, sample_user, sample_solution):
+        """Test child counts follow inserts and deletes and reconcile"""
+        from src.extensions import db
+        from src.models.problem import Problem
+        from src.models.solution import Solution
+        from src.models.supporting import Comment
+        from src.utils.counters import CounterCache
+
+        comment = Comment(
+            solution_id=sample_solution.id, user_id=sample_user.id, content="Hi"
+        )
+        db.session.add(comment)
+        db.session.commit()
+
+        solution = db.session.get(Solution, sample_solution.id)
+        assert solution.comment_count == 1, "Insert should bump the counter"
+        assert solution.stats_updated_at is not None, (
+            "Counter changes should be versioned"
+        )
+        assert solution.problem.solution_count >= 1, "Problem counts solutions"
 
-            db.session.add(notification)
-            db.session.commit()
+        db.session.delete(comment)
+        db.session.commit()
+        assert db.session.get(Solution, solution.id).comment_count == 0, (
+            "Delete should lower the counter"
+        )
 
-            # Test notification properties
-            retrieved = Notification.query.get(notification.id)
-            assert retrieved is not None, "Notification should be retrievable"
-            assert retrieved.user_id == sample_user.id, "User ID should match"
-            assert retrieved.title == "Test Notification", "Title should match"
-            assert not retrieved.is_read, "Notification should be unread by default"
+        db.session.execute(db.update(Problem).values(solution_count=99))
+        db.session.commit()
+        CounterCache.reconcile()
+        problem = db.session.get(Problem, sample_solution.problem_id)
+        assert problem.solution_count == len(problem.solutions), (
+            "Reconcile should repair drifted counts"
+        )
+
+    def test_problem_taxonomy(self, app, sample_user, sample_problem):
+        """Test tags and departments are indexed and backfilled from JSON"""
+        from src.extensions import db
+        from src.models.problem import Problem
+        from src.utils.tagging import (
+            backfill_taxonomy,
+            filter_by_department,
+            filter_by_tag,
+            get_or_create_tags,
+            set_problem_tags,
+        )
+
+        problem = db.session.get(Problem, sample_problem.id)
+        problem.tags = ["Infra"]
+        problem.affected_departments = ["Engineering"]
+        db.session.commit()
+
+        backfill_taxonomy()
+        tagged = db.session.scalars(
+            filter_by_tag(db.select(Problem.id), "Infra")
+        ).all()
+        assert tagged == [problem.id], "Backfill should index JSON tags"
+        in_department = db.session.scalars(
+            filter_by_department(db.select(Problem.id), "Engineering")
+        ).all()
+        assert in_department == [problem.id], "Backfill should index departments"
+
+        set_problem_tags(problem, get_or_create_tags(["infra", "Ops"]).values())
+        db.session.commit()
+        assert [tag["name"] for tag in problem.tags] == ["Infra", "Ops"], (
+            "Existing tags should match case-insensitively"
+        )
+        assert len(problem.tags_relation) == 2, "Relation should match the cache"
+
+    def test_facet_counts(self, app, sample_user, sample_problem):
+        """Test facet counts ignore their own filter but apply the others"""
+        from src.extensions import db
+        from src.models.problem import Problem
+        from src.utils.facets import facet_counts
+        from src.utils.tagging import get_or_create_tags, set_problem_tags
+
+        problem = db.session.get(Problem, sample_problem.id)
+        set_problem_tags(problem, get_or_create_tags(["Infra"]).values())
+        db.session.commit()
+
+        facets = facet_counts(selected={"tag": "Infra"})
+        assert set(facets) == {"severity", "status", "tag", "department"}, (
+            "Every facet should be counted"
+        )
+        assert {"value": problem.status, "count": 1} in facets["status"], (
+            "Other facets should apply the tag filter"
+        )
+        assert {"value": "Infra", "count": 1} in facets["tag"], (
+            "Tag counts should come from the relation table"
+        )
+
+        facets = facet_counts(selected={"status": "no-such-status"})
+        assert facets["tag"] == [], "Tag counts should apply the status filter"
+        assert facets["status"], "Status counts should ignore their own filter"
+
+    def test_change_feed_gaps(self, app):
+        """Test reads stop before a recent gap and skip settled ones"""
+        from datetime import datetime, timedelta
+        from src.extensions import db
+        from src.models.change_log import ChangeLog
+        from src.utils.change_feed import ChangeFeed
+
+        now = datetime.utcnow()
+        base = db.session.scalar(db.select(db.func.max(ChangeLog.id))) or 0
+        for offset, age in [(1, 60), (3, 0), (6, 60)]:
+            db.session.add(
+                ChangeLog(
+                    id=base + offset,
+                    entity_type="problem",
+                    entity_id=1,
+                    action="updated",
+                    created_at=now - timedelta(seconds=age),
+                )
+            )
+        db.session.commit()
+
+        rows, _ = ChangeFeed.read(base, settle_seconds=10)
+        assert [row.id for row in rows] == [base + 1], (
+            "Entries after a recent gap should be held back"
+        )
+        rows, _ = ChangeFeed.read(base + 3, settle_seconds=10)
+        assert [row.id for row in rows] == [base + 6], (
+            "Settled gaps should be skipped"
+        )
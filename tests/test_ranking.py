@@ -0,0 +1,44 @@
+"""
+Test cases for solution ranking math
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.ranking import wilson_lower_bound, shrunk_mean, rank_scores
+from src.utils.scoring import DEFAULT_CRITERIA, validate_criteria
+
+
+class TestRanking:
+    """Test suite for the Wilson bound and Bayesian shrinkage"""
+
+    def test_wilson_lower_bound(self):
+        """Test the bound rewards evidence, not just the ratio"""
+        bounds = wilson_lower_bound([1, 90, 0], [0, 10, 0])
+        assert bounds[1] > bounds[0], "90/100 should outrank a single upvote"
+        assert bounds[2] == 0, "Unvoted solutions should score 0"
+        assert np.all((bounds >= 0) & (bounds <= 1)), "Bounds should stay in [0, 1]"
+
+    def test_shrunk_mean(self):
+        """Test few evaluations are pulled toward the prior"""
+        scores = shrunk_mean([5.0, 4.5 * 100, 0.0], [1, 100, 0], 3.0, 5)
+        assert scores[1] > scores[0], "Many good ratings should beat one perfect one"
+        assert scores[2] == 3.0, "Unevaluated solutions should score the prior"
+
+    def test_rank_scores(self):
+        """Test ranks blend both signals onto a 0-1 scale"""
+        ranks = rank_scores([0.0, 1.0], [1.0, 5.0])
+        assert ranks[0] == 0.0, "Worst on both signals should rank 0"
+        assert ranks[1] == 1.0, "Best on both signals should rank 1"
+
+    def test_validate_criteria(self):
+        """Test criteria need a version, known columns and positive weights"""
+        assert validate_criteria(DEFAULT_CRITERIA) is DEFAULT_CRITERIA
+
+        for broken in (
+            dict(DEFAULT_CRITERIA, version="2"),
+            dict(DEFAULT_CRITERIA, problem={"clarity_rating": 1}),
+            dict(DEFAULT_CRITERIA, solution={"feasibility_rating": 0}),
+        ):
+            with pytest.raises(ValueError):
+                validate_criteria(broken)
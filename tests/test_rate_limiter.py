@@ -0,0 +1,51 @@
+"""
+Test cases for the API rate limiter
+"""
+
+import pytest
+from src.utils.rate_limiter import RateLimiter, MemoryStorage, SQLiteStorage
+
+
+class TestRateLimiter:
+    """Test suite for token-bucket rate limiting"""
+
+    def test_bucket_exhaustion(self):
+        """Test that requests beyond the limit are rejected"""
+        limiter = RateLimiter(MemoryStorage(), limit=3, window=60)
+
+        results = [limiter.hit("client", now=1000.0) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False], (
+            "Fourth request in the window should be rejected"
+        )
+        assert results[2].remaining == 0, "Bucket should be empty"
+        assert results[3].retry_after == 20, "Should wait for one token to refill"
+
+    def test_bucket_refill(self):
+        """Test that tokens refill continuously over the window"""
+        limiter = RateLimiter(MemoryStorage(), limit=2, window=10)
+        limiter.hit("client", now=0.0)
+        limiter.hit("client", now=0.0)
+
+        assert not limiter.hit("client", now=1.0).allowed, "Should still be empty"
+        assert limiter.hit("client", now=6.0).allowed, "One token should be back"
+
+    def test_clients_are_independent(self):
+        """Test that buckets are kept per client key"""
+        limiter = RateLimiter(MemoryStorage(), limit=1, window=60)
+
+        assert limiter.hit("a", now=0.0).allowed, "First client allowed"
+        assert limiter.hit("b", now=0.0).allowed, "Second client has its own bucket"
+        assert not limiter.hit("a", now=0.0).allowed, "First client exhausted"
+
+    def test_sqlite_storage_is_shared(self, tmp_path):
+        """Test that SQLite storage shares buckets across limiter instances"""
+        path = str(tmp_path / "ratelimit.db")
+        worker_a = RateLimiter(SQLiteStorage(path), limit=2, window=60)
+        worker_b = RateLimiter(SQLiteStorage(path), limit=2, window=60)
+
+        assert worker_a.hit("client", now=0.0).allowed, "First request allowed"
+        assert worker_b.hit("client", now=0.0).allowed, "Second request allowed"
+        assert not worker_a.hit("client", now=0.0).allowed, (
+            "Workers should draw from the same bucket"
+        )
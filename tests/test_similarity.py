@@ -0,0 +1,46 @@
+"""
+Test cases for TF-IDF related problems
+"""
+
+import numpy as np
+
+from src.utils.similarity import similarity_blocks, tfidf_matrix, tokenize, top_k
+
+DOCUMENTS = [
+    ("Printer jams", "The printer on the third floor jams every morning"),
+    ("Printer out of toner", "Third floor printer needs toner"),
+    ("Coffee machine leaking", "The kitchen coffee machine is leaking water"),
+    ("Leaking coffee machine", "Water under the coffee machine in the kitchen"),
+    ("Parking lot lights", "Lights in the parking lot are broken"),
+]
+
+
+class TestSimilarity:
+    """Test suite for TF-IDF vectors and top-k neighbours"""
+
+    def test_tokenize(self):
+        """Test stop words, digits and case are dropped"""
+        assert tokenize("The 3rd Printer is BROKEN") == ["rd", "printer", "broken"]
+
+    def test_tfidf_matrix(self):
+        """Test rows are unit vectors over shared terms"""
+        matrix = tfidf_matrix(DOCUMENTS)
+        assert matrix.shape[0] == len(DOCUMENTS)
+        assert matrix.dtype == np.float32
+        norms = np.linalg.norm(matrix, axis=1)
+        assert np.all(norms <= 1.0001), "Rows should be at most unit length"
+        assert norms[4] == 0, "Terms used by a single problem should be dropped"
+
+    def test_top_k(self):
+        """Test each problem's nearest neighbour and self exclusion"""
+        matrix = tfidf_matrix(DOCUMENTS)
+        positions = np.arange(len(DOCUMENTS))
+        (block, scores), = similarity_blocks(matrix, positions)
+        assert np.array_equal(block, positions)
+        columns, best = top_k(scores, k=2)
+
+        assert columns[0, 0] == 1, "Printer problems should pair up"
+        assert columns[2, 0] == 3, "Coffee machine problems should pair up"
+        assert best[0, 0] > best[0, 1], "Neighbours should be best first"
+        assert np.all(columns != positions[:, None]), "No problem is its own neighbour"
+        assert np.isclose(best[1, 0], scores[1, 0]), "Scores should be symmetric"
@@ -0,0 +1,47 @@
+"""
+Test cases for the autocomplete prefix index
+"""
+
+from src.utils.suggest import SuggestSnapshot
+
+
+class TestSuggest:
+    """Test suite for sorted-array prefix lookups and incremental updates"""
+
+    def test_lookup(self):
+        """Test prefixes match any title word and tag or department names"""
+        snapshot = SuggestSnapshot(
+            {
+                1: ("Broken printer in lobby", ("Facilities",), ("Operations",)),
+                2: ("Printer queue stuck", ("IT",), ()),
+            },
+            cursor=0,
+        )
+        found = snapshot.lookup("PRINT")
+        assert [p["id"] for p in found["problems"]] == [1, 2], (
+            "Prefixes should match later title words, case-insensitively"
+        )
+        assert snapshot.lookup("fac")["tags"] == [{"name": "Facilities"}]
+        assert snapshot.lookup("op")["departments"] == [{"name": "Operations"}]
+        assert snapshot.lookup("print", limit=1)["problems"] == [
+            {"id": 1, "title": "Broken printer in lobby"}
+        ], "Results should respect the limit"
+        assert snapshot.lookup("  ")["problems"] == [], "Blank queries match nothing"
+
+    def test_apply(self):
+        """Test incremental updates match a rebuilt snapshot and copy on write"""
+        snapshot = SuggestSnapshot(
+            {1: ("Old title", ("IT",), ()), 2: ("Leaking roof", (), ())}, cursor=0
+        )
+        updated = snapshot.apply(
+            {1: ("New title", ("Ops",), ()), 2: None, 3: ("Another one", (), ())},
+            cursor=7,
+        )
+        rebuilt = SuggestSnapshot(
+            {1: ("New title", ("Ops",), ()), 3: ("Another one", (), ())}, cursor=7
+        )
+        assert updated.title_keys == rebuilt.title_keys, "Merged keys stay sorted"
+        assert updated.title_ids == rebuilt.title_ids
+        assert updated.tags == ["Ops"], "Unused tags should be dropped"
+        assert snapshot.lookup("old")["problems"], "The old snapshot is unchanged"
+        assert updated.cursor == 7